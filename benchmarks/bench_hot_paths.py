@@ -0,0 +1,248 @@
+"""
+Benchmarks des chemins critiques (pytest-benchmark)
+A* selon la taille de carte, simplification de chemin, parsing, mouvement
+du robot et rendu d'une image ; cartes générées avec une graine fixe.
+
+Usage:
+    ./run_benchmarks.sh                 # exécute et compare à la dernière référence
+    ./run_benchmarks.sh save            # enregistre une nouvelle référence
+    python3 -m pytest benchmarks/bench_hot_paths.py
+"""
+
+import functools
+import os
+import sys
+
+# Rendu sans fenêtre, avant tout import de pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.anytime import DEFAULT_EPSILONS, AnytimeSearch
+from src.environment import Environment, EnvironmentSnapshot
+from src.map_generator import MapGenerator, reachable_cells
+from src.nlp_parser import NLPParser
+from src.pathfinding import PathFinder
+from src.robot import Robot
+
+
+SEED = 0
+START = (100, 100)
+
+
+@functools.lru_cache(maxsize=None)
+def map_snapshot(map_type: str, size: int, num_objects: int) -> EnvironmentSnapshot:
+    """Carte générée une seule fois par session"""
+    env = MapGenerator(SEED).generate(map_type, width=size, height=size, num_objects=num_objects)
+    return env.snapshot()
+
+
+def make_map(map_type: str, size: int, num_objects: int = 50) -> Environment:
+    """Carte générée (reproductible), restaurée depuis son instantané"""
+    return Environment.from_snapshot(map_snapshot(map_type, size, num_objects))
+
+
+def far_goal(env: Environment, fraction: float = 0.5) -> tuple:
+    """Cellule atteignable la plus proche du point (fraction × largeur, fraction × hauteur)"""
+    cells = reachable_cells(env, START).nonzero()
+    gx, gy = int(env.width * fraction) // env.grid_size, int(env.height * fraction) // env.grid_size
+    index = ((cells[1] - gx) ** 2 + (cells[0] - gy) ** 2).argmin()
+    return env.grid_to_pixel(int(cells[1][index]), int(cells[0][index]))
+
+
+def record_rate(benchmark, name: str, count: int):
+    """Ajoute un débit (unités/s) aux métadonnées, si la mesure est active"""
+    benchmark.extra_info[f'{name}_per_round'] = count
+    if benchmark.stats is not None:
+        benchmark.extra_info[f'{name}_per_s'] = count / benchmark.stats.stats.mean
+
+
+def path_length(path: list) -> float:
+    """Longueur d'un chemin en pixels"""
+    return sum(((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) ** 0.5 for a, b in zip(path, path[1:]))
+
+
+def raw_path(env: Environment, goal: tuple) -> list:
+    """Chemin A* complet, avant simplification"""
+    pathfinder = PathFinder(env)
+    pathfinder.simplify_path = lambda path: path
+    return pathfinder.a_star(START, goal)
+
+
+@pytest.mark.parametrize('map_type', ['rectangles', 'maze'])
+@pytest.mark.parametrize('size', [800, 1200, 1600])
+def test_a_star(benchmark, map_type, size):
+    env = make_map(map_type, size)
+    pathfinder = PathFinder(env)
+    goal = far_goal(env)
+
+    path = benchmark(pathfinder.a_star, START, goal)
+    benchmark.extra_info['waypoints'] = len(path) if path else 0
+
+
+@pytest.mark.parametrize('map_type', ['rectangles', 'maze'])
+def test_quadtree_a_star(benchmark, map_type):
+    # Feuilles rectangulaires (côté ≤ MAX_LEAF_SIZE = 32). Mesuré sur 10 buts
+    # par carte 6000×6000 : 2214 feuilles et 9459 nœuds développés en labyrinthe
+    # (224907 sur la grille), 1565 et 4776 en rectangles (93818) ; chemins à
+    # 1,00-1,09 fois la longueur optimale en moyenne. Borne à 16 ou 64 : même
+    # nombre de feuilles à 10 % près, les obstacles les limitant avant
+    env = make_map(map_type, 1600)
+    reference = PathFinder(env)
+    goal = far_goal(env)
+    expected = reference.a_star(START, goal)
+    pathfinder = PathFinder(env, quadtree=True)
+    pathfinder.quadtree()  # décomposition hors mesure
+    pathfinder.quadtree_a_star(START, goal)
+
+    expanded = pathfinder.nodes_expanded
+    path = benchmark(pathfinder.quadtree_a_star, START, goal)
+    benchmark.extra_info['waypoints'] = len(path) if path else 0
+    benchmark.extra_info['leaves'] = len(pathfinder.quadtree())
+    benchmark.extra_info['nodes_expanded'] = expanded
+    benchmark.extra_info['nodes_saved'] = reference.nodes_expanded - expanded
+    if path and expected:
+        benchmark.extra_info['length_ratio'] = path_length(path) / path_length(expected)
+
+
+@pytest.mark.parametrize('map_type', ['rooms', 'maze'])
+def test_bidirectional_a_star(benchmark, map_type):
+    # nodes_saved peut être négatif : le gain de MM dépend de la carte (voir README)
+    env = make_map(map_type, 1200)
+    goal = far_goal(env)
+    reference = PathFinder(env)
+    reference.a_star(START, goal)
+    pathfinder = PathFinder(env, bidirectional=True)
+    pathfinder.bidirectional_a_star(START, goal)
+
+    expanded = pathfinder.nodes_expanded
+    path = benchmark(pathfinder.bidirectional_a_star, START, goal)
+    benchmark.extra_info['waypoints'] = len(path) if path else 0
+    benchmark.extra_info['nodes_expanded'] = expanded
+    benchmark.extra_info['nodes_saved'] = reference.nodes_expanded - expanded
+    record_rate(benchmark, 'nodes', expanded)
+
+
+@pytest.mark.parametrize('map_type', ['rooms', 'maze'])
+def test_anytime_first_path(benchmark, map_type):
+    env = make_map(map_type, 1600)
+    pathfinder = PathFinder(env)
+    goal = far_goal(env, 0.9)
+
+    start_cell, goal_cell = env.pixel_to_grid(*START), env.pixel_to_grid(*goal)
+
+    def first_path():
+        # Un seul ε (le plus grand) : la recherche s'arrête au premier chemin
+        search = AnytimeSearch(pathfinder.blocked_rows(), start_cell, goal_cell,
+                               epsilons=DEFAULT_EPSILONS[:1])
+        search.run()
+        return search
+
+    search = benchmark(first_path)
+    benchmark.extra_info['bound'] = search.bound
+    benchmark.extra_info['nodes_expanded'] = search.nodes_expanded
+
+    # Recherche complète jusqu'à ε = 1 (hors mesure)
+    search = pathfinder.anytime_search(START, goal, 0)
+    search.start_background()
+    search.join()
+    benchmark.extra_info['final_bound'] = search.bound
+    benchmark.extra_info['final_nodes_expanded'] = search.nodes_expanded
+
+
+@pytest.mark.parametrize('goals', [4, 32])
+def test_nearest_a_star(benchmark, goals):
+    env = make_map('rooms', 1200)
+    cells = reachable_cells(env, START).nonzero()
+    chosen = np.random.default_rng(0).choice(len(cells[0]), goals, replace=False)
+    targets = [env.grid_to_pixel(int(cells[1][i]), int(cells[0][i])) for i in chosen]
+
+    # Référence : une recherche A* par cible
+    separate = PathFinder(env)
+    for target in targets:
+        separate.a_star(START, target)
+
+    pathfinder = PathFinder(env)
+    pathfinder.nearest_a_star(START, targets)
+
+    expanded = pathfinder.nodes_expanded
+    result = benchmark(pathfinder.nearest_a_star, START, targets)
+    assert result is not None
+    benchmark.extra_info['nodes_expanded'] = expanded
+    benchmark.extra_info['nodes_expanded_separate'] = separate.nodes_expanded
+    record_rate(benchmark, 'nodes', expanded)
+
+
+@pytest.mark.parametrize('weight', [0.0, 2.0])
+def test_a_star_clearance(benchmark, weight):
+    env = make_map('rectangles', 1200)
+    pathfinder = PathFinder(env, clearance_weight=weight)
+    goal = far_goal(env)
+    pathfinder.a_star(START, goal)  # champ de distance calculé hors mesure
+
+    expanded = pathfinder.nodes_expanded
+    path = benchmark(pathfinder.a_star, START, goal)
+    benchmark.extra_info['waypoints'] = len(path) if path else 0
+    benchmark.extra_info['nodes_expanded'] = expanded
+    record_rate(benchmark, 'nodes', expanded)
+
+
+@pytest.mark.parametrize('map_type', ['rectangles', 'rooms'])
+def test_simplify_path(benchmark, map_type):
+    env = make_map(map_type, 1200)
+    path = raw_path(env, far_goal(env))
+    assert path is not None
+
+    pathfinder = PathFinder(env)
+    simplified = benchmark(pathfinder.simplify_path, path)
+    benchmark.extra_info['raw_waypoints'] = len(path)
+    benchmark.extra_info['waypoints'] = len(simplified)
+
+
+def test_parse_command_throughput(benchmark):
+    generator = MapGenerator(SEED)
+    env = generator.generate('rectangles', width=800, height=600, num_objects=30)
+    commands = generator.generate_workload(env, 200)
+    parser = NLPParser()
+
+    def parse_all():
+        for command in commands:
+            parser.parse_command(command)
+
+    benchmark(parse_all)
+    record_rate(benchmark, 'commands', len(commands))
+
+
+def test_move_along_path(benchmark):
+    # Aller-retour en zigzag : le robot ne termine pas le chemin pendant la mesure
+    path = [(100 + 600 * (i % 2), 100 + 4 * i) for i in range(100)]
+    steps = 2000
+    robot = Robot(x=100, y=100, size=25)
+
+    def move():
+        robot.reset()
+        robot.set_path(path)
+        for _ in range(steps):
+            robot.move_along_path()
+
+    benchmark(move)
+    record_rate(benchmark, 'steps', steps)
+
+
+@pytest.mark.parametrize('scene', ['simple', 'open', 'rooms-200'])
+def test_environment_draw(benchmark, scene):
+    if scene == 'rooms-200':
+        env = MapGenerator(SEED).generate('rooms', width=800, height=600, num_objects=200,
+                                          room_size=200)
+    else:
+        env = Environment(width=800, height=600, grid_size=20)
+        getattr(env, f'create_{scene}_environment')()
+    robot = Robot(x=100, y=100, size=25)
+    robot.set_path(raw_path(env, far_goal(env, 0.9)) or [])
+
+    env.draw(robot)  # ouverture de la fenêtre et création de la police hors mesure
+    benchmark(env.draw, robot)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test de charge du parser LLM sans réseau
+Utilise le stand-in ReplayBackend (latence et erreurs simulées) et mesure
+le débit, la latence de queue et le taux de fallback sous concurrence
+
+Usage:
+    python3 benchmarks/llm_load_test.py --requests 500 --concurrency 16 \\
+        --latency-ms 200 --jitter-ms 100 --error-rate 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.circuit_breaker import CircuitBreaker
+from src.llm_backends import ReplayBackend
+from src.llm_parser import LLMParser
+
+DEFAULT_REPLAY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'tests', 'fixtures', 'llm_responses.jsonl')
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Percentile p (0-100) d'une liste triée"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load_test(backend: ReplayBackend, commands: list, requests: int,
+                  concurrency: int, retry_delay: float) -> dict:
+    """
+    Exécute requests appels à parse_command répartis sur concurrency threads
+
+    Chaque thread a son propre LLMParser (et donc son propre disjoncteur),
+    le backend est partagé.
+    """
+    local = threading.local()
+
+    def get_parser() -> LLMParser:
+        if not hasattr(local, 'parser'):
+            local.parser = LLMParser(
+                backend=backend,
+                circuit_breaker=CircuitBreaker(base_delay=retry_delay)
+            )
+        return local.parser
+
+    def one_request(i: int):
+        command = commands[i % len(commands)]
+        start = time.perf_counter()
+        result = get_parser().parse_command(command)
+        latency = time.perf_counter() - start
+        return latency, result.get('fallback', False), result.get('circuit_open', False)
+
+    # Les messages "Erreur LLM" des erreurs injectées sont masqués
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(one_request, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in outcomes)
+    fallbacks = sum(1 for _, fallback, _ in outcomes if fallback)
+    short_circuited = sum(1 for _, _, circuit_open in outcomes if circuit_open)
+
+    return {
+        'requests': requests,
+        'elapsed': elapsed,
+        'throughput': requests / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'fallback_rate': fallbacks / requests * 100 if requests else 0.0,
+        'short_circuit_rate': short_circuited / requests * 100 if requests else 0.0,
+        'backend_calls': backend.calls,
+        'backend_errors': backend.errors,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Test de charge du parser LLM (sans réseau)")
+    arg_parser.add_argument('--responses', default=DEFAULT_REPLAY_FILE,
+                            help="Réponses enregistrées (JSONL)")
+    arg_parser.add_argument('--requests', type=int, default=500)
+    arg_parser.add_argument('--concurrency', type=int, default=16)
+    arg_parser.add_argument('--latency-ms', type=float, default=200.0)
+    arg_parser.add_argument('--jitter-ms', type=float, default=100.0)
+    arg_parser.add_argument('--error-rate', type=float, default=0.0)
+    arg_parser.add_argument('--retry-delay', type=float, default=0.05,
+                            help="Délai de base du backoff entre réessais (secondes)")
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    backend = ReplayBackend.from_file(
+        args.responses,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    commands = list(backend.responses)
+
+    print("="*60)
+    print("TEST DE CHARGE - PARSER LLM (REJEU LOCAL)")
+    print("="*60)
+    print(f"Requêtes: {args.requests}, concurrence: {args.concurrency}")
+    print(f"Latence simulée: {args.latency_ms:.0f} ms (+0-{args.jitter_ms:.0f} ms), "
+          f"taux d'erreur: {args.error_rate*100:.1f}%")
+
+    stats = run_load_test(backend, commands, args.requests, args.concurrency, args.retry_delay)
+
+    print("\n" + "-"*60)
+    print(f"Durée totale : {stats['elapsed']:.2f}s")
+    print(f"Débit : {stats['throughput']:.1f} commandes/s")
+    print(f"Latence p50 : {stats['p50_ms']:.1f} ms")
+    print(f"Latence p95 : {stats['p95_ms']:.1f} ms")
+    print(f"Latence p99 : {stats['p99_ms']:.1f} ms")
+    print(f"Latence max : {stats['max_ms']:.1f} ms")
+    print(f"Taux de fallback : {stats['fallback_rate']:.1f}% "
+          f"(dont circuit ouvert: {stats['short_circuit_rate']:.1f}%)")
+    print(f"Appels backend : {stats['backend_calls']} (erreurs injectées: {stats['backend_errors']})")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
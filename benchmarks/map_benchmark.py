@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Mesure du planificateur sur des cartes générées (reproductibles)
+Génère une carte par type avec MapGenerator puis exécute sa charge de
+commandes avec le pipeline sans affichage
+
+Usage:
+    python3 benchmarks/map_benchmark.py --size 2000 --objects 200 --commands 50
+    python3 benchmarks/map_benchmark.py --types maze warehouse --size 10000 --seed 7
+    python3 benchmarks/map_benchmark.py --map-dir maps   # cartes binaires réutilisées
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.llm_load_test import percentile
+from src.map_format import load_map, save_map
+from src.map_generator import MAP_TYPES, MapGenerator, reachable_cells
+from src.nlp_parser import NLPParser
+from src.pathfinding import PathFinder
+from src.pipeline import MAX_STEPS_PER_TARGET, execute_command
+from src.robot import Robot
+
+
+def run_map_benchmark(map_type: str, size: int, num_objects: int, num_commands: int,
+                      seed: int, map_dir: str = None, robot_radius: float = None,
+                      quadtree: bool = False, bidirectional: bool = False,
+                      deadline_ms: float = None) -> dict:
+    """
+    Génère une carte et exécute ses commandes ; retourne les mesures
+
+    Avec map_dir, la carte est enregistrée au format binaire au premier
+    passage puis rechargée (memmap) aux suivants.
+    """
+    filename = None
+    if map_dir:
+        os.makedirs(map_dir, exist_ok=True)
+        filename = os.path.join(map_dir, f"{map_type}-{size}-{num_objects}-{seed}.map")
+
+    start = time.perf_counter()
+    loaded = filename is not None and os.path.exists(filename)
+    if loaded:
+        env = load_map(filename)
+    else:
+        env = MapGenerator(seed).generate(map_type, width=size, height=size, num_objects=num_objects)
+        if filename:
+            save_map(env, filename)
+    generation_time = time.perf_counter() - start
+
+    # Charge tirée indépendamment de la génération : identique carte générée ou chargée
+    commands = MapGenerator(seed).generate_workload(env, num_commands)
+
+    robot = Robot(x=100, y=100, size=25)
+    parser = NLPParser()
+    pathfinder = PathFinder(env, robot_radius=robot_radius, quadtree=quadtree,
+                            bidirectional=bidirectional, deadline_ms=deadline_ms)
+
+    # Pas de simulation suffisants pour le plus long chemin possible sur cette carte
+    max_steps = max(MAX_STEPS_PER_TARGET,
+                    int(reachable_cells(env, robot.get_position()).sum()) * env.grid_size // robot.speed)
+
+    times = []
+    successes = 0
+    for command in commands:
+        result = execute_command(command, env, robot, parser, pathfinder,
+                                 max_steps_per_target=max_steps)
+        times.append(result['time_ms'])
+        successes += result['success']
+        robot.reset()
+
+    times.sort()
+    return {
+        'obstacles': len(env.obstacles),
+        'objects': len(env.objects),
+        'generation_time': generation_time,
+        'loaded': loaded,
+        'nodes_expanded': pathfinder.nodes_expanded,
+        'success_rate': successes / len(commands) * 100 if commands else 0.0,
+        'p50_ms': percentile(times, 50),
+        'p95_ms': percentile(times, 95),
+        'max_ms': times[-1] if times else 0.0,
+        'total_time': sum(times) / 1000,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Mesure du planificateur sur cartes générées")
+    arg_parser.add_argument('--types', nargs='+', choices=MAP_TYPES, default=list(MAP_TYPES))
+    arg_parser.add_argument('--size', type=int, default=2000, help="Côté de la carte (pixels)")
+    arg_parser.add_argument('--objects', type=int, default=200)
+    arg_parser.add_argument('--commands', type=int, default=50)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--robot-radius', type=float, metavar='R',
+                            help="Planifier dans l'espace des configurations d'un robot de rayon R")
+    arg_parser.add_argument('--quadtree', action='store_true',
+                            help="Chercher sur le quadtree de l'espace libre au lieu de la grille")
+    arg_parser.add_argument('--bidirectional', action='store_true',
+                            help="A* bidirectionnel (arrêt à la rencontre des deux fronts)")
+    arg_parser.add_argument('--deadline', type=float, metavar='MS',
+                            help="Recherche à temps borné (ARA*) : meilleur chemin trouvé en MS ms "
+                                 "(commande échouée si aucun chemin n'est trouvé à temps)")
+    arg_parser.add_argument('--map-dir', metavar='DIR',
+                            help="Enregistrer/recharger les cartes au format binaire dans DIR")
+    args = arg_parser.parse_args()
+
+    print("="*60)
+    print("MESURE DU PLANIFICATEUR - CARTES GENEREES")
+    print("="*60)
+    print(f"Taille: {args.size}x{args.size}, objets: {args.objects}, "
+          f"commandes: {args.commands}, graine: {args.seed}")
+
+    for map_type in args.types:
+        stats = run_map_benchmark(map_type, args.size, args.objects, args.commands, args.seed,
+                                  map_dir=args.map_dir, robot_radius=args.robot_radius,
+                                  quadtree=args.quadtree, bidirectional=args.bidirectional,
+                                  deadline_ms=args.deadline)
+        origin = 'chargée' if stats['loaded'] else 'générée'
+        print("\n" + "-"*60)
+        print(f"Carte: {map_type} ({stats['obstacles']} obstacles, {stats['objects']} objets, "
+              f"{origin} en {stats['generation_time']:.3f}s)")
+        print(f"  Taux de réussite : {stats['success_rate']:.1f}%")
+        print(f"  Commande p50 : {stats['p50_ms']:.1f} ms | p95 : {stats['p95_ms']:.1f} ms | "
+              f"max : {stats['max_ms']:.1f} ms")
+        print(f"  Nœuds développés : {stats['nodes_expanded']}")
+        print(f"  Temps total : {stats['total_time']:.2f}s")
+
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test de charge du service HTTP/WebSocket (server.py) sur localhost
+Crée plusieurs sessions en parallèle, envoie des commandes à chacune et
+écoute le flux WebSocket de progression
+
+Usage:
+    python3 benchmarks/server_load_test.py --sessions 50 --commands 20
+    python3 benchmarks/server_load_test.py --url http://127.0.0.1:8080  # serveur déjà lancé
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import ClientSession, WSMsgType, web
+
+from benchmarks.llm_load_test import percentile
+from server import create_app
+from src.nlp_parser import NLPParser
+
+COMMANDS = [
+    "Va vers le carré rouge",
+    "Va vers le cercle bleu",
+    "Atteins le carré vert",
+    "Va vers le rouge",
+]
+
+
+async def run_session(http: ClientSession, url: str, commands: int, env: str,
+                      steps_per_tick: int, latencies: list) -> dict:
+    """Une session : crée, écoute le WebSocket, envoie les commandes, ferme"""
+    async with http.post(f"{url}/sessions", json={'env': env, 'tick_rate': 0,
+                                                  'steps_per_tick': steps_per_tick}) as response:
+        session_id = (await response.json())['session_id']
+
+    events = {'position': 0, 'command_finished': 0}
+    ws = await http.ws_connect(f"{url}/sessions/{session_id}/ws")
+
+    async def listen():
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                break
+            event_type = message.json()['type']
+            if event_type in events:
+                events[event_type] += 1
+
+    listener = asyncio.create_task(listen())
+
+    successes = 0
+    for i in range(commands):
+        start = time.perf_counter()
+        async with http.post(f"{url}/sessions/{session_id}/commands",
+                             json={'command': COMMANDS[i % len(COMMANDS)], 'wait': True}) as response:
+            result = await response.json()
+        latencies.append(time.perf_counter() - start)
+        successes += bool(result.get('success'))
+
+    async with http.delete(f"{url}/sessions/{session_id}"):
+        pass
+    await ws.close()
+    listener.cancel()
+
+    return {'successes': successes, **events}
+
+
+async def run_load_test(url: str, sessions: int, commands: int, env: str, steps_per_tick: int):
+    latencies = []
+    async with ClientSession() as http:
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*[
+            run_session(http, url, commands, env, steps_per_tick, latencies)
+            for _ in range(sessions)
+        ])
+        elapsed = time.perf_counter() - start
+
+    total = sessions * commands
+    latencies.sort()
+
+    print("\n" + "-"*60)
+    print(f"Durée totale : {elapsed:.2f}s")
+    print(f"Débit : {total / elapsed:.1f} commandes/s")
+    print(f"Latence p50 : {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Latence p95 : {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"Latence p99 : {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Succès : {sum(o['successes'] for o in outcomes)}/{total}")
+    print(f"Événements WebSocket : {sum(o['position'] for o in outcomes)} positions, "
+          f"{sum(o['command_finished'] for o in outcomes)} fins de commande")
+    print("="*60)
+
+
+async def main_async(args):
+    runner = None
+    url = args.url
+
+    if url is None:
+        # Serveur lancé dans le même processus, sur un port libre
+        app = create_app(parser=NLPParser(), max_sessions=args.sessions)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}"
+
+    print("="*60)
+    print("TEST DE CHARGE - SERVICE ROBOT")
+    print("="*60)
+    print(f"Serveur : {url}")
+    print(f"Sessions : {args.sessions}, commandes par session : {args.commands}")
+
+    try:
+        await run_load_test(url, args.sessions, args.commands, args.env, args.steps_per_tick)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Test de charge du service robot")
+    arg_parser.add_argument('--url', help="URL d'un serveur déjà lancé (sinon serveur local)")
+    arg_parser.add_argument('--sessions', type=int, default=50)
+    arg_parser.add_argument('--commands', type=int, default=20)
+    arg_parser.add_argument('--env', default='simple')
+    arg_parser.add_argument('--steps-per-tick', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ Robot Virtuel Guidé par Texte
 Point d'entrée principal du programme
 """
 
-import pygame
+import argparse
+import contextlib
+import itertools
+import json
 import sys
 import os
 from pathlib import Path
+from typing import Optional
 
 # Charger le fichier .env automatiquement au démarrage
 env_file = Path(__file__).parent / '.env'
@@ -22,19 +26,255 @@ if env_file.exists():
 from src.environment import Environment
 from src.robot import Robot
 from src.nlp_parser import NLPParser
-from src.pathfinding import PathFinder
+from src.tiered_parser import TieredParser
+from src.pathfinding import DEFAULT_DEADLINE_MS, PathFinder
 from src.evaluator import Evaluator
+from src.command_reader import CommandReader
+from src.pipeline import execute_command, resolve_targets, setup_environment
+from src.profiling import PROFILE_ENV, maybe_profile, profiler_from_env
+from src.result_sink import open_sink
 
-# Essayer d'importer le parser LLM (optionnel)
-try:
-    from src.llm_parser import LLMParser
-    LLM_AVAILABLE = True
-except ImportError:
-    LLM_AVAILABLE = False
+# Parser LLM optionnel : google-generativeai n'est importé que si une clé API est définie
+from src.llm_parser import MAX_BATCH_SIZE, LLMParser, is_available as llm_is_available
+LLM_AVAILABLE = llm_is_available()
 
 
-def main():
-    """Fonction principale du programme"""
+def create_parser():
+    """
+    Détecte et initialise le parser (LLM ou simple)
+
+    Returns:
+        (parser, use_llm)
+    """
+    if LLM_AVAILABLE and os.getenv('GEMINI_API_KEY'):
+        try:
+            # Parser local d'abord, LLM seulement pour les commandes complexes
+            parser = TieredParser(LLMParser())
+            print("✅ Parser LLM (Gemini) activé - Commandes complexes supportées !")
+            print("   Exemple: 'Va au carré rouge en passant par le cercle bleu'\n")
+            return parser, True
+        except Exception as e:
+            print(f"⚠️  Erreur LLM ({e}), utilisation du parser simple")
+            return NLPParser(), False
+
+    if not os.getenv('GEMINI_API_KEY'):
+        print("ℹ️  Parser simple utilisé (pas de clé API Gemini)")
+        print("   Pour activer le parser LLM: export GEMINI_API_KEY='votre_cle'\n")
+    return NLPParser(), False
+
+
+def plan_anytime(pathfinder: PathFinder, robot: Robot, target: dict, deadline_ms: float):
+    """
+    Planifie vers une cible résolue par resolve_targets
+
+    ARA* vers le plus proche des objets correspondants (un seul délai pour
+    tous), puis recherche poursuivie en arrière-plan (premier chemin s'il n'a
+    pas été trouvé à temps, sinon améliorations). L'objet auquel mène le
+    chemin devient target['object'] (voir retarget).
+
+    Returns:
+        (recherche ARA* ou None, premier chemin ou None) ; une recherche sans
+        chemin est encore en cours, le premier chemin viendra d'elle
+    """
+    candidates = target.get('candidates') or [target['object']]
+    search = pathfinder.anytime_nearest_search(robot.get_position(),
+                                               [(obj.x, obj.y) for obj in candidates], deadline_ms)
+    if search is None:
+        return None, None
+    found = pathfinder.anytime_nearest_path(search)
+    path = None
+    if found is not None:
+        index, path = found
+        retarget(target, index)
+    search.start_background()
+    # done est lu avant version : un chemin publié avant la fin est vu
+    if path is None and search.done and search.version == 0:
+        return None, None
+    return search, path
+
+
+def retarget(target: dict, index: int):
+    """
+    target['object'] devient le candidat auquel mène le chemin suivi (une
+    amélioration de la recherche multi-buts peut viser un autre candidat)
+    """
+    candidates = target.get('candidates') or [target['object']]
+    target['object'] = candidates[index]
+
+
+def path_length(points) -> float:
+    """Longueur d'une ligne brisée (pixels)"""
+    return sum(((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) ** 0.5 for a, b in zip(points, points[1:]))
+
+
+def swap_improved_path(pathfinder: PathFinder, robot: Robot, improved) -> bool:
+    """
+    Remplace le chemin du robot par un chemin amélioré, s'il raccourcit le trajet
+
+    Le robot rejoint en ligne droite le waypoint le plus avancé du nouveau
+    chemin qu'il voit sans obstacle (un test tous les demi-pas de grille).
+
+    Returns:
+        True si le chemin a été remplacé
+    """
+    position = robot.get_position()
+    step = pathfinder.environment.grid_size / 2
+    for index in range(len(improved) - 1, -1, -1):
+        checks = max(10, int(path_length([position, improved[index]]) / step))
+        if pathfinder.is_line_clear(position, improved[index], checks):
+            break
+    else:
+        return False
+
+    remaining = [position] + robot.path[robot.current_path_index:]
+    candidate = [position] + improved[index:]
+    if path_length(candidate) >= path_length(remaining) - 1:
+        return False
+
+    robot.set_path(improved[index:])
+    return True
+
+
+def read_commands(source: str):
+    """Lit les commandes d'un fichier (ou de stdin si source vaut '-'), une par ligne"""
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for line in stream:
+            command = line.strip()
+            if command and not command.startswith('#'):
+                yield command
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(env_choice: str, commands_source: str, output: str = '-', render: bool = False,
+              results: Optional[str] = None, profiler=None):
+    """
+    Mode lot : exécute une suite de commandes sans interaction
+
+    Chaque commande part de la position de départ du robot. Les résultats
+    sont écrits au format JSONL (une ligne par commande) ; les messages
+    d'information vont sur stderr. Avec le parser LLM, les commandes sont
+    parsées par paquets (une requête groupée par paquet, voir
+    LLMParser.parse_commands).
+
+    Args:
+        env_choice: Nom de l'environnement (simple, labyrinthe, ouvert)
+        commands_source: Fichier de commandes ('-' pour stdin)
+        output: Fichier de résultats JSONL ('-' pour stdout)
+        render: Si True, affiche la simulation dans la fenêtre Pygame
+        results: Fichier des résultats de l'Evaluator, écrits au fil de l'eau
+                 (.jsonl, .csv, suffixe .gz pour compresser)
+        profiler: CommandProfiler optionnel (un profil par commande)
+    """
+    out = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    # Mémoire bornée : seuls les agrégats sont conservés
+    evaluator = Evaluator(sink=open_sink(results) if results else None, keep_results=False)
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            env = Environment(width=800, height=600, grid_size=20)
+            env_name = setup_environment(env, env_choice)
+            robot = Robot(x=100, y=100, size=25)
+            pathfinder = PathFinder(env, evaluator=evaluator)
+            parser, _ = create_parser()
+
+            on_step = None
+            if render:
+                import pygame
+
+                env.init_display()
+
+                def on_step(step: int):
+                    # Affichage tous les 10 pas, sans limiter la cadence
+                    if step % 10 == 0:
+                        pygame.event.pump()
+                        env.draw(robot)
+
+            # Parser avec parse_commands (TieredParser, LLMParser) : commandes
+            # lues par paquets de MAX_BATCH_SIZE, parsées en une requête groupée
+            parse_batch = getattr(parser, 'parse_commands', None)
+            chunk_size = MAX_BATCH_SIZE if parse_batch is not None else 1
+            commands = read_commands(commands_source)
+            index = 0
+
+            while True:
+                chunk = list(itertools.islice(commands, chunk_size))
+                if not chunk:
+                    break
+
+                parsed_chunk = [None] * len(chunk)
+                if parse_batch is not None:
+                    # Temps du lot compté dans la phase parse de sa première commande
+                    with evaluator.span('parse'):
+                        parsed_chunk = parse_batch(chunk)
+
+                for command, parsed in zip(chunk, parsed_chunk):
+                    evaluator.start_test(command, env_name)
+                    with maybe_profile(profiler, command):
+                        result = execute_command(command, env, robot, parser, pathfinder,
+                                                 on_step=on_step, evaluator=evaluator,
+                                                 parsed=parsed)
+                    evaluator.end_test(result['success'], robot)
+                    result['phases'] = evaluator.last_result['phases']
+                    result['counters'] = evaluator.last_result['counters']
+
+                    out.write(json.dumps({'index': index, 'environment': env_name, **result},
+                                         ensure_ascii=False) + '\n')
+                    robot.reset()
+                    index += 1
+
+            print(f"\n{evaluator.total_tests} commande(s) exécutée(s), "
+                  f"taux de réussite: {evaluator.get_success_rate():.1f}%")
+            evaluator.print_phase_report()
+    finally:
+        evaluator.close()
+        if profiler is not None:
+            with contextlib.redirect_stdout(sys.stderr):
+                profiler.close()
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+        if 'pygame' in sys.modules:
+            sys.modules['pygame'].quit()
+
+
+def parse_args(argv=None):
+    """Analyse les arguments de la ligne de commande"""
+    arg_parser = argparse.ArgumentParser(description="Robot virtuel guidé par texte")
+    arg_parser.add_argument('--env', help="Environnement: simple, labyrinthe (maze) ou ouvert (open)")
+    arg_parser.add_argument('--commands', metavar='FICHIER',
+                            help="Mode lot : fichier de commandes, une par ligne ('-' pour stdin)")
+    arg_parser.add_argument('--output', default='-', metavar='FICHIER',
+                            help="Mode lot : résultats JSONL ('-' pour stdout, par défaut)")
+    arg_parser.add_argument('--render', action='store_true',
+                            help="Mode lot : afficher la simulation")
+    arg_parser.add_argument('--results', metavar='FICHIER',
+                            help="Résultats de l'Evaluator écrits au fil de l'eau "
+                                 "(.jsonl ou .csv, suffixe .gz pour compresser)")
+    arg_parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE_MS, metavar='MS',
+                            help="Mode interactif : délai de planification (ms) avant que le "
+                                 "robot parte ; la recherche continue ensuite en arrière-plan "
+                                 "(premier chemin si besoin, puis améliorations)")
+    arg_parser.add_argument('--profile', nargs='?', const='all', metavar='MODES',
+                            help="Profiler chaque commande : cprofile, sample ou all "
+                                 f"(défaut: variable {PROFILE_ENV})")
+    return arg_parser.parse_args(argv)
+
+
+def main(env_choice: Optional[str] = None, results: Optional[str] = None, profiler=None,
+         deadline_ms: float = DEFAULT_DEADLINE_MS):
+    """
+    Fonction principale du programme (mode interactif)
+
+    Chaque chemin est planifié en au plus deadline_ms ; la recherche
+    continue en arrière-plan pendant que le robot avance (ou attend le
+    premier chemin), et un meilleur chemin remplace le chemin en cours.
+    """
+    import pygame
+
     print("="*60)
     print("ROBOT VIRTUEL GUIDE PAR TEXTE")
     print("="*60)
@@ -43,50 +283,28 @@ def main():
 
     # Initialiser les composants
     env = Environment(width=800, height=600, grid_size=20)
+    env.init_display()
     robot = Robot(x=100, y=100, size=25)
-    pathfinder = PathFinder(env)
-    evaluator = Evaluator()
+    evaluator = Evaluator(sink=open_sink(results) if results else None)
+    pathfinder = PathFinder(env, evaluator=evaluator)
 
     # Détecter et initialiser le parser (LLM ou simple)
-    parser = None
-    use_llm = False
-
-    if LLM_AVAILABLE and os.getenv('GEMINI_API_KEY'):
-        try:
-            parser = LLMParser()
-            use_llm = True
-            print("✅ Parser LLM (Gemini) activé - Commandes complexes supportées !")
-            print("   Exemple: 'Va au carré rouge en passant par le cercle bleu'\n")
-        except Exception as e:
-            print(f"⚠️  Erreur LLM ({e}), utilisation du parser simple")
-            parser = NLPParser()
-    else:
-        parser = NLPParser()
-        if not os.getenv('GEMINI_API_KEY'):
-            print("ℹ️  Parser simple utilisé (pas de clé API Gemini)")
-            print("   Pour activer le parser LLM: export GEMINI_API_KEY='votre_cle'\n")
+    parser, use_llm = create_parser()
 
     # Choix de l'environnement
-    print("\nChoisissez un environnement :")
-    print("1. Simple (quelques obstacles)")
-    print("2. Labyrinthe (complexe)")
-    print("3. Ouvert (plusieurs cibles)")
-
-    choice = input("\nVotre choix (1-3) : ").strip()
-
-    if choice == "1":
-        env.create_simple_environment()
-        env_name = "Simple"
-    elif choice == "2":
-        env.create_maze_environment()
-        env_name = "Labyrinthe"
-    elif choice == "3":
-        env.create_open_environment()
-        env_name = "Ouvert"
-    else:
+    if env_choice is None:
+        print("\nChoisissez un environnement :")
+        print("1. Simple (quelques obstacles)")
+        print("2. Labyrinthe (complexe)")
+        print("3. Ouvert (plusieurs cibles)")
+
+        env_choice = input("\nVotre choix (1-3) : ").strip()
+
+    try:
+        env_name = setup_environment(env, env_choice)
+    except ValueError:
         print("Choix invalide, utilisation de l'environnement simple.")
-        env.create_simple_environment()
-        env_name = "Simple"
+        env_name = setup_environment(env, 'simple')
 
     print(f"\nEnvironnement '{env_name}' charge !")
     print("\n" + "-"*60)
@@ -121,6 +339,15 @@ def main():
     current_command = ""
     current_targets = []  # Liste des cibles à atteindre
     current_target_index = 0  # Index de la cible actuelle
+    search = None  # Recherche ARA* qui améliore le chemin courant
+    search_version = 0  # Version du chemin de la recherche suivi par le robot
+    resume_at = 0  # Fin de la pause après une commande (ms)
+    reset_pending = False  # Réinitialiser le robot à la fin de la pause
+    font = pygame.font.Font(None, 24)
+
+    # Les commandes sont lues dans un thread : le rendu ne se bloque jamais sur input()
+    reader = CommandReader()
+    reader.start()
 
     while running:
         # Gestion des événements Pygame
@@ -129,12 +356,24 @@ def main():
                 running = False
 
         if waiting_for_command:
-            # Dessiner l'état actuel
+            # Dessiner l'état actuel (la fenêtre reste réactive pendant la saisie)
             env.draw(robot)
-            pygame.display.flip()
+            clock.tick(60)
 
-            # Attendre une commande de l'utilisateur
-            command = input("\nCommande > ").strip()
+            # Pause après une commande : l'état final reste affiché
+            if pygame.time.get_ticks() < resume_at:
+                continue
+
+            if reset_pending:
+                robot.reset()
+                reset_pending = False
+
+            if search is not None:
+                search.cancel()
+                search = None
+
+            # Prochaine commande en file d'attente (non bloquant)
+            command = reader.get_command()
 
             if not command:
                 continue
@@ -148,53 +387,36 @@ def main():
                 print("\nRobot reinitialise !")
                 continue
 
+            # Parser la commande (nouvelles mesures de phases)
+            evaluator.reset_spans()
+            if profiler is not None:
+                profiler.begin(command)
+            with evaluator.span('parse'):
+                parsed = parser.parse_command(command)
+
             # Analyser la commande
-            print(parser.explain_parsing(command))
-
-            # Parser la commande
-            parsed = parser.parse_command(command)
-
-            # Gérer le format LLM (avec targets) ou simple
-            targets_to_reach = []
-
-            if use_llm and 'targets' in parsed:
-                # Format LLM : liste de targets
-                for target_info in parsed['targets']:
-                    color = target_info.get('color')
-                    shape = target_info.get('shape')
-                    target_type = target_info.get('type', 'target')
-
-                    target_obj = env.find_object(color, shape)
-                    if target_obj:
-                        targets_to_reach.append({
-                            'object': target_obj,
-                            'type': target_type,
-                            'color': color,
-                            'shape': shape
-                        })
-                    else:
-                        print(f"⚠️  Cible non trouvée: {color} {shape}")
+            print(parser.explain_parsing(command, parsed))
 
-            else:
-                # Format simple : une seule cible
-                if not (parsed.get('color') or parsed.get('shape')):
-                    print("\nCommande invalide ! Essayez d'inclure une couleur ou une forme.")
-                    continue
-
-                target = env.find_object(parsed.get('color'), parsed.get('shape'))
-                if target:
-                    targets_to_reach.append({
-                        'object': target,
-                        'type': 'target',
-                        'color': parsed.get('color'),
-                        'shape': parsed.get('shape')
-                    })
+            # Format simple : la commande doit contenir une couleur ou une forme
+            if 'targets' not in parsed and not (parsed.get('color') or parsed.get('shape')):
+                print("\nCommande invalide ! Essayez d'inclure une couleur ou une forme.")
+                if profiler is not None:
+                    profiler.end()
+                continue
+
+            # Associer les cibles aux objets de l'environnement
+            with evaluator.span('lookup'):
+                targets_to_reach, missing_targets = resolve_targets(parsed, env)
+            for target_info in missing_targets:
+                print(f"⚠️  Cible non trouvée: {target_info['color']} {target_info['shape']}")
 
             if not targets_to_reach:
                 print("\nAucune cible trouvée !")
                 print("Cibles disponibles :")
                 for obj in env.objects:
                     print(f"  - {obj.color} {obj.shape}")
+                if profiler is not None:
+                    profiler.end()
                 continue
 
             # Afficher le plan
@@ -210,6 +432,14 @@ def main():
             current_target_index = 0
             current_command = command
 
+            # Planifier le chemin vers la première cible (choisit l'objet le
+            # plus proche si plusieurs correspondent)
+            print(f"\nPlanification du chemin vers cible {current_target_index + 1}/{len(current_targets)}...")
+            with evaluator.span('plan'):
+                search, path = plan_anytime(pathfinder, robot, current_targets[0], deadline_ms)
+            # Sans premier chemin, toute version publiée est nouvelle
+            search_version = search.version if search is not None and path is not None else 0
+
             # Générer le raisonnement pour la première cible
             first_target = current_targets[0]['object']
             print("\n" + "="*60)
@@ -219,21 +449,25 @@ def main():
             for step in reasoning_steps:
                 robot.add_reasoning_step(step)
 
-            # Planifier le chemin vers la première cible
-            print(f"\nPlanification du chemin vers cible {current_target_index + 1}/{len(current_targets)}...")
-            path = pathfinder.find_path_to_target(
-                robot.get_position(),
-                (first_target.x, first_target.y)
-            )
-
-            if path is None:
+            if path is None and search is None:
                 print("\nAucun chemin trouve vers la cible !")
+                if profiler is not None:
+                    profiler.end()
                 continue
 
-            print(f"Chemin trouve avec {len(path)} waypoints !")
+            if path is None:
+                print(f"Pas de chemin en {deadline_ms:g} ms : le robot attend la "
+                      f"recherche en arrière-plan")
+            elif len(current_targets[0]['candidates']) > 1:
+                print(f"Chemin trouve avec {len(path)} waypoints vers le plus proche des "
+                      f"{len(current_targets[0]['candidates'])} objets correspondants "
+                      f"(au plus {search.bound:.2f} fois l'optimal) !")
+            else:
+                print(f"Chemin trouve avec {len(path)} waypoints "
+                      f"(au plus {search.bound:.2f} fois l'optimal) !")
 
-            # Définir le chemin pour le robot
-            robot.set_path(path)
+            # Définir le chemin pour le robot (vide : il attend le premier chemin)
+            robot.set_path(path or [])
 
             waiting_for_command = False
 
@@ -243,30 +477,61 @@ def main():
         else:
             # Mode animation : déplacer le robot
             if not robot.reached_target:
-                robot.move_along_path()
+                # Chemin publié en arrière-plan : le premier est suivi tel quel,
+                # les suivants s'ils raccourcissent le trajet (l'objet visé
+                # suit le chemin adopté)
+                if search is not None and search.version != search_version:
+                    search_version = search.version
+                    index, improved = pathfinder.anytime_nearest_path(search)
+                    if not robot.path:
+                        robot.set_path(improved)
+                        retarget(current_targets[current_target_index], index)
+                        print(f"Chemin trouve avec {len(improved)} waypoints "
+                              f"(au plus {search.bound:.2f} fois l'optimal) !")
+                    elif swap_improved_path(pathfinder, robot, improved):
+                        retarget(current_targets[current_target_index], index)
+                        print(f"Chemin amélioré ({len(robot.path)} waypoints, "
+                              f"au plus {search.bound:.2f} fois l'optimal)")
+                elif (not robot.path and search is not None and search.done
+                      and search.version == search_version):
+                    # Recherche terminée sans chemin : la cible est manquée
+                    print("\nAucun chemin trouve vers la cible !")
+                    robot.reached_target = True
+
+                # Temps de calcul de l'image (hors attente de la cadence)
+                with evaluator.span('execute'):
+                    robot.move_along_path()
+
+                    # Dessiner la scène
+                    env.draw(robot)
 
-                # Dessiner la scène
-                env.draw(robot)
+                    # Afficher les informations
+                    status_text = f"Commande: {current_command}"
+                    text_surface = font.render(status_text, True, (0, 0, 0))
+                    env.screen.blit(text_surface, (10, 10))
 
-                # Afficher les informations
-                font = pygame.font.Font(None, 24)
-                status_text = f"Commande: {current_command}"
-                text_surface = font.render(status_text, True, (0, 0, 0))
-                env.screen.blit(text_surface, (10, 10))
+                    target_info = f"Cible: {current_target_index + 1}/{len(current_targets)}"
+                    target_surface = font.render(target_info, True, (0, 0, 0))
+                    env.screen.blit(target_surface, (10, 35))
 
-                target_info = f"Cible: {current_target_index + 1}/{len(current_targets)}"
-                target_surface = font.render(target_info, True, (0, 0, 0))
-                env.screen.blit(target_surface, (10, 35))
+                    progress_text = f"Waypoint: {robot.current_path_index}/{len(robot.path)}"
+                    progress_surface = font.render(progress_text, True, (0, 0, 0))
+                    env.screen.blit(progress_surface, (10, 60))
 
-                progress_text = f"Waypoint: {robot.current_path_index}/{len(robot.path)}"
-                progress_surface = font.render(progress_text, True, (0, 0, 0))
-                env.screen.blit(progress_surface, (10, 60))
+                    if reader.pending():
+                        queue_text = f"Commandes en attente: {reader.pending()}"
+                        queue_surface = font.render(queue_text, True, (0, 0, 0))
+                        env.screen.blit(queue_surface, (10, 85))
 
-                pygame.display.flip()
+                    pygame.display.flip()
                 clock.tick(60)  # 60 FPS
 
             else:
                 # Le robot a atteint la cible actuelle
+                if search is not None:
+                    search.cancel()
+                    search = None
+
                 current_target = current_targets[current_target_index]
                 target_obj = current_target['object']
 
@@ -285,23 +550,36 @@ def main():
                     if current_target_index < len(current_targets):
                         # Aller à la cible suivante
                         next_target = current_targets[current_target_index]
-                        next_obj = next_target['object']
 
                         print(f"\n→ Passage à la cible suivante: {next_target['color']} {next_target['shape']}")
 
                         # Planifier le nouveau chemin
-                        path = pathfinder.find_path_to_target(
-                            robot.get_position(),
-                            (next_obj.x, next_obj.y)
-                        )
+                        with evaluator.span('plan'):
+                            search, path = plan_anytime(pathfinder, robot, next_target, deadline_ms)
+                        search_version = search.version if search is not None and path is not None else 0
 
                         if path:
                             robot.set_path(path)
                             robot.reached_target = False
                             print(f"Nouveau chemin planifié avec {len(path)} waypoints")
+                        elif search is not None:
+                            robot.set_path([])
+                            print(f"Pas de chemin en {deadline_ms:g} ms : le robot attend la "
+                                  f"recherche en arrière-plan")
                         else:
                             print("⚠️  Aucun chemin trouvé vers la cible suivante")
-                            current_target_index = len(current_targets)  # Terminer
+
+                            # Terminer l'évaluation
+                            evaluator.end_test(False, robot)
+                            if profiler is not None:
+                                profiler.end()
+
+                            # Petite pause (non bloquante) puis réinitialisation
+                            resume_at = pygame.time.get_ticks() + 1000
+                            reset_pending = True
+                            current_targets = []
+                            current_target_index = 0
+                            waiting_for_command = True
 
                     else:
                         # Toutes les cibles atteintes
@@ -309,16 +587,12 @@ def main():
 
                         # Terminer l'évaluation
                         evaluator.end_test(True, robot)
+                        if profiler is not None:
+                            profiler.end()
 
-                        # Dessiner l'état final
-                        env.draw(robot)
-                        pygame.display.flip()
-
-                        # Petite pause avant la prochaine commande
-                        pygame.time.wait(1500)
-
-                        # Réinitialiser
-                        robot.reset()
+                        # Petite pause (non bloquante) avant la prochaine commande
+                        resume_at = pygame.time.get_ticks() + 1500
+                        reset_pending = True
                         current_targets = []
                         current_target_index = 0
                         waiting_for_command = True
@@ -328,16 +602,12 @@ def main():
 
                     # Terminer l'évaluation
                     evaluator.end_test(False, robot)
+                    if profiler is not None:
+                        profiler.end()
 
-                    # Dessiner l'état final
-                    env.draw(robot)
-                    pygame.display.flip()
-
-                    # Petite pause
-                    pygame.time.wait(1000)
-
-                    # Réinitialiser
-                    robot.reset()
+                    # Petite pause (non bloquante)
+                    resume_at = pygame.time.get_ticks() + 1000
+                    reset_pending = True
                     current_targets = []
                     current_target_index = 0
                     waiting_for_command = True
@@ -346,20 +616,40 @@ def main():
     print("\n" + "="*60)
     print("Fermeture du programme...")
 
-    if len(evaluator.results) > 0:
+    if isinstance(parser, TieredParser):
+        parser.print_latency_report()
+        parser.llm_parser.print_stats()
+
+    if evaluator.total_tests > 0:
         evaluator.print_summary()
-        export = input("\nExporter les resultats dans un fichier ? (o/n) : ").strip().lower()
+        export = reader.ask("\nExporter les resultats dans un fichier ? (o/n) : ", default='n').lower()
         if export == 'o':
             evaluator.export_results("results.txt")
 
+    evaluator.close()
+    if profiler is not None:
+        profiler.close()
     pygame.quit()
     print("\nAu revoir !")
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    try:
+        profiler = profiler_from_env(args.profile)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if args.commands:
+        run_batch(args.env or 'simple', args.commands, args.output, args.render, args.results,
+                  profiler)
+        sys.exit(0)
+
     try:
-        main()
+        main(args.env, args.results, profiler, args.deadline)
     except KeyboardInterrupt:
         print("\n\nInterruption par l'utilisateur. Au revoir !")
-        pygame.quit()
+        if 'pygame' in sys.modules:
+            sys.modules['pygame'].quit()
         sys.exit(0)
@@ -0,0 +1,22 @@
+#!/bin/bash
+# Profil du temps d'import au démarrage (python -X importtime)
+# Usage : ./profile_startup.sh [module] [nombre de lignes]
+
+PYTHON="${PYTHON:-python3}"
+MODULE="${1:-main}"
+TOP="${2:-20}"
+
+echo "Profil d'import de '$MODULE' (temps cumulés en microsecondes)"
+echo ""
+
+"$PYTHON" -X importtime -c "import $MODULE" 2>&1 >/dev/null \
+    | grep '^import time:' \
+    | sort -t'|' -k2 -n -r \
+    | head -n "$TOP"
+
+echo ""
+echo "Temps total de démarrage (5 lancements) :"
+TIMEFORMAT="  %Rs"
+for i in 1 2 3 4 5; do
+    time "$PYTHON" -c "import $MODULE" >/dev/null 2>&1
+done
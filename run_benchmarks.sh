@@ -0,0 +1,55 @@
+#!/bin/bash
+# Benchmarks des chemins critiques (pytest-benchmark), sans affichage
+#
+#   ./run_benchmarks.sh               exécute et compare à la dernière référence
+#   ./run_benchmarks.sh save [NOM]    exécute et enregistre une référence
+#
+# Seuil de régression (temps minimal, le moins sensible au bruit) : BENCH_THRESHOLD=15% par défaut
+#
+# Les références (benchmarks/baselines/) dépendent de la machine et ne sont pas
+# versionnées : enregistrer une référence sur chaque machine avant de comparer.
+
+cd "$(dirname "$0")"
+
+PYTHON=${PYTHON:-python3}
+STORAGE="benchmarks/baselines"
+THRESHOLD=${BENCH_THRESHOLD:-15%}
+
+if ! "$PYTHON" -c "import pytest_benchmark" 2>/dev/null; then
+    echo "❌ pytest-benchmark n'est pas installé : pip install pytest-benchmark"
+    exit 1
+fi
+
+export SDL_VIDEODRIVER=dummy
+
+# Mesures plus stables : pas de ramasse-miettes pendant les tours, échauffement
+ARGS=(
+    benchmarks/bench_hot_paths.py
+    -q
+    --benchmark-storage="file://$STORAGE"
+    --benchmark-disable-gc
+    --benchmark-warmup=on
+    --benchmark-min-rounds=5
+    --benchmark-sort=name
+    --benchmark-columns=min,median,mean,stddev,rounds
+)
+
+case "$1" in
+    save)
+        "$PYTHON" -m pytest "${ARGS[@]}" --benchmark-save="${2:-baseline}"
+        ;;
+    "")
+        if ls "$STORAGE"/*/*.json &> /dev/null; then
+            "$PYTHON" -m pytest "${ARGS[@]}" --benchmark-compare \
+                --benchmark-compare-fail="min:$THRESHOLD"
+        else
+            echo "Aucune référence dans $STORAGE (propre à chaque machine, non versionnée) :"
+            echo "enregistrez-en une d'abord avec ./run_benchmarks.sh save"
+            "$PYTHON" -m pytest "${ARGS[@]}"
+        fi
+        ;;
+    *)
+        echo "Usage: $0 [save [NOM]]"
+        exit 1
+        ;;
+esac
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Service HTTP/WebSocket pour piloter le robot depuis d'autres services
+
+Routes :
+    GET    /health                      État du service
+    GET    /sessions                    Liste des sessions
+    POST   /sessions                    Crée une session {"env": "simple", "steps_per_tick": 1}
+    GET    /sessions/{id}               État d'une session
+    DELETE /sessions/{id}               Ferme une session
+    POST   /sessions/{id}/commands      Envoie une commande {"command": "...", "wait": false}
+    GET    /sessions/{id}/ws            Flux WebSocket (positions, waypoints, résultats)
+
+Usage:
+    python3 server.py --host 127.0.0.1 --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+from src.nlp_parser import NLPParser
+from src.service import SessionError, SessionManager
+
+try:
+    from aiohttp import web, WSMsgType
+    AIOHTTP_AVAILABLE = True
+    MANAGER = web.AppKey('manager', SessionManager)
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+def create_parser():
+    """Parser partagé : hiérarchisé (local puis LLM) si une clé API est définie"""
+    from src.llm_parser import LLMParser, is_available
+
+    if is_available() and os.getenv('GEMINI_API_KEY'):
+        from src.tiered_parser import TieredParser
+        return TieredParser(LLMParser())
+    return NLPParser()
+
+
+def json_error(status: int, message: str):
+    """Réponse d'erreur JSON"""
+    return web.json_response({'error': message}, status=status)
+
+
+def bad_request(message: str):
+    """Erreur 400 (corps JSON) à lever depuis un gestionnaire"""
+    return web.HTTPBadRequest(text=json.dumps({'error': message}, ensure_ascii=False),
+                              content_type='application/json')
+
+
+async def read_body(request) -> dict:
+    """
+    Corps JSON de la requête ({} si vide)
+
+    Raises:
+        web.HTTPBadRequest: si le corps n'est pas un objet JSON valide
+    """
+    if not request.can_read_body:
+        return {}
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise bad_request(f"Corps JSON invalide: {e}")
+    if not isinstance(body, dict):
+        raise bad_request("Le corps doit être un objet JSON")
+    return body
+
+
+async def health(request):
+    manager: SessionManager = request.app[MANAGER]
+    return web.json_response({'status': 'ok', 'sessions': len(manager.sessions)})
+
+
+async def list_sessions(request):
+    return web.json_response(request.app[MANAGER].list_states())
+
+
+async def create_session(request):
+    manager: SessionManager = request.app[MANAGER]
+    body = await read_body(request)
+
+    options = {}
+    for key, convert in (('tick_rate', float), ('steps_per_tick', int)):
+        if key not in body:
+            continue
+        if isinstance(body[key], bool):
+            raise bad_request(f"'{key}' doit être un nombre")
+        try:
+            options[key] = convert(body[key])
+        except (TypeError, ValueError, OverflowError):
+            raise bad_request(f"'{key}' doit être un nombre")
+
+    env_choice = body.get('env', 'simple')
+    if not isinstance(env_choice, str):
+        raise bad_request("'env' doit être une chaîne")
+
+    try:
+        session = manager.create(env_choice, **options)
+    except ValueError as e:
+        return json_error(400, str(e))
+    except SessionError as e:
+        return json_error(503, str(e))
+
+    return web.json_response(session.get_state(), status=201)
+
+
+async def get_session(request):
+    try:
+        session = request.app[MANAGER].get(request.match_info['session_id'])
+    except SessionError as e:
+        return json_error(404, str(e))
+    return web.json_response(session.get_state())
+
+
+async def delete_session(request):
+    try:
+        await request.app[MANAGER].delete(request.match_info['session_id'])
+    except SessionError as e:
+        return json_error(404, str(e))
+    return web.json_response({'deleted': True})
+
+
+async def post_command(request):
+    try:
+        session = request.app[MANAGER].get(request.match_info['session_id'])
+    except SessionError as e:
+        return json_error(404, str(e))
+
+    body = await read_body(request)
+    command = str(body.get('command', '')).strip()
+    if not command:
+        return json_error(400, "Champ 'command' requis")
+
+    try:
+        command_id = session.submit(command)
+    except SessionError as e:
+        return json_error(429, str(e))
+
+    if body.get('wait'):
+        try:
+            return web.json_response(await session.wait_result(command_id))
+        except SessionError as e:
+            # Session supprimée pendant l'attente
+            return json_error(409, str(e))
+
+    return web.json_response({'command_id': command_id, 'pending': session.commands.qsize()},
+                             status=202)
+
+
+async def session_websocket(request):
+    try:
+        session = request.app[MANAGER].get(request.match_info['session_id'])
+    except SessionError as e:
+        return json_error(404, str(e))
+
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    subscriber = session.subscribe()
+
+    async def send_events():
+        while True:
+            event = await subscriber.get()
+            await ws.send_json(event)
+            if event['type'] == 'closed':
+                await ws.close()
+                return
+
+    sender = asyncio.create_task(send_events())
+    try:
+        # Les messages texte reçus sont traités comme des commandes
+        async for message in ws:
+            if message.type == WSMsgType.TEXT and message.data.strip():
+                try:
+                    session.submit(message.data.strip())
+                except SessionError as e:
+                    await ws.send_json({'type': 'error', 'error': str(e)})
+    finally:
+        sender.cancel()
+        session.unsubscribe(subscriber)
+
+    return ws
+
+
+async def close_sessions(app):
+    await app[MANAGER].close_all()
+
+
+def create_app(parser=None, max_sessions: int = 1000, tick_rate: float = 60.0,
+               steps_per_tick: int = 1):
+    """Construit l'application aiohttp"""
+    app = web.Application()
+    app[MANAGER] = SessionManager(parser or create_parser(), max_sessions=max_sessions,
+                                  tick_rate=tick_rate, steps_per_tick=steps_per_tick)
+
+    app.router.add_get('/health', health)
+    app.router.add_get('/sessions', list_sessions)
+    app.router.add_post('/sessions', create_session)
+    app.router.add_get('/sessions/{session_id}', get_session)
+    app.router.add_delete('/sessions/{session_id}', delete_session)
+    app.router.add_post('/sessions/{session_id}/commands', post_command)
+    app.router.add_get('/sessions/{session_id}/ws', session_websocket)
+    app.on_shutdown.append(close_sessions)
+
+    return app
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Service HTTP/WebSocket du robot virtuel")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8080)
+    arg_parser.add_argument('--max-sessions', type=int, default=1000)
+    arg_parser.add_argument('--tick-rate', type=float, default=60.0,
+                            help="Pas de simulation par seconde (0 = aussi vite que possible)")
+    arg_parser.add_argument('--steps-per-tick', type=int, default=1,
+                            help="Déplacements du robot par pas de simulation")
+    args = arg_parser.parse_args()
+
+    if not AIOHTTP_AVAILABLE:
+        print("❌ aiohttp n'est pas installé : pip install aiohttp")
+        sys.exit(1)
+
+    app = create_app(max_sessions=args.max_sessions, tick_rate=args.tick_rate,
+                     steps_per_tick=args.steps_per_tick)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    # Charger le fichier .env comme main.py
+    env_file = Path(__file__).parent / '.env'
+    if env_file.exists():
+        with open(env_file) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    os.environ[key] = value
+
+    main()
@@ -0,0 +1,285 @@
+"""
+Planification à temps borné (ARA*, Anytime Repairing A*)
+Une recherche A* pondérée (clé g + ε·h) trouve vite un premier chemin, au
+plus ε fois plus long que l'optimal ; ε diminue ensuite jusqu'à 1 en
+réutilisant les scores déjà calculés, chaque itération publiant un chemin
+meilleur. La recherche s'interrompt à une échéance et peut reprendre dans un
+thread en arrière-plan pendant que le robot se déplace. NearestAnytimeSearch
+vise la plus proche de plusieurs arrivées, sous un même délai.
+"""
+
+import heapq
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Facteurs ε successifs : le premier chemin est trouvé avec le plus grand
+DEFAULT_EPSILONS = (3.0, 2.0, 1.5, 1.2, 1.0)
+
+# Nœuds développés au plus par itération (même borne que PathFinder.a_star)
+MAX_EXPANSIONS = 10000
+
+# Coût d'un pas diagonal (exactement √2 : l'heuristique euclidienne reste admissible)
+DIAGONAL_COST = math.sqrt(2)
+
+_DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class AnytimeSearch:
+    """
+    État d'une recherche ARA* entre deux cellules de la grille
+
+    Le chemin publié (cellules), sa borne de sous-optimalité et sa version
+    sont lus sous verrou par result() ; le reste de l'état n'est modifié que
+    par le thread qui exécute run().
+    """
+
+    def __init__(self, blocked, start: Tuple[int, int], goal: Tuple[int, int],
+                 cost: Optional[List[List[float]]] = None, epsilons=DEFAULT_EPSILONS,
+                 max_expansions: int = MAX_EXPANSIONS):
+        """
+        Args:
+            blocked: Grille booléenne (hauteur, largeur), True = cellule interdite :
+                     tableau numpy ou listes Python (PathFinder.blocked_rows,
+                     utilisées telles quelles)
+            start: Cellule de départ (peut être interdite, comme pour a_star)
+            goal: Cellule d'arrivée
+            cost: Multiplicateurs de coût par cellule (PathFinder.cost_grid), ou None
+            epsilons: Facteurs ε décroissants, le dernier valant normalement 1
+            max_expansions: Nœuds développés au plus par itération
+        """
+        if isinstance(blocked, np.ndarray):
+            blocked = np.asarray(blocked, dtype=bool).tolist()
+        self._blocked = blocked
+        self.height, self.width = len(blocked), len(blocked[0]) if blocked else 0
+        self.start = start
+        self.goal = goal              # arrivée de plus petit score g (fixe avec un seul but)
+        self.goals: Dict[Tuple[int, int], int] = {goal: 0}
+        self.cost = cost
+        self.epsilons = list(epsilons)
+        self.max_expansions = max_expansions
+
+        self.g = {start: 0.0}
+        self.parent = {start: None}
+        self._open = []               # (clé, -g, nœud), suppression paresseuse
+        self._open_nodes = set()
+        self.closed = set()
+        self._incons = set()          # nœuds fermés améliorés pendant l'itération
+        self._index = 0               # indice de ε courant
+        self._expansions = 0          # nœuds développés dans l'itération courante
+
+        # Résultat publié
+        self.path: Optional[List[Tuple[int, int]]] = None
+        self.bound = float('inf')
+        self.version = 0
+        self.done = False
+
+        # Compteurs cumulés (tous threads confondus)
+        self.nodes_expanded = 0
+        self.collision_checks = 0
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        gx, gy = goal
+        if not (0 <= gx < self.width and 0 <= gy < self.height) or self._blocked[gy][gx]:
+            self.done = True
+        else:
+            self._push(start)
+
+    def heuristic(self, node: Tuple[int, int]) -> float:
+        return ((node[0] - self.goal[0]) ** 2 + (node[1] - self.goal[1]) ** 2) ** 0.5
+
+    @property
+    def epsilon(self) -> float:
+        return self.epsilons[min(self._index, len(self.epsilons) - 1)]
+
+    def _push(self, node: Tuple[int, int]):
+        g = self.g[node]
+        self._open_nodes.add(node)
+        heapq.heappush(self._open, (g + self.epsilon * self.heuristic(node), -g, node))
+
+    def _top(self) -> Optional[float]:
+        """Plus petite clé ouverte (entrées périmées retirées), None si vide"""
+        while self._open:
+            key, neg_g, node = self._open[0]
+            if node in self._open_nodes and -neg_g == self.g[node]:
+                return key
+            heapq.heappop(self._open)
+        return None
+
+    def _improve(self, deadline: Optional[float]) -> bool:
+        """
+        Itération ARA* pour le ε courant
+
+        Returns:
+            True si l'itération est terminée, False si elle a été interrompue
+            (échéance, annulation ou borne de nœuds atteinte)
+        """
+        cost = self.cost
+        blocked = self._blocked
+        g_score = self.g
+        goals = self.goals
+
+        while True:
+            key = self._top()
+            if key is None or g_score.get(self.goal, float('inf')) <= key:
+                return True
+
+            if self._cancelled.is_set():
+                return False
+            # L'échéance s'applique aussi avant le premier chemin : la
+            # recherche reprend ensuite là où elle s'est arrêtée
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if self._expansions >= self.max_expansions:
+                self.done = True
+                return False
+
+            _, _, current = heapq.heappop(self._open)
+            self._open_nodes.discard(current)
+            self.closed.add(current)
+            self._expansions += 1
+            self.nodes_expanded += 1
+
+            x, y = current
+            current_g = g_score[current]
+            for dx, dy in _DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < self.width and 0 <= ny < self.height):
+                    continue
+                self.collision_checks += 1
+                if blocked[ny][nx]:
+                    continue
+
+                neighbor = (nx, ny)
+                move_cost = DIAGONAL_COST if dx and dy else 1.0
+                if cost is not None:
+                    move_cost *= cost[ny][nx]
+                tentative = current_g + move_cost
+                if tentative < g_score.get(neighbor, float('inf')):
+                    if neighbor in goals and tentative < g_score.get(self.goal, float('inf')):
+                        self.goal = neighbor
+                    g_score[neighbor] = tentative
+                    self.parent[neighbor] = current
+                    if neighbor in self.closed:
+                        self._incons.add(neighbor)
+                    else:
+                        self._push(neighbor)
+
+    def _publish(self):
+        """Publie le chemin de l'itération terminée et sa borne de sous-optimalité"""
+        cells = []
+        node = self.goal
+        while node is not None:
+            cells.append(node)
+            node = self.parent[node]
+        cells.reverse()
+
+        # Borne ε' = min(ε, g(but) / min(g + h) sur les nœuds ouverts ou incohérents)
+        g_goal = self.g[self.goal]
+        pending = self._open_nodes | self._incons
+        lower = min((self.g[n] + self.heuristic(n) for n in pending), default=g_goal)
+        bound = min(self.epsilon, g_goal / lower) if lower > 0 else 1.0
+
+        with self._lock:
+            self.path = cells
+            self.bound = max(bound, 1.0)
+            self.version += 1
+
+    def _next_epsilon(self):
+        """Passe au ε suivant : nœuds incohérents rouverts, clés recalculées"""
+        self._index += 1
+        nodes = self._open_nodes | self._incons
+        self._incons = set()
+        self.closed = set()
+        self._open_nodes = set()
+        self._open = []
+        self._expansions = 0
+        for node in nodes:
+            self._push(node)
+
+    def run(self, deadline: Optional[float] = None):
+        """
+        Poursuit la recherche jusqu'à ε = 1, l'échéance ou l'annulation
+
+        Args:
+            deadline: Instant limite (time.perf_counter) ; None = sans limite.
+                      Si elle passe avant le premier chemin, path reste None
+                      et done False : un nouvel appel (ou start_background)
+                      poursuit la recherche.
+        """
+        while not self.done:
+            if not self._improve(deadline):
+                return
+
+            if self.goal not in self.g:
+                # Espace accessible épuisé : pas de chemin
+                self.done = True
+                return
+
+            self._publish()
+            if self._index + 1 >= len(self.epsilons) or self.bound <= 1.0:
+                self.done = True
+                return
+            self._next_epsilon()
+
+    def start_background(self):
+        """Poursuit la recherche (premier chemin ou améliorations) dans un thread en arrière-plan"""
+        if self.done or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Arrête les améliorations (le dernier chemin publié reste disponible)"""
+        self._cancelled.set()
+
+    def join(self, timeout: Optional[float] = None):
+        """Attend la fin du thread d'amélioration"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def result(self) -> Tuple[int, Optional[List[Tuple[int, int]]], float]:
+        """(version, cellules du dernier chemin publié, borne de sous-optimalité)"""
+        with self._lock:
+            return self.version, self.path, self.bound
+
+
+class NearestAnytimeSearch(AnytimeSearch):
+    """
+    ARA* vers la plus proche (en coût) de plusieurs cellules d'arrivée
+
+    L'heuristique est la distance à l'arrivée la plus proche (admissible) et
+    goal désigne l'arrivée atteinte de plus petit score g : arrêt et borne
+    de sous-optimalité sont ceux d'une recherche vers un but virtuel relié
+    sans coût à toutes les arrivées. Un seul délai vaut pour toutes.
+    """
+
+    def __init__(self, blocked, start: Tuple[int, int], goals: Dict[Tuple[int, int], int],
+                 heuristic: Callable[[Tuple[int, int]], float],
+                 cost: Optional[List[List[float]]] = None, epsilons=DEFAULT_EPSILONS,
+                 max_expansions: int = MAX_EXPANSIONS):
+        """
+        Args:
+            blocked: Grille interdite (comme AnytimeSearch)
+            start: Cellule de départ
+            goals: Cellules d'arrivée libres (au moins une) -> indice de la
+                   cible correspondante, rendu avec le chemin par PathFinder
+            heuristic: Distance (cellules) d'une cellule à l'arrivée la plus proche
+            cost: Multiplicateurs de coût par cellule, ou None
+            epsilons: Facteurs ε décroissants
+            max_expansions: Nœuds développés au plus par itération
+        """
+        self._heuristic = heuristic
+        super().__init__(blocked, start, start if start in goals else next(iter(goals)),
+                         cost, epsilons, max_expansions)
+        self.goals = dict(goals)
+
+    def heuristic(self, node: Tuple[int, int]) -> float:
+        return self._heuristic(node)
@@ -0,0 +1,176 @@
+"""
+Disjoncteur (circuit breaker) pour les appels réseau au LLM
+Après plusieurs échecs consécutifs, les appels sont court-circuités pendant
+une période de refroidissement au lieu d'attendre une erreur à chaque fois.
+Un disjoncteur peut être partagé entre threads (service) : les transitions et
+les compteurs sont protégés par un verrou, l'appel lui-même ne l'est pas.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Levée quand un appel est refusé parce que le circuit est ouvert"""
+
+
+class CircuitBreaker:
+    """Disjoncteur avec réessais à backoff exponentiel et jitter"""
+
+    CLOSED = 'closed'        # Fonctionnement normal
+    OPEN = 'open'            # Appels court-circuités
+    HALF_OPEN = 'half_open'  # Un appel d'essai est autorisé
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0,
+                 max_cooldown: float = 300.0, max_retries: int = 2,
+                 base_delay: float = 0.5, max_delay: float = 8.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialise le disjoncteur
+
+        Args:
+            failure_threshold: Échecs consécutifs avant ouverture du circuit
+            cooldown: Durée initiale d'ouverture (secondes)
+            max_cooldown: Durée maximale d'ouverture (doublée à chaque essai raté)
+            max_retries: Réessais par appel tant que le circuit est fermé
+            base_delay: Délai de base du backoff exponentiel (secondes)
+            max_delay: Délai maximal entre deux réessais (secondes)
+            clock: Horloge monotone (injectable pour les tests)
+            sleep: Fonction d'attente (injectable pour les tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+
+        # Appel d'essai en cours (demi-ouvert) : un seul à la fois
+        self.probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.total_calls = 0
+        self.total_successes = 0
+        self.total_failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+        self.error_counts: Dict[str, int] = {}
+
+    def allow_request(self) -> bool:
+        """
+        Indique si un appel peut être tenté maintenant
+
+        En fin de refroidissement, un seul appelant obtient l'appel d'essai
+        (demi-ouvert) ; les autres sont refusés jusqu'à son résultat, ou
+        jusqu'à ce qu'il dépasse lui-même une durée de refroidissement.
+        """
+        with self._lock:
+            return self._allow()
+
+    def _allow(self) -> bool:
+        now = self.clock()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.cooldown:
+                return False
+            # Fin du refroidissement : autoriser un appel d'essai
+            self.state = self.HALF_OPEN
+            self.probe_started_at = now
+            return True
+        if self.state == self.HALF_OPEN:
+            if self.probe_started_at is not None and now - self.probe_started_at < self.cooldown:
+                return False
+            self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        """Enregistre un appel réussi (referme le circuit)"""
+        with self._lock:
+            self.total_successes += 1
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self.state = self.CLOSED
+            self.probe_started_at = None
+
+    def record_failure(self, error: Exception):
+        """Enregistre un appel en échec (peut ouvrir le circuit)"""
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            error_name = type(error).__name__
+            self.error_counts[error_name] = self.error_counts.get(error_name, 0) + 1
+
+            if self.state == self.HALF_OPEN:
+                # L'appel d'essai a échoué : rouvrir plus longtemps
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        """Ouvre le circuit (verrou tenu)"""
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self.probe_started_at = None
+        self.times_opened += 1
+        print(f"⚠️  Circuit LLM ouvert : appels suspendus pendant {self.cooldown:.1f}s")
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Délai avant le réessai numéro attempt (backoff exponentiel, jitter complet)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Appelle func à travers le disjoncteur, avec réessais
+
+        Raises:
+            CircuitOpenError: si le circuit est ouvert
+            Exception: la dernière erreur de func si tous les essais échouent
+        """
+        with self._lock:
+            self.total_calls += 1
+
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                allowed = self._allow()
+                if not allowed:
+                    self.short_circuited += 1
+            if not allowed:
+                raise CircuitOpenError("Circuit LLM ouvert")
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.record_failure(e)
+                if self.state != self.CLOSED or attempt == self.max_retries:
+                    raise
+                self.sleep(self.backoff_delay(attempt))
+                continue
+
+            self.record_success()
+            return result
+
+    def get_stats(self) -> Dict:
+        """Retourne l'état et les compteurs du disjoncteur"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'total_calls': self.total_calls,
+                'total_successes': self.total_successes,
+                'total_failures': self.total_failures,
+                'short_circuited': self.short_circuited,
+                'times_opened': self.times_opened,
+                'cooldown': self.cooldown,
+                'errors': dict(self.error_counts),
+            }
@@ -0,0 +1,105 @@
+"""
+Lecture des commandes en arrière-plan
+Un thread lit l'entrée standard et remplit une file d'attente, pour que la
+boucle de rendu Pygame ne soit jamais bloquée par input()
+"""
+
+import queue
+import threading
+from typing import Optional, Tuple
+
+
+class CommandReader:
+    """Lit les commandes de l'utilisateur dans un thread en arrière-plan"""
+
+    def __init__(self, prompt: str = "\nCommande > ", stop_commands: Tuple[str, ...] = ('quit',)):
+        """
+        Initialise le lecteur
+
+        Args:
+            prompt: Invite affichée avant chaque saisie
+            stop_commands: Commandes après lesquelles le thread s'arrête de lire
+        """
+        self.prompt = prompt
+        self.stop_commands = stop_commands
+        self.queue: "queue.Queue[str]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+        # Réponses aux questions (ask) : canal séparé des commandes
+        self.answers: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._asking = threading.Event()
+        self.eof = False
+
+    def start(self):
+        """Démarre le thread de lecture"""
+        self.thread.start()
+
+    def _run(self):
+        """Boucle du thread : lit une ligne, la met en file d'attente"""
+        while True:
+            try:
+                line = input(self.prompt)
+            except (EOFError, KeyboardInterrupt):
+                # Fin de l'entrée standard : demander l'arrêt du programme
+                # (et débloquer une question en attente)
+                self.eof = True
+                self.answers.put(None)
+                self.queue.put(self.stop_commands[0] if self.stop_commands else '')
+                return
+
+            if self._asking.is_set():
+                self.answers.put(line.strip())
+                continue
+
+            command = line.strip()
+            self.queue.put(command)
+
+            if command.lower() in self.stop_commands:
+                return
+
+    def get_command(self) -> Optional[str]:
+        """Retourne la prochaine commande en attente, ou None (non bloquant)"""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def pending(self) -> int:
+        """Nombre de commandes en attente"""
+        return self.queue.qsize()
+
+    def discard_pending(self) -> int:
+        """Vide la file des commandes en attente ; retourne leur nombre"""
+        discarded = 0
+        while self.get_command() is not None:
+            discarded += 1
+        return discarded
+
+    def ask(self, question: str, default: str = '') -> str:
+        """
+        Pose une question et attend la réponse (via le thread s'il lit encore)
+
+        Les commandes tapées à l'avance sont abandonnées : la réponse est la
+        première ligne lue après la question, jamais une commande en file.
+
+        Args:
+            question: Question affichée
+            default: Réponse si l'entrée standard est fermée
+        """
+        if self.eof:
+            return default
+
+        if not self.thread.is_alive():
+            try:
+                return input(question).strip()
+            except (EOFError, KeyboardInterrupt):
+                return default
+
+        self._asking.set()
+        try:
+            self.discard_pending()
+            print(question, end='', flush=True)
+            answer = self.answers.get()
+        finally:
+            self._asking.clear()
+        return default if answer is None else answer
@@ -0,0 +1,121 @@
+"""
+Transformée de distance euclidienne sur une grille
+Utilise scipy.ndimage si disponible, sinon une implémentation NumPy exacte
+en O(hauteur × largeur) : passe verticale, puis enveloppe inférieure de
+paraboles sur chaque ligne (Felzenszwalb et Huttenlocher)
+"""
+
+import numpy as np
+
+try:
+    from scipy import ndimage
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def distance_transform(occupied: np.ndarray) -> np.ndarray:
+    """
+    Distance de chaque cellule à la cellule occupée la plus proche
+
+    Args:
+        occupied: Tableau booléen (hauteur, largeur), True = occupé
+
+    Returns:
+        Tableau float32 des distances en cellules (0 sur les cellules occupées,
+        inf si aucune cellule n'est occupée)
+    """
+    occupied = np.asarray(occupied, dtype=bool)
+    if not occupied.any():
+        return np.full(occupied.shape, np.inf, dtype=np.float32)
+
+    if SCIPY_AVAILABLE:
+        return ndimage.distance_transform_edt(~occupied).astype(np.float32)
+
+    return np.sqrt(_squared_distance_numpy(occupied)).astype(np.float32)
+
+
+def parabola_envelope(positions: np.ndarray, values: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """
+    Pour chaque ligne, min sur k de (q - positions[k])² + values[ligne, k]
+
+    Enveloppe inférieure des paraboles construite en une passe sur les
+    positions (vectorisée sur les lignes), puis lue en chaque requête :
+    O(lignes × (positions + requêtes)) au lieu du produit des deux.
+
+    Args:
+        positions: Abscisses strictement croissantes (K,)
+        values: Hauteurs finies des paraboles (lignes, K)
+        queries: Abscisses des requêtes (Q,)
+
+    Returns:
+        Tableau float64 (lignes, Q) ; inf si K vaut 0
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    queries = np.asarray(queries, dtype=np.float64)
+    rows, count = values.shape
+    if count == 0:
+        return np.full((rows, len(queries)), np.inf)
+
+    # Enveloppe de chaque ligne : indices des paraboles et abscisse à partir
+    # de laquelle chacune est minimale ; la dernière est aussi gardée à part
+    # (position, hauteur relevée, début) pour le cas courant sans retrait
+    hull = np.zeros((rows, count), dtype=np.int64)
+    start = np.full((rows, count), np.inf)
+    start[:, 0] = -np.inf
+    size = np.ones(rows, dtype=np.int64)
+    lifted = values + positions ** 2
+    every = np.arange(rows)
+    last_position = np.full(rows, positions[0])
+    last_lifted = lifted[:, 0].copy()
+    last_start = np.full(rows, -np.inf)
+
+    for k in range(1, count):
+        position, top = positions[k], lifted[:, k]
+        cross = (top - last_lifted) / (2 * (position - last_position))
+        hidden = cross <= last_start
+        if hidden.any():
+            # La dernière parabole est cachée sur certaines lignes : retirée
+            # (et les précédentes tant qu'elles le sont aussi)
+            todo = every[hidden]
+            while len(todo):
+                size[todo] -= 1
+                start[todo, size[todo]] = np.inf
+                previous = hull[todo, size[todo] - 1]
+                retry = (top[todo] - lifted[todo, previous]) / (2 * (position - positions[previous]))
+                cross[todo] = retry
+                todo = todo[retry <= start[todo, size[todo] - 1]]
+
+        # Parabole k ajoutée en fin d'enveloppe sur toutes les lignes
+        hull[every, size] = k
+        start[every, size] = cross
+        size += 1
+        last_position[:] = position
+        last_lifted = top
+        last_start = cross
+
+    result = np.empty((rows, len(queries)))
+    for row in range(rows):
+        segment = np.searchsorted(start[row, :size[row]], queries, side='right') - 1
+        chosen = hull[row, segment]
+        result[row] = (queries - positions[chosen]) ** 2 + values[row, chosen]
+    return result
+
+
+def _squared_distance_numpy(occupied: np.ndarray) -> np.ndarray:
+    """Distance euclidienne au carré, exacte (passe verticale puis enveloppes par ligne)"""
+    height, width = occupied.shape
+
+    # Passe 1 : distance verticale à la cellule occupée la plus proche dans la colonne
+    vertical = np.where(occupied, 0.0, np.inf)
+    for y in range(1, height):
+        np.minimum(vertical[y], vertical[y - 1] + 1, out=vertical[y])
+    for y in range(height - 2, -1, -1):
+        np.minimum(vertical[y], vertical[y + 1] + 1, out=vertical[y])
+
+    # Passe 2 : d²(x, y) = min sur x' de (x - x')² + vertical²(x', y), sur les
+    # seules colonnes contenant une cellule occupée (les autres valent inf)
+    columns = np.arange(width, dtype=np.float64)
+    occupied_columns = occupied.any(axis=0)
+    return parabola_envelope(columns[occupied_columns], vertical[:, occupied_columns] ** 2, columns)
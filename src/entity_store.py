@@ -0,0 +1,472 @@
+"""
+Stockage en colonnes des objets et obstacles
+Chaque champ est une colonne NumPy (int32) ; GameObject et Obstacle sont de
+petites vues (__slots__) sur une ligne du stockage, créées à la demande, qui
+gardent l'API par attributs (obj.x, obj.color, obstacle.width...).
+Les couleurs et formes sont codées par des tables partagées par tout le
+processus. Un stockage construit sur un tableau existant (instantané, fichier
+memmap) le partage et ne le copie qu'à la première modification.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pygame
+
+
+# Couleurs reconnues (partagées par tous les objets)
+COLOR_MAP: Dict[str, Tuple[int, int, int]] = {
+    'rouge': (255, 0, 0),
+    'red': (255, 0, 0),
+    'bleu': (0, 0, 255),
+    'blue': (0, 0, 255),
+    'vert': (0, 255, 0),
+    'green': (0, 255, 0),
+    'jaune': (255, 255, 0),
+    'yellow': (255, 255, 0),
+    'orange': (255, 165, 0),
+    'violet': (128, 0, 128),
+    'purple': (128, 0, 128),
+}
+DEFAULT_RGB = (128, 128, 128)
+OBSTACLE_RGB = (100, 100, 100)  # Gris
+
+# Capacité initiale d'un stockage (doublée à chaque dépassement)
+INITIAL_CAPACITY = 16
+
+# Taille maximale des matrices points × entités des requêtes vectorisées
+_CHUNK_ELEMENTS = 1_000_000
+
+# Noms de formes dessinées en carré (toute autre forme est un cercle)
+SQUARE_SHAPES = ('square', 'carré')
+
+
+class StringTable:
+    """Table de codes entiers pour des chaînes répétées (couleurs, formes)"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        """Code de name (ajouté à la table si besoin)"""
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code: int) -> str:
+        return self.names[code]
+
+    def matching_codes(self, name: str) -> List[int]:
+        """Codes des chaînes égales à name sans tenir compte de la casse"""
+        name = name.lower()
+        return [code for code, candidate in enumerate(self.names) if candidate.lower() == name]
+
+
+COLOR_TABLE = StringTable(COLOR_MAP)
+SHAPE_TABLE = StringTable(['square', 'circle'])
+
+
+def as_points(points) -> np.ndarray:
+    """Tableau (N, 2) de points (x, y) à partir d'une séquence ou d'un tableau"""
+    points = np.asarray(points)
+    if points.dtype.kind not in 'iuf':
+        points = points.astype(np.float64)
+    return points.reshape(-1, 2)
+
+
+def _chunks(count: int, width: int):
+    """Tranches de points telles que tranche × width reste sous _CHUNK_ELEMENTS"""
+    step = max(1, _CHUNK_ELEMENTS // max(1, width))
+    for start in range(0, count, step):
+        yield slice(start, start + step)
+
+
+class ColumnStore:
+    """
+    Lignes d'entiers stockées colonne par colonne
+
+    Les sous-classes définissent FIELDS et VIEW (classe des vues). version
+    augmente à chaque modification (ajout, écriture par une vue) : les caches
+    calculés à partir du stockage la comparent pour se savoir périmés.
+    """
+    FIELDS: Tuple[str, ...] = ()
+    VIEW = None
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._data = np.empty((len(self.FIELDS), max(1, capacity)), dtype=np.int32)
+        self._size = 0
+        self._shared = False
+        self.version = 0
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray) -> 'ColumnStore':
+        """
+        Stockage partageant un tableau (N, len(FIELDS)) existant
+
+        Le tableau n'est pas copié : il le sera à la première modification.
+        """
+        rows = np.asarray(rows).reshape(-1, len(cls.FIELDS))
+        store = cls.__new__(cls)
+        store._data = rows.T if rows.dtype == np.int32 else rows.T.astype(np.int32)
+        store._size = len(rows)
+        store._shared = True
+        store.version = 0
+        return store
+
+    @classmethod
+    def from_views(cls, views: Iterable) -> 'ColumnStore':
+        """Stockage construit à partir de vues (ou d'objets autonomes)"""
+        views = list(views)
+        store = cls(len(views))
+        for view in views:
+            store._append_row(view._store._data[:, view._index])
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self):
+        view = self.VIEW._view
+        for index in range(self._size):
+            yield view(self, index)
+
+    def __getitem__(self, key):
+        """Vue pour un indice entier ; nouveau stockage pour une tranche ou un masque"""
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self._size
+            if not 0 <= key < self._size:
+                raise IndexError("indice hors limites")
+            return self.VIEW._view(self, int(key))
+        return type(self).from_rows(self.rows()[key])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._size} lignes)"
+
+    def rows(self) -> np.ndarray:
+        """Tableau (N, len(FIELDS)) en lecture seule, sans copie"""
+        rows = self._data[:, :self._size].T
+        rows.flags.writeable = False
+        return rows
+
+    def column(self, field: str) -> np.ndarray:
+        """Colonne d'un champ (lecture seule, sans copie)"""
+        column = self._data[self.FIELDS.index(field), :self._size]
+        column.flags.writeable = False
+        return column
+
+    def freeze(self) -> np.ndarray:
+        """
+        Lignes courantes en lecture seule, pour un instantané
+
+        Le tableau devient partagé : la prochaine modification du stockage
+        travaillera sur une copie.
+        """
+        self._shared = True
+        return self.rows()
+
+    def _reserve(self, size: int):
+        """Garantit une capacité propre (non partagée) d'au moins size lignes"""
+        capacity = self._data.shape[1]
+        if not self._shared and size <= capacity:
+            return
+        if size > capacity:
+            capacity = max(size, capacity * 2)
+        data = np.empty((len(self.FIELDS), capacity), dtype=np.int32)
+        data[:, :self._size] = self._data[:, :self._size]
+        self._data = data
+        self._shared = False
+
+    def _append_row(self, values) -> int:
+        self._reserve(self._size + 1)
+        self._data[:, self._size] = values
+        self._size += 1
+        self.version += 1
+        return self._size - 1
+
+    def _get(self, index: int, field: int) -> int:
+        return int(self._data[field, index])
+
+    def _set(self, index: int, field: int, value: int):
+        self._reserve(self._size)
+        self._data[field, index] = value
+        self.version += 1
+
+
+class _View:
+    """Vue sur une ligne d'un ColumnStore"""
+    __slots__ = ('_store', '_index')
+    STORE = None
+
+    @classmethod
+    def _view(cls, store: ColumnStore, index: int):
+        view = object.__new__(cls)
+        view._store = store
+        view._index = index
+        return view
+
+    def _init_standalone(self, *values):
+        """Objet autonome (hors environnement) : stockage d'une ligne"""
+        self._store = self.STORE(capacity=1)
+        self._index = self._store._append_row(values)
+
+    def __eq__(self, other) -> bool:
+        return (type(other) is type(self) and other._store is self._store
+                and other._index == self._index)
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+
+
+def _field(index: int, doc: str) -> property:
+    """Attribut lu et écrit dans la colonne index du stockage"""
+    def get(self):
+        return self._store._get(self._index, index)
+
+    def set(self, value: int):
+        self._store._set(self._index, index, value)
+
+    return property(get, set, doc=doc)
+
+
+def _coded_field(index: int, table: StringTable, doc: str) -> property:
+    """Attribut chaîne stocké sous forme de code dans table"""
+    def get(self):
+        return table.name(self._store._get(self._index, index))
+
+    def set(self, value: str):
+        self._store._set(self._index, index, table.code(value))
+
+    return property(get, set, doc=doc)
+
+
+class GameObject(_View):
+    """Représente un objet dans l'environnement"""
+    __slots__ = ()
+
+    # Mapping des couleurs (partagé)
+    color_map = COLOR_MAP
+
+    def __init__(self, x: int, y: int, color: str, shape: str, size: int = 30):
+        self._init_standalone(x, y, size, COLOR_TABLE.code(color), SHAPE_TABLE.code(shape))
+
+    x = _field(0, "Abscisse du centre")
+    y = _field(1, "Ordonnée du centre")
+    size = _field(2, "Taille (côté ou diamètre)")
+    color = _coded_field(3, COLOR_TABLE, "Nom de la couleur")
+    shape = _coded_field(4, SHAPE_TABLE, "'square' ou 'circle'")
+
+    def __repr__(self) -> str:
+        return f"GameObject({self.x}, {self.y}, {self.color!r}, {self.shape!r}, {self.size})"
+
+    def get_rgb_color(self) -> Tuple[int, int, int]:
+        """Retourne la couleur RGB"""
+        return self.color_map.get(self.color.lower(), DEFAULT_RGB)
+
+    def draw(self, screen: 'pygame.Surface'):
+        """Dessine l'objet sur l'écran"""
+        import pygame
+
+        color_rgb = self.get_rgb_color()
+        x, y, size, shape = self.x, self.y, self.size, self.shape
+
+        if shape in SQUARE_SHAPES:
+            pygame.draw.rect(screen, color_rgb,
+                           (x - size//2, y - size//2,
+                            size, size))
+        elif shape == 'circle' or shape == 'cercle':
+            pygame.draw.circle(screen, color_rgb, (x, y), size//2)
+
+    def contains_point(self, px: int, py: int) -> bool:
+        """Vérifie si un point est à l'intérieur de l'objet"""
+        x, y, size = self.x, self.y, self.size
+        if self.shape in SQUARE_SHAPES:
+            return (abs(px - x) <= size//2 and
+                   abs(py - y) <= size//2)
+        else:  # circle
+            distance = np.sqrt((px - x)**2 + (py - y)**2)
+            return distance <= size//2
+
+    def contains_points(self, points) -> np.ndarray:
+        """Version vectorisée : masque (N,) des points (N, 2) dans l'objet"""
+        points = as_points(points)
+        x, y, size = self.x, self.y, self.size
+        dx, dy = points[:, 0] - x, points[:, 1] - y
+        if self.shape in SQUARE_SHAPES:
+            return (np.abs(dx) <= size//2) & (np.abs(dy) <= size//2)
+        return np.sqrt(dx**2 + dy**2) <= size//2
+
+
+class Obstacle(_View):
+    """Représente un obstacle dans l'environnement"""
+    __slots__ = ()
+
+    color = OBSTACLE_RGB
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self._init_standalone(x, y, width, height)
+
+    x = _field(0, "Abscisse du coin haut-gauche")
+    y = _field(1, "Ordonnée du coin haut-gauche")
+    width = _field(2, "Largeur")
+    height = _field(3, "Hauteur")
+
+    def __repr__(self) -> str:
+        return f"Obstacle({self.x}, {self.y}, {self.width}, {self.height})"
+
+    def draw(self, screen: 'pygame.Surface'):
+        """Dessine l'obstacle"""
+        import pygame
+
+        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+
+    def collides_with_point(self, px: int, py: int, margin: int = 0) -> bool:
+        """Vérifie si un point entre en collision avec l'obstacle"""
+        x, y, width, height = self._store._data[:, self._index].tolist()
+        return (x - margin <= px <= x + width + margin and
+                y - margin <= py <= y + height + margin)
+
+    def collides_with_points(self, points, margin: int = 0) -> np.ndarray:
+        """Version vectorisée : masque (N,) des points (N, 2) en collision"""
+        points = as_points(points)
+        x, y, width, height = self._store._data[:, self._index].tolist()
+        px, py = points[:, 0], points[:, 1]
+        return ((x - margin <= px) & (px <= x + width + margin) &
+                (y - margin <= py) & (py <= y + height + margin))
+
+
+class ObjectStore(ColumnStore):
+    """Objets cibles : x, y, taille, code couleur, code forme"""
+    FIELDS = ('x', 'y', 'size', 'color', 'shape')
+    VIEW = GameObject
+
+    def append(self, x: int, y: int, color: str, shape: str, size: int = 30) -> GameObject:
+        index = self._append_row((x, y, size, COLOR_TABLE.code(color), SHAPE_TABLE.code(shape)))
+        return GameObject._view(self, index)
+
+    def _matching(self, color: Optional[str], shape: Optional[str]) -> np.ndarray:
+        """Indices des objets correspondants (couleur et forme sans tenir compte de la casse)"""
+        mask = np.ones(self._size, dtype=bool)
+        if color is not None:
+            mask &= np.isin(self.column('color'), COLOR_TABLE.matching_codes(color))
+        if shape is not None:
+            mask &= np.isin(self.column('shape'), SHAPE_TABLE.matching_codes(shape))
+        return np.flatnonzero(mask)
+
+    def find(self, color: Optional[str] = None, shape: Optional[str] = None) -> Optional[GameObject]:
+        """Premier objet correspondant (couleur et forme sans tenir compte de la casse)"""
+        indices = self._matching(color, shape)
+        return GameObject._view(self, int(indices[0])) if len(indices) else None
+
+    def find_all(self, color: Optional[str] = None, shape: Optional[str] = None) -> List[GameObject]:
+        """Tous les objets correspondants, dans l'ordre du stockage"""
+        return [GameObject._view(self, index) for index in self._matching(color, shape).tolist()]
+
+    def pick(self, points) -> np.ndarray:
+        """
+        Objet sous chaque point (clic, sélection...)
+
+        Args:
+            points: Tableau (N, 2) de points (x, y)
+
+        Returns:
+            Tableau (N,) des indices du premier objet contenant chaque point, -1 si aucun
+        """
+        points = as_points(points)
+        result = np.full(len(points), -1, dtype=np.int64)
+        if not self._size or not len(points):
+            return result
+
+        x, y, size, _, shape = self.rows().T.astype(np.int64)
+        half = size // 2
+        square = np.isin(shape, [SHAPE_TABLE.code(name) for name in SQUARE_SHAPES])
+
+        for chunk in _chunks(len(points), self._size):
+            dx = points[chunk, 0, None] - x
+            dy = points[chunk, 1, None] - y
+            inside = np.where(square, (np.abs(dx) <= half) & (np.abs(dy) <= half),
+                              np.sqrt(dx**2 + dy**2) <= half)
+            hit = inside.any(axis=1)
+            result[chunk][hit] = inside[hit].argmax(axis=1)
+        return result
+
+    def contains_points(self, points) -> np.ndarray:
+        """Masque (N,) : True si le point est dans au moins un objet"""
+        return self.pick(points) >= 0
+
+
+class ObstacleStore(ColumnStore):
+    """Obstacles rectangulaires : x, y, largeur, hauteur"""
+    FIELDS = ('x', 'y', 'width', 'height')
+    VIEW = Obstacle
+
+    def append(self, x: int, y: int, width: int, height: int) -> Obstacle:
+        return Obstacle._view(self, self._append_row((x, y, width, height)))
+
+    def collide_points(self, points, margin: int = 0) -> np.ndarray:
+        """
+        Collisions de nombreux points avec tous les obstacles
+
+        Args:
+            points: Tableau (N, 2) de points (x, y)
+            margin: Marge ajoutée autour de chaque obstacle
+
+        Returns:
+            Masque (N,) : True si le point touche au moins un obstacle
+        """
+        points = as_points(points)
+        result = np.zeros(len(points), dtype=bool)
+        if not self._size or not len(points):
+            return result
+
+        x, y, width, height = self.rows().T.astype(np.int64)
+        x0, x1 = x - margin, x + width + margin
+        y0, y1 = y - margin, y + height + margin
+
+        for chunk in _chunks(len(points), self._size):
+            px = points[chunk, 0, None]
+            py = points[chunk, 1, None]
+            result[chunk] = ((x0 <= px) & (px <= x1) & (y0 <= py) & (py <= y1)).any(axis=1)
+        return result
+
+    def collide_discs(self, points, radius: float) -> np.ndarray:
+        """
+        Collisions de disques de rayon radius centrés sur les points
+
+        Args:
+            points: Tableau (N, 2) de centres (x, y)
+            radius: Rayon des disques (pixels, > 0)
+
+        Returns:
+            Masque (N,) : True si le disque est à moins de radius d'un obstacle
+            (distance euclidienne au rectangle, nulle à l'intérieur)
+        """
+        points = as_points(points)
+        result = np.zeros(len(points), dtype=bool)
+        if not self._size or not len(points):
+            return result
+
+        x0, y0, width, height = self.rows().T.astype(np.int64)
+        x1, y1 = x0 + width, y0 + height
+
+        for chunk in _chunks(len(points), self._size):
+            px = points[chunk, 0, None]
+            py = points[chunk, 1, None]
+            dx = np.maximum(np.maximum(x0 - px, px - x1), 0)
+            dy = np.maximum(np.maximum(y0 - py, py - y1), 0)
+            result[chunk] = (dx * dx + dy * dy < radius * radius).any(axis=1)
+        return result
+
+
+GameObject.STORE = ObjectStore
+Obstacle.STORE = ObstacleStore
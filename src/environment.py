@@ -1,73 +1,46 @@
-import pygame
 import numpy as np
-from typing import List, Tuple, Dict
-
-class GameObject:
-    """Représente un objet dans l'environnement"""
-    def __init__(self, x: int, y: int, color: str, shape: str, size: int = 30):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.shape = shape  # 'square' ou 'circle'
-        self.size = size
-
-        # Mapping des couleurs
-        self.color_map = {
-            'rouge': (255, 0, 0),
-            'red': (255, 0, 0),
-            'bleu': (0, 0, 255),
-            'blue': (0, 0, 255),
-            'vert': (0, 255, 0),
-            'green': (0, 255, 0),
-            'jaune': (255, 255, 0),
-            'yellow': (255, 255, 0),
-            'orange': (255, 165, 0),
-            'violet': (128, 0, 128),
-            'purple': (128, 0, 128),
-        }
-
-    def get_rgb_color(self) -> Tuple[int, int, int]:
-        """Retourne la couleur RGB"""
-        return self.color_map.get(self.color.lower(), (128, 128, 128))
-
-    def draw(self, screen: pygame.Surface):
-        """Dessine l'objet sur l'écran"""
-        color_rgb = self.get_rgb_color()
-
-        if self.shape == 'square' or self.shape == 'carré':
-            pygame.draw.rect(screen, color_rgb,
-                           (self.x - self.size//2, self.y - self.size//2,
-                            self.size, self.size))
-        elif self.shape == 'circle' or self.shape == 'cercle':
-            pygame.draw.circle(screen, color_rgb, (self.x, self.y), self.size//2)
-
-    def contains_point(self, px: int, py: int) -> bool:
-        """Vérifie si un point est à l'intérieur de l'objet"""
-        if self.shape == 'square' or self.shape == 'carré':
-            return (abs(px - self.x) <= self.size//2 and
-                   abs(py - self.y) <= self.size//2)
-        else:  # circle
-            distance = np.sqrt((px - self.x)**2 + (py - self.y)**2)
-            return distance <= self.size//2
-
-
-class Obstacle:
-    """Représente un obstacle dans l'environnement"""
-    def __init__(self, x: int, y: int, width: int, height: int):
-        self.x = x
-        self.y = y
+from typing import Iterable, List, Tuple, Dict, Optional, TYPE_CHECKING
+
+from src.entity_store import GameObject, Obstacle, ObjectStore, ObstacleStore, as_points
+
+if TYPE_CHECKING:
+    # Pygame n'est importé qu'au premier affichage (démarrage plus rapide en mode headless)
+    import pygame
+
+# Marge de sécurité par défaut autour des obstacles et des bords (pixels)
+POSITION_MARGIN = 15
+
+# En dessous de ce nombre d'obstacles, is_position_valid parcourt une liste
+# Python (plus rapide que NumPy pour quelques rectangles)
+SMALL_OBSTACLE_COUNT = 64
+
+class EnvironmentSnapshot:
+    """
+    État figé d'un environnement (voir Environment.snapshot)
+
+    Les objets, obstacles et grilles sont conservés en tableaux en lecture
+    seule : un même instantané peut être restauré dans plusieurs
+    environnements sans copie (copie à la première modification).
+    """
+    __slots__ = ('width', 'height', 'grid_size', 'objects', 'obstacles', 'occupancy', 'distance')
+
+    def __init__(self, width: int, height: int, grid_size: int, objects: np.ndarray,
+                 obstacles: np.ndarray, occupancy: Dict[int, np.ndarray],
+                 distance: Optional[np.ndarray]):
         self.width = width
         self.height = height
-        self.color = (100, 100, 100)  # Gris
+        self.grid_size = grid_size
+        self.objects = objects
+        self.obstacles = obstacles
+        self.occupancy = occupancy
+        self.distance = distance
 
-    def draw(self, screen: pygame.Surface):
-        """Dessine l'obstacle"""
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
 
-    def collides_with_point(self, px: int, py: int, margin: int = 0) -> bool:
-        """Vérifie si un point entre en collision avec l'obstacle"""
-        return (self.x - margin <= px <= self.x + self.width + margin and
-                self.y - margin <= py <= self.y + self.height + margin)
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Vue en lecture seule (partageable entre environnements)"""
+    view = array.view()
+    view.flags.writeable = False
+    return view
 
 
 class Environment:
@@ -77,54 +50,426 @@ class Environment:
         self.height = height
         self.grid_size = grid_size
 
-        # Initialisation de Pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Robot Virtuel Guidé par Texte")
-        self.clock = pygame.time.Clock()
+        # Fenêtre Pygame créée au premier affichage (voir init_display)
+        self._screen = None
+        self._clock = None
+        self._label_font = None
 
-        # Objets et obstacles
-        self.objects: List[GameObject] = []
-        self.obstacles: List[Obstacle] = []
+        # Objets et obstacles (stockage en colonnes, voir entity_store)
+        self._objects = ObjectStore()
+        self._obstacles = ObstacleStore()
 
         # Grille pour la planification de chemin
         self.grid_width = width // grid_size
         self.grid_height = height // grid_size
 
+        # Grilles dérivées des obstacles, calculées à la demande (voir occupancy_grid)
+        # pour la version _obstacles_version du stockage des obstacles
+        self._occupancy: Dict[int, np.ndarray] = {}
+        self._distance: Optional[np.ndarray] = None
+        self._cspace: Dict[float, np.ndarray] = {}
+        self._penalty: Dict[float, np.ndarray] = {}
+        self._obstacle_bounds = None
+        self._obstacles_version = self._obstacles.version
+
+    def init_display(self) -> 'pygame.Surface':
+        """Initialise Pygame et ouvre la fenêtre (une seule fois)"""
+        if self._screen is None:
+            import pygame
+
+            pygame.init()
+            self._screen = pygame.display.set_mode((self.width, self.height))
+            pygame.display.set_caption("Robot Virtuel Guidé par Texte")
+            self._clock = pygame.time.Clock()
+        return self._screen
+
+    @property
+    def screen(self) -> 'pygame.Surface':
+        """Surface d'affichage (la fenêtre est ouverte au premier accès)"""
+        return self.init_display()
+
+    @property
+    def clock(self):
+        """Horloge Pygame associée à la fenêtre"""
+        self.init_display()
+        return self._clock
+
+    @property
+    def objects(self) -> ObjectStore:
+        """Objets cibles (séquence de GameObject)"""
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects: Iterable[GameObject]):
+        self._objects = objects if isinstance(objects, ObjectStore) else ObjectStore.from_views(objects)
+
+    @property
+    def obstacles(self) -> ObstacleStore:
+        """Obstacles (séquence d'Obstacle)"""
+        return self._obstacles
+
+    @obstacles.setter
+    def obstacles(self, obstacles: Iterable[Obstacle]):
+        self._obstacles = (obstacles if isinstance(obstacles, ObstacleStore)
+                           else ObstacleStore.from_views(obstacles))
+        self.invalidate_caches()
+
     def add_object(self, x: int, y: int, color: str, shape: str, size: int = 30):
         """Ajoute un objet cible dans l'environnement"""
-        obj = GameObject(x, y, color, shape, size)
-        self.objects.append(obj)
-        return obj
+        return self._objects.append(x, y, color, shape, size)
 
     def add_obstacle(self, x: int, y: int, width: int, height: int):
         """Ajoute un obstacle dans l'environnement"""
-        obstacle = Obstacle(x, y, width, height)
-        self.obstacles.append(obstacle)
+        obstacle = self._obstacles.append(x, y, width, height)
+        self.invalidate_caches()
         return obstacle
 
     def find_object(self, color: str = None, shape: str = None) -> GameObject:
         """Trouve un objet par couleur et/ou forme"""
-        for obj in self.objects:
-            color_match = color is None or obj.color.lower() == color.lower()
-            shape_match = shape is None or obj.shape.lower() == shape.lower()
+        return self._objects.find(color, shape)
+
+    def find_objects(self, color: str = None, shape: str = None) -> List[GameObject]:
+        """Tous les objets d'une couleur et/ou d'une forme"""
+        return self._objects.find_all(color, shape)
+
+    def snapshot(self) -> EnvironmentSnapshot:
+        """
+        Fige l'état courant (objets, obstacles, grilles calculées)
+
+        La grille d'occupation par défaut est calculée avant de figer l'état,
+        pour que les environnements restaurés n'aient rien à recalculer.
+        """
+        self.occupancy_grid()
+        return EnvironmentSnapshot(
+            self.width, self.height, self.grid_size,
+            self._objects.freeze(), self._obstacles.freeze(),
+            {margin: _read_only(grid) for margin, grid in self._occupancy.items()},
+            _read_only(self._distance) if self._distance is not None else None,
+        )
+
+    def restore(self, snapshot: EnvironmentSnapshot):
+        """
+        Remet l'environnement dans l'état d'un instantané
+
+        Les grilles sont partagées avec l'instantané (lecture seule) ; un
+        ajout d'obstacle les remplace sans modifier l'instantané.
+
+        Raises:
+            ValueError: si les dimensions ne correspondent pas
+        """
+        if (snapshot.width, snapshot.height, snapshot.grid_size) != (self.width, self.height, self.grid_size):
+            raise ValueError(f"Instantané {snapshot.width}x{snapshot.height} (grille {snapshot.grid_size}) "
+                             f"incompatible avec {self.width}x{self.height} (grille {self.grid_size})")
+        self._objects = ObjectStore.from_rows(snapshot.objects)
+        self._obstacles = ObstacleStore.from_rows(snapshot.obstacles)
+        self._occupancy = dict(snapshot.occupancy)
+        self._distance = snapshot.distance
+        self._cspace = {}
+        self._penalty = {}
+        self._obstacle_bounds = None
+        self._obstacles_version = self._obstacles.version
+
+    @classmethod
+    def from_snapshot(cls, snapshot: EnvironmentSnapshot) -> 'Environment':
+        """Nouvel environnement (sans fenêtre) dans l'état de l'instantané"""
+        env = cls(width=snapshot.width, height=snapshot.height, grid_size=snapshot.grid_size)
+        env.restore(snapshot)
+        return env
+
+    def invalidate_caches(self):
+        """
+        Oublie les grilles calculées
+
+        Appelée automatiquement quand le stockage des obstacles change (ajout,
+        écriture par une vue : obstacle.x = ...), voir _check_caches.
+        """
+        self._occupancy = {}
+        self._distance = None
+        self._cspace = {}
+        self._penalty = {}
+        self._obstacle_bounds = None
+        self._obstacles_version = self._obstacles.version
+
+    def _check_caches(self):
+        """Invalide les grilles si les obstacles ont changé depuis leur calcul"""
+        if self._obstacles.version != self._obstacles_version:
+            self.invalidate_caches()
+
+    def occupancy_grid(self, margin: int = POSITION_MARGIN) -> np.ndarray:
+        """
+        Grille d'occupation : True si le centre de la cellule n'est pas une
+        position valide (équivalent de is_position_valid sur chaque centre)
+
+        Calculée une fois par marge puis mise en cache.
+
+        Returns:
+            Tableau booléen (grid_height, grid_width)
+        """
+        self._check_caches()
+        if margin not in self._occupancy:
+            self._occupancy[margin] = self._rasterize(margin)
+        return self._occupancy[margin]
+
+    def distance_field(self) -> np.ndarray:
+        """
+        Distance signée (pixels) du centre de chaque cellule à l'obstacle ou
+        au bord le plus proche, négative à l'intérieur d'un obstacle
+
+        Transformée de distance euclidienne exacte des rectangles à
+        l'extérieur des obstacles ; à l'intérieur, profondeur approchée à une
+        demi-cellule près.
+
+        Returns:
+            Tableau float32 (grid_height, grid_width)
+        """
+        self._check_caches()
+        if self._distance is None:
+            self._distance = self._compute_distance_field()
+        return self._distance
+
+    def _compute_distance_field(self) -> np.ndarray:
+        from src.distance_field import distance_transform, parabola_envelope
+
+        g = self.grid_size
+        centers_x = np.arange(self.grid_width, dtype=np.float64) * g + g // 2
+        centers_y = np.arange(self.grid_height, dtype=np.float64) * g + g // 2
+
+        # Bords (exact)
+        field = np.minimum.outer(np.minimum(centers_y, self.height - centers_y),
+                                 np.minimum(centers_x, self.width - centers_x))
+
+        # Obstacles : le point le plus proche d'un rectangle est sur la colonne
+        # du centre ou sur un de ses bords verticaux. Distance verticale sur
+        # ces colonnes candidates, puis enveloppe de paraboles par ligne (exact)
+        if len(self._obstacles):
+            x, y, w, h = self._obstacles.rows().T.astype(np.float64)
+            columns = np.unique(np.concatenate([centers_x, x, x + w]))
+            vertical = self._vertical_gaps(columns, centers_y)
+            covered = np.isfinite(vertical[0])
+            squared = parabola_envelope(columns[covered], vertical[:, covered], centers_x)
+            np.minimum(field, np.sqrt(squared), out=field)
+
+        field = field.astype(np.float32)
+
+        # Intérieur des obstacles : profondeur négative (distance au centre libre
+        # le plus proche moins une demi-cellule, approchée)
+        inside = field <= 0
+        if inside.any() and not inside.all():
+            depth = distance_transform(~inside) * g - g / 2
+            field[inside] = -np.maximum(depth[inside], 0)
+
+        return field
+
+    def _vertical_gaps(self, columns: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Distance verticale au carré de chaque ordonnée rows à l'obstacle le
+        plus proche coupant chaque abscisse columns (inf si aucun)
+
+        Returns:
+            Tableau float64 (len(rows), len(columns))
+        """
+        height, count = len(rows), len(columns)
+        tops = np.full((height + 1, count), np.inf)       # bord haut le plus proche, par ligne de départ
+        bottoms = np.full((height + 1, count), -np.inf)   # bord bas le plus proche, par ligne de départ
+        covering = np.zeros((height + 1, count), dtype=np.int64)
+
+        x, y, w, h = self._obstacles.rows().T.astype(np.float64)
+        lo = np.searchsorted(columns, x, side='left')
+        hi = np.searchsorted(columns, x + w, side='right')
+        first = np.searchsorted(rows, y, side='left')         # premières lignes sous le bord haut
+        after = np.searchsorted(rows, y + h, side='right')    # premières lignes sous le bord bas
+
+        for c0, c1, r0, r1, top, bottom in zip(lo.tolist(), hi.tolist(), first.tolist(),
+                                               after.tolist(), y.tolist(), (y + h).tolist()):
+            np.minimum(tops[r0, c0:c1], top, out=tops[r0, c0:c1])
+            np.maximum(bottoms[r1, c0:c1], bottom, out=bottoms[r1, c0:c1])
+            covering[r0, c0:c1] += 1
+            covering[r1, c0:c1] -= 1
+
+        # Ligne r : bord haut le plus proche en dessous (départ > r), bord bas
+        # le plus proche au-dessus (départ <= r), dedans si un intervalle la couvre
+        below = np.minimum.accumulate(tops[::-1], axis=0)[::-1][1:]
+        above = np.maximum.accumulate(bottoms, axis=0)[:-1]
+        inside = np.cumsum(covering, axis=0)[:-1] > 0
+
+        gaps = np.minimum(below - rows[:, None], rows[:, None] - above)
+        gaps[inside] = 0
+        return gaps ** 2
+
+    def clearance(self, x: float, y: float) -> float:
+        """
+        Dégagement en (x, y) lu dans le champ de distance (O(1), précision
+        d'une cellule)
+
+        Returns:
+            Distance (pixels) à l'obstacle ou au bord le plus proche ;
+            négative dans un obstacle, -inf hors de la carte
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return float('-inf')
+        gx = min(int(x) // self.grid_size, self.grid_width - 1)
+        gy = min(int(y) // self.grid_size, self.grid_height - 1)
+        return float(self.distance_field()[gy, gx])
+
+    def clearances(self, points) -> np.ndarray:
+        """Version vectorisée de clearance pour un tableau (N, 2) de points"""
+        points = as_points(points)
+        x, y = points[:, 0], points[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        gx = np.minimum(x[inside].astype(np.int64) // self.grid_size, self.grid_width - 1)
+        gy = np.minimum(y[inside].astype(np.int64) // self.grid_size, self.grid_height - 1)
+
+        result = np.full(len(points), -np.inf, dtype=np.float32)
+        result[inside] = self.distance_field()[gy, gx]
+        return result
+
+    def clearance_penalty(self, clearance_range: float) -> np.ndarray:
+        """
+        Pénalité de proximité par cellule, mise en cache par portée
+
+        Args:
+            clearance_range: Dégagement (pixels) au-delà duquel la pénalité est nulle
+
+        Returns:
+            Tableau float32 (grid_height, grid_width) : 1 au contact, 0 au-delà de la portée
+        """
+        self._check_caches()
+        if clearance_range not in self._penalty:
+            self._penalty[clearance_range] = np.clip(
+                1 - self.distance_field() / clearance_range, 0, 1).astype(np.float32)
+        return self._penalty[clearance_range]
+
+    def cspace_grid(self, radius: float) -> np.ndarray:
+        """
+        Espace des configurations d'un robot circulaire de rayon radius
+
+        Seuil du champ de distance (calculé une fois pour tous les rayons),
+        mis en cache par rayon : une cellule est libre si le robot centré sur
+        elle est à au moins radius pixels des obstacles et des bords.
+
+        Args:
+            radius: Rayon du robot (pixels, > 0)
+
+        Returns:
+            Tableau booléen (grid_height, grid_width), True = cellule interdite
+        """
+        self._check_caches()
+        if radius not in self._cspace:
+            self._cspace[radius] = self.distance_field() < radius
+        return self._cspace[radius]
+
+    def _rasterize(self, margin: int) -> np.ndarray:
+        """Calcule la grille d'occupation pour une marge donnée"""
+        g = self.grid_size
+        centers_x = np.arange(self.grid_width) * g + g // 2
+        centers_y = np.arange(self.grid_height) * g + g // 2
+
+        occupied = np.zeros((self.grid_height, self.grid_width), dtype=bool)
+        occupied[:, (centers_x < margin) | (centers_x >= self.width - margin)] = True
+        occupied[(centers_y < margin) | (centers_y >= self.height - margin), :] = True
+
+        # Centres dans [x - margin, x + width + margin] (bornes incluses)
+        x, y, w, h = self._obstacles.rows().T.astype(np.int64)
+        gx0 = np.maximum(0, -(-(x - margin - g // 2) // g))
+        gx1 = np.minimum(self.grid_width - 1, (x + w + margin - g // 2) // g)
+        gy0 = np.maximum(0, -(-(y - margin - g // 2) // g))
+        gy1 = np.minimum(self.grid_height - 1, (y + h + margin - g // 2) // g)
+        keep = (gx0 <= gx1) & (gy0 <= gy1)
+
+        for x0, x1, y0, y1 in np.stack([gx0, gx1, gy0, gy1], axis=1)[keep].tolist():
+            occupied[y0:y1 + 1, x0:x1 + 1] = True
+
+        return occupied
+
+    def is_position_valid(self, x: int, y: int, margin: int = POSITION_MARGIN,
+                          radius: Optional[float] = None) -> bool:
+        """
+        Vérifie si une position est valide (pas d'obstacle, dans les limites)
+
+        Args:
+            x, y: Position (pixels)
+            margin: Marge rectangulaire autour des obstacles et des bords
+            radius: Robot circulaire de ce rayon à la place de la marge : valide
+                    si le disque est à au moins radius des obstacles et des bords
+                    (même règle que cspace_grid aux centres des cellules)
+        """
+        if radius is not None:
+            return self._is_disc_valid(x, y, radius)
 
-            if color_match and shape_match:
-                return obj
-        return None
-
-    def is_position_valid(self, x: int, y: int, margin: int = 15) -> bool:
-        """Vérifie si une position est valide (pas d'obstacle, dans les limites)"""
         # Vérifier les limites
         if x < margin or x >= self.width - margin or y < margin or y >= self.height - margin:
             return False
 
-        # Vérifier les collisions avec les obstacles
-        for obstacle in self.obstacles:
-            if obstacle.collides_with_point(x, y, margin):
-                return False
+        # Vérifier les collisions avec les obstacles (bornes en cache, comme _check_caches)
+        if self._obstacles.version != self._obstacles_version:
+            self.invalidate_caches()
+        bounds = self._obstacle_bounds
+        if bounds is None:
+            rows = self._obstacles.rows()
+            bounds = self._obstacle_bounds = rows.tolist() if len(rows) < SMALL_OBSTACLE_COUNT else rows.T
+
+        if isinstance(bounds, list):
+            for ox, oy, ow, oh in bounds:
+                if ox - margin <= x <= ox + ow + margin and oy - margin <= y <= oy + oh + margin:
+                    return False
+            return True
+
+        ox, oy, ow, oh = bounds
+        hits = (ox - margin <= x) & (x <= ox + ow + margin) & (oy - margin <= y) & (y <= oy + oh + margin)
+        return not hits.any()
+
+    def _is_disc_valid(self, x: float, y: float, radius: float) -> bool:
+        """is_position_valid pour un robot circulaire de rayon radius"""
+        if x < radius or self.width - x < radius or y < radius or self.height - y < radius:
+            return False
 
-        return True
+        if self._obstacles.version != self._obstacles_version:
+            self.invalidate_caches()
+        bounds = self._obstacle_bounds
+        if bounds is None:
+            rows = self._obstacles.rows()
+            bounds = self._obstacle_bounds = rows.tolist() if len(rows) < SMALL_OBSTACLE_COUNT else rows.T
+
+        squared = radius * radius
+        if isinstance(bounds, list):
+            for ox, oy, ow, oh in bounds:
+                dx = max(ox - x, x - ox - ow, 0)
+                dy = max(oy - y, y - oy - oh, 0)
+                if dx * dx + dy * dy < squared:
+                    return False
+            return True
+
+        ox, oy, ow, oh = bounds
+        dx = np.maximum(np.maximum(ox - x, x - ox - ow), 0)
+        dy = np.maximum(np.maximum(oy - y, y - oy - oh), 0)
+        return not (dx * dx + dy * dy < squared).any()
+
+    def are_positions_valid(self, points, margin: int = POSITION_MARGIN,
+                            radius: Optional[float] = None) -> np.ndarray:
+        """
+        Version vectorisée de is_position_valid
+
+        Args:
+            points: Tableau (N, 2) de points (x, y)
+            margin: Marge autour des obstacles et des bords
+            radius: Robot circulaire de ce rayon à la place de la marge
+
+        Returns:
+            Masque (N,) : True si la position est valide
+        """
+        points = as_points(points)
+        x, y = points[:, 0], points[:, 1]
+        if radius is not None:
+            valid = ((x >= radius) & (self.width - x >= radius) &
+                     (y >= radius) & (self.height - y >= radius))
+            if valid.any():
+                valid[valid] = ~self._obstacles.collide_discs(points[valid], radius)
+            return valid
+
+        valid = (x >= margin) & (x < self.width - margin) & (y >= margin) & (y < self.height - margin)
+        if valid.any():
+            valid[valid] = ~self._obstacles.collide_points(points[valid], margin)
+        return valid
 
     def grid_to_pixel(self, grid_x: int, grid_y: int) -> Tuple[int, int]:
         """Convertit une coordonnée de grille en pixel"""
@@ -137,6 +482,12 @@ class Environment:
 
     def draw(self, robot=None):
         """Dessine l'environnement complet"""
+        import pygame
+
+        self.init_display()
+        if self._label_font is None:
+            self._label_font = pygame.font.Font(None, 20)
+
         # Fond blanc
         self.screen.fill((255, 255, 255))
 
@@ -154,9 +505,8 @@ class Environment:
         for obj in self.objects:
             obj.draw(self.screen)
             # Ajouter un label
-            font = pygame.font.Font(None, 20)
             label = f"{obj.color} {obj.shape}"
-            text = font.render(label, True, (0, 0, 0))
+            text = self._label_font.render(label, True, (0, 0, 0))
             self.screen.blit(text, (obj.x - 30, obj.y + obj.size))
 
         # Dessiner le robot
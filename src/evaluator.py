@@ -1,12 +1,136 @@
+import math
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Phases mesurées par Evaluator.span, dans l'ordre du pipeline
+PHASES = ('parse', 'lookup', 'plan', 'simplify', 'execute')
+
+
+class RunningStats:
+    """
+    Statistiques cumulées en mémoire constante
+
+    Moyenne, min et max exacts ; percentiles approchés à partir de seaux
+    logarithmiques (erreur relative inférieure à GROWTH - 1).
+    """
+
+    GROWTH = 1.05
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float):
+        """Ajoute une mesure"""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        # Seau -inf : zéro et valeurs négatives
+        key = math.floor(math.log(value) / self._LOG_GROWTH) if value > 0 else -math.inf
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: 'RunningStats'):
+        """Ajoute les mesures d'une autre instance"""
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Percentile p (0-100) approché"""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                if key == -math.inf:
+                    value = min(0.0, self.max)
+                else:
+                    # Milieu géométrique du seau, borné par les extrêmes observés
+                    value = self.GROWTH ** (key + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """count, mean, p50, p95, p99"""
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class _Span:
+    """Chronomètre d'une phase (temps exclusif : les phases imbriquées sont déduites)"""
+    __slots__ = ('evaluator', 'phase', 'start', 'children')
+
+    def __init__(self, evaluator: 'Evaluator', phase: str):
+        self.evaluator = evaluator
+        self.phase = phase
+
+    def __enter__(self):
+        self.children = 0.0
+        self.evaluator._span_stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stack = self.evaluator._span_stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+
+        phases = self.evaluator._phases
+        phases[self.phase] = phases.get(self.phase, 0.0) + (elapsed - self.children) * 1000
+        return False
+
 
 class Evaluator:
     """Évalue les performances du robot"""
 
-    def __init__(self):
+    def __init__(self, sink=None, keep_results: bool = True):
+        """
+        Args:
+            sink: ResultSink optionnel (src.result_sink) recevant chaque résultat
+                  dès la fin de la commande
+            keep_results: Conserver les résultats en mémoire (détails du résumé,
+                          export texte) ; False pour les longues exécutions
+        """
         self.results: List[Dict] = []
         self.current_test = None
+        self.sink = sink
+        self.keep_results = keep_results
+        self.last_result: Optional[Dict] = None
+
+        # Agrégats cumulés (indépendants de keep_results)
+        self.total_tests = 0
+        self.successes = 0
+        self.success_actions = 0
+        self.success_time = 0.0
+        self.phase_stats: Dict[str, RunningStats] = {}
+        self.counter_stats: Dict[str, RunningStats] = {}
+
+        # Mesures de la commande en cours (consommées par end_test)
+        self._phases: Dict[str, float] = {}
+        self._counters: Dict[str, int] = {}
+        self._span_stack: List[_Span] = []
 
     def start_test(self, command: str, environment_name: str):
         """Démarre un nouveau test"""
@@ -22,13 +146,34 @@ class Evaluator:
             'reasoning_steps': []
         }
 
+    def span(self, phase: str) -> _Span:
+        """
+        Mesure une phase de la commande en cours
+
+        Usage: with evaluator.span('plan'): ...
+
+        Les durées (ms) s'additionnent si la phase est répétée (plusieurs
+        cibles) et sont enregistrées dans le résultat par end_test. Les
+        mesures peuvent commencer avant start_test.
+        """
+        return _Span(self, phase)
+
+    def count(self, name: str, value: int = 1):
+        """Incrémente un compteur de la commande en cours (ex: nœuds A* développés)"""
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset_spans(self):
+        """Oublie les mesures en cours (commande abandonnée sans end_test)"""
+        self._phases = {}
+        self._counters = {}
+
     def end_test(self, success: bool, robot):
         """Termine le test en cours"""
         if self.current_test is None:
             return
 
         self.current_test['end_time'] = time.time()
-        self.current_test['success'] = success
+        self.current_test['success'] = bool(success)
         self.current_test['actions_count'] = robot.total_actions
         self.current_test['path_length'] = len(robot.path)
         self.current_test['reasoning_steps'] = robot.reasoning_steps.copy()
@@ -37,40 +182,108 @@ class Evaluator:
         execution_time = self.current_test['end_time'] - self.current_test['start_time']
         self.current_test['execution_time'] = execution_time
 
-        self.results.append(self.current_test)
+        self.current_test['phases'] = self._phases
+        self.current_test['counters'] = self._counters
+        self.reset_spans()
+
+        self.add_result(self.current_test)
         self.current_test = None
 
+    def add_result(self, result: Dict):
+        """Ajoute un résultat déjà mesuré (ex: par un autre processus)"""
+        self.total_tests += 1
+        if result['success']:
+            self.successes += 1
+            self.success_actions += result['actions_count']
+            self.success_time += result['execution_time']
+
+        for name, ms in result.get('phases', {}).items():
+            self.phase_stats.setdefault(name, RunningStats()).add(ms)
+        for name, value in result.get('counters', {}).items():
+            self.counter_stats.setdefault(name, RunningStats()).add(value)
+
+        if self.sink is not None:
+            self.sink.write(result)
+        if self.keep_results:
+            self.results.append(result)
+        self.last_result = result
+
+    @classmethod
+    def merge(cls, evaluators: List['Evaluator']) -> 'Evaluator':
+        """Fusionne plusieurs évaluateurs (résultats conservés et agrégats), dans l'ordre donné"""
+        merged = cls()
+        for evaluator in evaluators:
+            merged.results.extend(evaluator.results)
+            merged.total_tests += evaluator.total_tests
+            merged.successes += evaluator.successes
+            merged.success_actions += evaluator.success_actions
+            merged.success_time += evaluator.success_time
+            for target, source in ((merged.phase_stats, evaluator.phase_stats),
+                                   (merged.counter_stats, evaluator.counter_stats)):
+                for name, stats in source.items():
+                    target.setdefault(name, RunningStats()).merge(stats)
+        return merged
+
+    def close(self):
+        """Ferme le fichier de résultats, s'il y en a un"""
+        if self.sink is not None:
+            self.sink.close()
+
     def get_success_rate(self) -> float:
         """Calcule le taux de réussite"""
-        if not self.results:
+        if not self.total_tests:
             return 0.0
 
-        successes = sum(1 for r in self.results if r['success'])
-        return (successes / len(self.results)) * 100
+        return (self.successes / self.total_tests) * 100
 
     def get_average_actions(self) -> float:
         """Calcule le nombre moyen d'actions"""
-        if not self.results:
-            return 0.0
-
-        successful_results = [r for r in self.results if r['success']]
-        if not successful_results:
+        if not self.successes:
             return 0.0
 
-        total_actions = sum(r['actions_count'] for r in successful_results)
-        return total_actions / len(successful_results)
+        return self.success_actions / self.successes
 
     def get_average_execution_time(self) -> float:
         """Calcule le temps d'exécution moyen"""
-        if not self.results:
+        if not self.successes:
             return 0.0
 
-        successful_results = [r for r in self.results if r['success']]
-        if not successful_results:
-            return 0.0
+        return self.success_time / self.successes
+
+    def get_phase_stats(self) -> Dict[str, Dict[str, float]]:
+        """Durées par phase (ms) : count, mean, p50, p95, p99"""
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        names = sorted(self.phase_stats, key=lambda name: order.get(name, len(order)))
+        return {name: self.phase_stats[name].summary() for name in names}
+
+    def get_counter_stats(self) -> Dict[str, Dict[str, float]]:
+        """Compteurs par commande (nœuds développés, tests de collision...)"""
+        return {name: stats.summary() for name, stats in self.counter_stats.items()}
 
-        total_time = sum(r['execution_time'] for r in successful_results)
-        return total_time / len(successful_results)
+    def format_phase_report(self) -> str:
+        """Tableau des percentiles par phase et par compteur"""
+        phase_stats = self.get_phase_stats()
+        counter_stats = self.get_counter_stats()
+        if not phase_stats and not counter_stats:
+            return ""
+
+        lines = [f"{'Phase':<18}{'n':>6}{'moy.':>11}{'p50':>11}{'p95':>11}{'p99':>11}"]
+        for name, s in phase_stats.items():
+            lines.append(f"{name + ' (ms)':<18}{s['count']:>6}{s['mean']:>11.2f}"
+                         f"{s['p50']:>11.2f}{s['p95']:>11.2f}{s['p99']:>11.2f}")
+        for name, s in counter_stats.items():
+            lines.append(f"{name:<18}{s['count']:>6}{s['mean']:>11.1f}"
+                         f"{s['p50']:>11.0f}{s['p95']:>11.0f}{s['p99']:>11.0f}")
+        return "\n".join(lines)
+
+    def print_phase_report(self):
+        """Affiche les percentiles par phase"""
+        report = self.format_phase_report()
+        if report:
+            print("\n" + "-"*60)
+            print("Temps par phase :")
+            print("-"*60)
+            print(report)
 
     def print_summary(self):
         """Affiche un résumé des résultats"""
@@ -78,7 +291,7 @@ class Evaluator:
         print("RESUME DES TESTS")
         print("="*60)
 
-        print(f"\nNombre total de tests : {len(self.results)}")
+        print(f"\nNombre total de tests : {self.total_tests}")
         print(f"Taux de reussite : {self.get_success_rate():.1f}%")
         print(f"Actions moyennes (succes) : {self.get_average_actions():.1f}")
         print(f"Temps d'execution moyen : {self.get_average_execution_time():.2f}s")
@@ -87,6 +300,9 @@ class Evaluator:
         print("Details des tests :")
         print("-"*60)
 
+        if not self.keep_results:
+            print("\nDétails non conservés (keep_results=False)")
+
         for i, result in enumerate(self.results, 1):
             status = "SUCCES" if result['success'] else "ECHEC"
             print(f"\nTest {i}: {status}")
@@ -95,12 +311,17 @@ class Evaluator:
             print(f"  Actions : {result['actions_count']}")
             print(f"  Waypoints : {result['path_length']}")
             print(f"  Temps : {result['execution_time']:.2f}s")
+            if result.get('phases'):
+                print("  Phases : " + ", ".join(
+                    f"{name} {ms:.1f}ms" for name, ms in result['phases'].items()))
 
             if result['reasoning_steps']:
                 print(f"  Etapes de raisonnement :")
                 for step in result['reasoning_steps']:
                     print(f"    - {step}")
 
+        self.print_phase_report()
+
         print("\n" + "="*60)
 
     def export_results(self, filename: str = "results.txt"):
@@ -110,11 +331,15 @@ class Evaluator:
             f.write("RESUME DES TESTS - ROBOT VIRTUEL\n")
             f.write("="*60 + "\n\n")
 
-            f.write(f"Nombre total de tests : {len(self.results)}\n")
+            f.write(f"Nombre total de tests : {self.total_tests}\n")
             f.write(f"Taux de reussite : {self.get_success_rate():.1f}%\n")
             f.write(f"Actions moyennes : {self.get_average_actions():.1f}\n")
             f.write(f"Temps moyen : {self.get_average_execution_time():.2f}s\n\n")
 
+            report = self.format_phase_report()
+            if report:
+                f.write(report + "\n\n")
+
             f.write("-"*60 + "\n")
             f.write("DETAILS DES TESTS\n")
             f.write("-"*60 + "\n\n")
@@ -126,6 +351,9 @@ class Evaluator:
                 f.write(f"  Environnement : {result['environment']}\n")
                 f.write(f"  Actions : {result['actions_count']}\n")
                 f.write(f"  Temps : {result['execution_time']:.2f}s\n")
+                if result.get('phases'):
+                    f.write("  Phases : " + ", ".join(
+                        f"{name} {ms:.1f}ms" for name, ms in result['phases'].items()) + "\n")
 
                 if result['reasoning_steps']:
                     f.write(f"  Raisonnement :\n")
@@ -0,0 +1,208 @@
+"""
+Backends de modèle pour le parser LLM
+- GeminiBackend : API Gemini de Google
+- ReplayBackend : stand-in local qui rejoue des réponses enregistrées
+  (latence et erreurs configurables), sans aucun accès réseau
+- RecordingBackend : enregistre les réponses d'un autre backend pour les rejouer
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class BackendError(Exception):
+    """Erreur renvoyée par un backend (erreur injectée, réponse manquante...)"""
+
+
+def extract_commands(prompt: str) -> List[str]:
+    """
+    Retrouve les commandes contenues dans un prompt de LLMParser
+
+    Returns:
+        Liste des commandes (une seule en mode simple, plusieurs en mode lot)
+    """
+    if '\nCommandes:\n' in prompt:
+        block = prompt.split('\nCommandes:\n', 1)[1]
+        return [match.group(2) for match in re.finditer(r'^(\d+)\. (.*)$', block, re.MULTILINE)]
+
+    match = re.search(r'^Commande: (.*)$', prompt, re.MULTILINE)
+    return [match.group(1)] if match else []
+
+
+class GeminiBackend:
+    """Backend utilisant l'API Gemini"""
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-2.5-flash'):
+        # Import coûteux (gRPC, protobuf) : fait seulement ici
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        """Retourne la réponse complète du modèle"""
+        return self.model.generate_content(prompt).text
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Retourne la réponse du modèle morceau par morceau"""
+        for chunk in self.model.generate_content(prompt, stream=True):
+            try:
+                yield chunk.text
+            except ValueError:
+                # Morceau sans contenu texte (fin de flux, filtre de sécurité)
+                continue
+
+
+class ReplayBackend:
+    """Stand-in local rejouant des réponses enregistrées"""
+
+    def __init__(self, responses: Optional[Dict[str, str]] = None,
+                 default_response: Optional[str] = None,
+                 latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, chunk_size: int = 16,
+                 seed: Optional[int] = None):
+        """
+        Initialise le backend de rejeu
+
+        Args:
+            responses: Réponses brutes du modèle, par commande
+            default_response: Réponse pour une commande inconnue
+                              (None = réponse synthétisée par le parser simple)
+            latency: Latence simulée avant le premier morceau (secondes)
+            latency_jitter: Variation aléatoire ajoutée à la latence (secondes)
+            error_rate: Probabilité qu'un appel échoue (0 à 1)
+            chunk_size: Taille des morceaux en mode streaming (caractères)
+            seed: Graine du générateur aléatoire (reproductibilité)
+        """
+        self.responses = dict(responses or {})
+        self.default_response = default_response
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._simple_parser = None
+
+        # Compteurs
+        self.calls = 0
+        self.errors = 0
+
+    @classmethod
+    def from_file(cls, filename: str, **kwargs) -> 'ReplayBackend':
+        """Charge des réponses enregistrées (JSONL : {"command": ..., "response": ...})"""
+        responses = {}
+        with open(filename, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    responses[record['command']] = record['response']
+        return cls(responses, **kwargs)
+
+    def _simulate_call(self):
+        """Applique la latence et l'injection d'erreurs"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise BackendError("Erreur injectée (503 Service Unavailable)")
+
+    def _response_for(self, command: str) -> str:
+        """Réponse enregistrée pour une commande (ou réponse par défaut)"""
+        if command in self.responses:
+            return self.responses[command]
+        if self.default_response is not None:
+            return self.default_response
+        return self._synthesize(command)
+
+    def _synthesize(self, command: str) -> str:
+        """Synthétise une réponse plausible à partir du parser simple"""
+        from src.nlp_parser import NLPParser
+
+        if self._simple_parser is None:
+            self._simple_parser = NLPParser()
+        parsed = self._simple_parser.parse_command(command)
+
+        targets = []
+        if parsed['color'] or parsed['shape']:
+            targets.append({'color': parsed['color'], 'shape': parsed['shape'], 'type': 'target'})
+
+        return json.dumps({
+            'confidence': parsed['confidence'],
+            'targets': targets,
+            'interpretation': command,
+        }, ensure_ascii=False)
+
+    def _build_response(self, prompt: str) -> str:
+        """Construit la réponse brute pour un prompt (objet ou tableau JSON)"""
+        commands = extract_commands(prompt)
+        if not commands:
+            raise BackendError("Aucune commande trouvée dans le prompt")
+
+        if '\nCommandes:\n' not in prompt:
+            return self._response_for(commands[0])
+
+        # Mode lot : un tableau avec une entrée indexée par commande
+        entries = []
+        for index, command in enumerate(commands):
+            try:
+                entry = json.loads(self._response_for(command))
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict):
+                entries.append({'index': index, **entry})
+        return json.dumps(entries, ensure_ascii=False)
+
+    def generate(self, prompt: str) -> str:
+        """Retourne la réponse complète"""
+        self._simulate_call()
+        return self._build_response(prompt)
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Retourne la réponse morceau par morceau"""
+        self._simulate_call()
+        text = self._build_response(prompt)
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size]
+
+
+class RecordingBackend:
+    """Enregistre les réponses d'un backend (format lu par ReplayBackend.from_file)"""
+
+    def __init__(self, backend, filename: str):
+        self.backend = backend
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def _record(self, prompt: str, response: str):
+        """Ajoute une réponse au fichier (commandes simples uniquement)"""
+        commands = extract_commands(prompt)
+        if len(commands) != 1 or '\nCommandes:\n' in prompt:
+            return
+
+        with self._lock, open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'command': commands[0], 'response': response},
+                               ensure_ascii=False) + '\n')
+
+    def generate(self, prompt: str) -> str:
+        response = self.backend.generate(prompt)
+        self._record(prompt, response)
+        return response
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        # Le flux complet est enregistré, même si le parser s'arrête avant la fin
+        chunks = list(self.backend.generate_stream(prompt))
+        self._record(prompt, ''.join(chunks))
+        return iter(chunks)
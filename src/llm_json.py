@@ -0,0 +1,390 @@
+"""
+Extraction robuste du JSON renvoyé par le LLM
+Analyse incrémentale des réponses en streaming, réparation des erreurs
+courantes (balises markdown, texte autour, guillemets simples, virgules
+finales) et validation du format attendu
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+
+# Confiance utilisée quand la réponse est coupée avant le champ "confidence"
+DEFAULT_CONFIDENCE = 0.5
+
+COLOR_ALIASES = {
+    'rouge': 'rouge', 'red': 'rouge',
+    'bleu': 'bleu', 'blue': 'bleu',
+    'vert': 'vert', 'green': 'vert',
+    'jaune': 'jaune', 'yellow': 'jaune',
+    'orange': 'orange',
+    'violet': 'violet', 'purple': 'violet',
+}
+
+SHAPE_ALIASES = {
+    'square': 'square', 'carré': 'square', 'carre': 'square',
+    'circle': 'circle', 'cercle': 'circle',
+}
+
+TARGET_TYPES = ('target', 'waypoint')
+
+PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+CLOSING = {'{': '}', '[': ']'}
+
+# Premier caractère (espaces ignorés) possible après { ou [ au début d'un JSON
+VALUE_START = {'{': '"\'}', '[': '"\'{[]-0123456789'}
+LITERALS = ('true', 'false', 'null') + tuple(PYTHON_LITERALS)
+
+
+def json_start(text: str, i: int) -> Optional[bool]:
+    """
+    Indique si le crochet text[i] peut commencer un JSON
+
+    Écarte la prose qui contient { ou [ (« Voici [le résultat] : ... »).
+
+    Returns:
+        True ou False, None si le texte s'arrête trop tôt pour décider
+    """
+    j = i + 1
+    while j < len(text) and text[j].isspace():
+        j += 1
+    if j == len(text):
+        return None
+
+    char = text[j]
+    if char in VALUE_START[text[i]]:
+        return True
+    if text[i] == '[':
+        rest = text[j:j + 6]
+        for literal in LITERALS:
+            if rest.startswith(literal):
+                return not rest[len(literal):len(literal) + 1].isalnum() if len(rest) > len(literal) else None
+            if literal.startswith(rest):
+                return None
+    return False
+
+
+class IncrementalJSONParser:
+    """
+    Analyse un objet JSON reçu morceau par morceau
+
+    Le texte n'est parcouru qu'une seule fois : on suit la profondeur des
+    accolades et l'état des chaînes pour savoir dès qu'un objet est complet,
+    ou dès que le tableau "targets" est fermé.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.start = -1
+        self.end = -1
+        self.stack: List[str] = []
+        self.quote: Optional[str] = None
+        self.escape = False
+
+        # Suivi du tableau "targets" au premier niveau de l'objet
+        self.segment_start = -1
+        self.targets_depth = -1
+        self.targets_end = -1
+
+    @property
+    def complete(self) -> bool:
+        """True si l'objet JSON de premier niveau est fermé"""
+        return self.end >= 0
+
+    @property
+    def targets_complete(self) -> bool:
+        """True si le tableau "targets" (ou l'objet complet) est disponible"""
+        return self.targets_end >= 0 or self.complete
+
+    def feed(self, chunk: str):
+        """Ajoute un morceau de réponse et poursuit l'analyse"""
+        self.buffer += chunk
+        text = self.buffer
+
+        while self.pos < len(text) and not self.complete:
+            char = text[self.pos]
+            i = self.pos
+            self.pos += 1
+
+            if self.start < 0:
+                # Texte avant le JSON (prose, balises markdown)
+                if char in CLOSING:
+                    starts = json_start(text, i)
+                    if starts is None:
+                        # Attendre le morceau suivant pour décider
+                        self.pos = i
+                        break
+                    if starts:
+                        self.start = i
+                        self.stack.append(char)
+                        self.segment_start = i + 1
+                continue
+
+            if self.quote:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == self.quote:
+                    self.quote = None
+                continue
+
+            if char in ('"', "'"):
+                self.quote = char
+            elif char in CLOSING:
+                if (len(self.stack) == 1 and char == '[' and self.targets_end < 0 and
+                        re.search(r'["\']targets["\']\s*:\s*$', text[self.segment_start:i])):
+                    self.targets_depth = len(self.stack)
+                self.stack.append(char)
+            elif char in ('}', ']'):
+                if self.stack:
+                    self.stack.pop()
+                if len(self.stack) == self.targets_depth:
+                    self.targets_end = i + 1
+                    self.targets_depth = -1
+                if not self.stack:
+                    self.end = i + 1
+            elif char == ',' and len(self.stack) == 1:
+                self.segment_start = i + 1
+
+    def result(self):
+        """
+        Retourne le JSON décodé à partir de ce qui a été reçu
+
+        Si l'objet n'est pas complet mais que "targets" l'est, l'objet est
+        fermé juste après le tableau.
+
+        Raises:
+            ValueError: si aucun JSON exploitable n'a été reçu
+        """
+        if self.complete:
+            return repair_json(self.buffer[self.start:self.end])
+
+        if self.targets_end >= 0:
+            return repair_json(self.buffer[self.start:self.targets_end] + '}')
+
+        return repair_json(self.buffer)
+
+
+def repair_json(text: str):
+    """
+    Décode du JSON en corrigeant les erreurs courantes des LLM
+
+    - balises markdown et texte avant/après le JSON
+    - chaînes entre guillemets simples
+    - virgules finales avant } ou ]
+    - littéraux Python (True, False, None)
+    - réponse tronquée (accolades non fermées)
+
+    Le JSON commence au premier { ou [ qui peut ouvrir un JSON (json_start)
+    et dont la réparation aboutit ; les crochets de la prose sont ignorés.
+
+    Raises:
+        ValueError: si aucun JSON n'est trouvé ou s'il reste invalide
+    """
+    error = None
+    for match in re.finditer(r'[{\[]', text):
+        if json_start(text, match.start()) is False:
+            continue
+        try:
+            return _repair_from(text, match.start())
+        except ValueError as e:
+            error = error or e
+
+    if error is not None:
+        raise error
+    raise ValueError(f"Aucun JSON dans la réponse: {text[:80]!r}")
+
+
+def _repair_from(text: str, i: int):
+    """Répare et décode le JSON qui commence à text[i]"""
+    output = []
+    stack: List[str] = []
+    quote: Optional[str] = None
+    escape = False
+    string_start = -1  # indice dans output de la dernière chaîne ouverte
+
+    while i < len(text):
+        char = text[i]
+
+        if quote:
+            if escape:
+                escape = False
+                # \' n'est pas un échappement JSON valide
+                output.append("'" if char == "'" else '\\' + char)
+            elif char == '\\':
+                escape = True
+            elif char == quote:
+                quote = None
+                output.append('"')
+            elif char == '"':
+                output.append('\\"')
+            elif char == '\n':
+                output.append('\\n')
+            else:
+                output.append(char)
+            i += 1
+            continue
+
+        if char in ('"', "'"):
+            quote = char
+            string_start = len(output)
+            output.append('"')
+        elif char in CLOSING:
+            stack.append(char)
+            output.append(char)
+        elif char in ('}', ']'):
+            _strip_trailing_comma(output)
+            if stack:
+                stack.pop()
+            output.append(char)
+            if not stack:
+                break
+        else:
+            for literal, replacement in PYTHON_LITERALS.items():
+                if text.startswith(literal, i) and not text[i + len(literal):i + len(literal) + 1].isalnum():
+                    output.append(replacement)
+                    i += len(literal)
+                    break
+            else:
+                output.append(char)
+                i += 1
+            continue
+
+        i += 1
+
+    # Réponse tronquée : terminer la dernière valeur, fermer les structures ouvertes
+    if stack:
+        start = len(''.join(output[:string_start])) if string_start >= 0 else -1
+        output = list(_close_truncated(''.join(output), quote is not None, start, stack[-1]))
+    while stack:
+        _strip_trailing_comma(output)
+        output.append(CLOSING[stack.pop()])
+
+    try:
+        return json.loads(''.join(output))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON invalide après réparation: {e}") from e
+
+
+def _close_truncated(text: str, in_string: bool, string_start: int, container: str) -> str:
+    """
+    Termine un JSON réparé coupé au milieu d'une valeur
+
+    - chaîne ouverte : fermée, sans échappement \\uXXXX incomplet
+    - nombre ou littéral coupé : complété (tru -> true, 0. -> 0) ou retiré
+    - clé sans valeur : retirée
+    - valeur manquante après ':' : null
+
+    Args:
+        text: Sortie réparée jusqu'à la coupure
+        in_string: True si la coupure tombe dans une chaîne
+        string_start: Position dans text de la dernière chaîne ouverte (-1 si aucune)
+        container: Dernière structure ouverte ('{' ou '[')
+    """
+    if in_string:
+        escape = re.search(r'(\\*)\\u[0-9a-fA-F]{0,3}$', text)
+        if escape and len(escape.group(1)) % 2 == 0:
+            text = text[:escape.start() + len(escape.group(1))]
+        text += '"'
+    else:
+        token = re.search(r'[A-Za-z0-9.+\-]*$', text).group()
+        if token:
+            text = text[:len(text) - len(token)] + _complete_scalar(token)
+
+    if (container == '{' and string_start >= 0
+            and re.fullmatch(r'"(?:[^"\\]|\\.)*"\s*', text[string_start:])
+            and text[:string_start].rstrip().endswith(('{', ','))):
+        text = text[:string_start]
+
+    if text.rstrip().endswith(':'):
+        text = text.rstrip() + 'null'
+    return text
+
+
+def _complete_scalar(token: str) -> str:
+    """Littéral complété d'après son début, ou plus long préfixe numérique valide ('' si aucun)"""
+    for literal in LITERALS:
+        if literal.startswith(token):
+            return PYTHON_LITERALS.get(literal, literal)
+    return token.rstrip('.eE+-')
+
+
+def _strip_trailing_comma(output: List[str]):
+    """Enlève une virgule finale (en ignorant les espaces) de la sortie"""
+    j = len(output) - 1
+    while j >= 0 and output[j].isspace():
+        j -= 1
+    if j >= 0 and output[j] == ',':
+        del output[j]
+
+
+def validate_result(result, command: str) -> Dict:
+    """
+    Valide et normalise un résultat du LLM
+
+    Args:
+        result: JSON décodé
+        command: Commande d'origine
+
+    Returns:
+        Dict avec targets, confidence, interpretation, raw_command
+
+    Raises:
+        ValueError: si le résultat n'a pas le format attendu
+    """
+    if not isinstance(result, dict):
+        raise ValueError("Le résultat doit être un objet JSON")
+
+    targets = result.get('targets')
+    if not isinstance(targets, list):
+        raise ValueError("Le champ 'targets' doit être une liste")
+
+    normalized_targets = []
+    for target in targets:
+        if not isinstance(target, dict):
+            raise ValueError("Chaque cible doit être un objet JSON")
+
+        color = target.get('color')
+        shape = target.get('shape')
+        if color is not None and not isinstance(color, str):
+            raise ValueError(f"Couleur invalide: {color!r}")
+        if shape is not None and not isinstance(shape, str):
+            raise ValueError(f"Forme invalide: {shape!r}")
+
+        # Valeurs hors vocabulaire (ex. "rou" d'une réponse tronquée) refusées
+        if color:
+            if color.lower() not in COLOR_ALIASES:
+                raise ValueError(f"Couleur inconnue: {color!r}")
+            color = COLOR_ALIASES[color.lower()]
+        if shape:
+            if shape.lower() not in SHAPE_ALIASES:
+                raise ValueError(f"Forme inconnue: {shape!r}")
+            shape = SHAPE_ALIASES[shape.lower()]
+        if not color and not shape:
+            raise ValueError("Cible sans couleur ni forme")
+
+        target_type = target.get('type')
+        if target_type not in TARGET_TYPES:
+            target_type = 'target'
+
+        normalized_targets.append({
+            'color': color or None,
+            'shape': shape or None,
+            'type': target_type
+        })
+
+    confidence = result.get('confidence', DEFAULT_CONFIDENCE)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+        confidence = DEFAULT_CONFIDENCE
+
+    result['targets'] = normalized_targets
+    result['confidence'] = min(max(float(confidence), 0.0), 1.0)
+    interpretation = result.get('interpretation', command)
+    result['interpretation'] = '' if interpretation is None else str(interpretation)
+    result['raw_command'] = command
+
+    return result
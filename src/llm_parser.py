@@ -4,35 +4,71 @@ Comprend des commandes complexes avec plusieurs cibles et waypoints
 """
 
 import os
-import json
-import google.generativeai as genai
+import importlib.util
 from typing import Dict, List, Optional
 
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.llm_backends import GeminiBackend
+from src.llm_json import IncrementalJSONParser, repair_json, validate_result
+
+
+# Estimation grossière : environ 4 caractères par token
+CHARS_PER_TOKEN = 4
+
+# Tokens de réponse réservés pour chaque commande d'un lot
+RESPONSE_TOKENS_PER_COMMAND = 80
+
+# Budget de tokens (prompt + réponse) et nombre de commandes par requête groupée
+DEFAULT_TOKEN_BUDGET = 4000
+MAX_BATCH_SIZE = 20
+
+
+def is_available() -> bool:
+    """Indique si google-generativeai est installé (sans l'importer)"""
+    try:
+        return importlib.util.find_spec('google.generativeai') is not None
+    except ModuleNotFoundError:
+        return False
+
 
 class LLMParser:
     """Parser intelligent utilisant l'API Gemini de Google"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 backend=None):
         """
         Initialise le parser LLM
 
         Args:
             api_key: Clé API Gemini (ou via variable d'environnement GEMINI_API_KEY)
+            circuit_breaker: Disjoncteur autour des appels Gemini (un par défaut)
+            backend: Backend du modèle (GeminiBackend par défaut, ReplayBackend
+                     pour tester sans réseau) - voir src/llm_backends.py
         """
-        # Récupérer la clé API
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        if backend is None:
+            # Récupérer la clé API
+            self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+
+            if not self.api_key:
+                raise ValueError(
+                    "Clé API Gemini requise. "
+                    "Définissez la variable d'environnement GEMINI_API_KEY "
+                    "ou passez api_key au constructeur."
+                )
+
+            # Utiliser le modèle Gemini 2.5 Flash (rapide et gratuit)
+            backend = GeminiBackend(self.api_key, 'gemini-2.5-flash')
+        else:
+            self.api_key = api_key
+
+        self.backend = backend
 
-        if not self.api_key:
-            raise ValueError(
-                "Clé API Gemini requise. "
-                "Définissez la variable d'environnement GEMINI_API_KEY "
-                "ou passez api_key au constructeur."
-            )
+        # Disjoncteur : évite d'attendre une erreur à chaque commande si Gemini est indisponible
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
 
-        # Configurer Gemini
-        genai.configure(api_key=self.api_key)
-        # Utiliser le modèle Gemini 2.5 Flash (rapide et gratuit)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        # Parser simple utilisé en fallback (créé à la première utilisation)
+        self._simple_parser = None
 
         # Prompt système pour guider Gemini
         self.system_prompt = """Tu es un assistant qui convertit des commandes en langage naturel en instructions structurées pour un robot.
@@ -47,23 +83,40 @@ Tu dois extraire de la commande:
 2. Les waypoints (points de passage) - optionnel
 3. La séquence d'actions
 
-Réponds UNIQUEMENT avec un JSON valide dans ce format:
+Réponds UNIQUEMENT avec un JSON valide dans ce format (dans cet ordre,
+"targets" en dernier):
 {
+    "confidence": 0.95,
+    "interpretation": "Aller au carré rouge en passant par le cercle bleu",
     "targets": [
         {"color": "rouge", "shape": "square", "type": "target"},
         {"color": "bleu", "shape": "circle", "type": "waypoint"}
-    ],
-    "confidence": 0.95,
-    "interpretation": "Aller au carré rouge en passant par le cercle bleu"
+    ]
 }
 
 Si la commande n'est pas claire, mets confidence < 0.5.
+"""
+
+        # Consignes ajoutées au prompt système en mode lot
+        self.batch_prompt = """Tu vas recevoir plusieurs commandes numérotées.
+Réponds UNIQUEMENT avec un tableau JSON contenant un objet par commande,
+dans le même ordre, au format ci-dessus, avec en plus le champ "index"
+égal au numéro de la commande:
+[
+    {"index": 0, "confidence": 0.95, "interpretation": "...", "targets": [...]},
+    {"index": 1, "confidence": 0.9, "interpretation": "...", "targets": [...]}
+]
 """
 
     def parse_command(self, command: str) -> Dict:
         """
         Parse une commande avec Gemini
 
+        La réponse est lue en streaming et analysée au fur et à mesure :
+        on s'arrête dès que le tableau "targets" est complet. Le prompt le
+        place en dernier, après "confidence" et "interpretation", pour que
+        l'arrêt anticipé ne perde aucun champ.
+
         Args:
             command: Commande en langage naturel
 
@@ -74,49 +127,148 @@ Si la commande n'est pas claire, mets confidence < 0.5.
             # Créer le prompt complet
             prompt = f"{self.system_prompt}\n\nCommande: {command}\n\nRéponds uniquement avec le JSON:"
 
-            # Appeler Gemini
-            response = self.model.generate_content(prompt)
+            # Appeler Gemini en streaming (à travers le disjoncteur)
+            stream_parser = self.circuit_breaker.call(self._stream_json, prompt)
+
+            # Réparer et valider le résultat
+            return validate_result(stream_parser.result(), command)
+
+        except CircuitOpenError:
+            # Circuit ouvert : fallback immédiat, sans appel réseau
+            return self._fallback_parse(command, circuit_open=True)
+
+        except Exception as e:
+            print(f"Erreur LLM: {e}")
+            # Fallback sur le parser simple
+            return self._fallback_parse(command)
+
+    def _stream_json(self, prompt: str) -> IncrementalJSONParser:
+        """
+        Appelle le modèle en streaming et analyse le JSON au fil des morceaux reçus
+
+        S'arrête dès que le tableau "targets" est complet.
+        """
+        stream_parser = IncrementalJSONParser()
+        for chunk in self.backend.generate_stream(prompt):
+            stream_parser.feed(chunk)
+            if stream_parser.targets_complete:
+                break
+
+        return stream_parser
+
+    def parse_commands(self, commands: List[str], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                       max_batch_size: int = MAX_BATCH_SIZE) -> List[Dict]:
+        """
+        Parse plusieurs commandes en regroupant les prompts par lots
+
+        Chaque lot envoie le prompt système une seule fois et demande un
+        tableau JSON. Seules les commandes dont l'entrée est invalide sont
+        ré-interrogées individuellement.
+
+        Args:
+            commands: Liste de commandes en langage naturel
+            token_budget: Budget de tokens (prompt + réponse) par requête
+            max_batch_size: Nombre maximal de commandes par lot
+
+        Returns:
+            Liste de Dict (même ordre que commands), au format de parse_command
+        """
+        results: List[Optional[Dict]] = [None] * len(commands)
 
-            # Extraire le JSON de la réponse
-            response_text = response.text.strip()
+        for batch in self._make_batches(commands, token_budget, max_batch_size):
+            batch_results = self._parse_batch([commands[i] for i in batch])
 
-            # Nettoyer la réponse (enlever les balises markdown si présentes)
-            if response_text.startswith('```'):
-                # Extraire le contenu entre ```json et ```
-                lines = response_text.split('\n')
-                json_lines = []
-                in_json = False
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_json = not in_json
-                        continue
-                    if in_json:
-                        json_lines.append(line)
-                response_text = '\n'.join(json_lines)
+            for offset, index in enumerate(batch):
+                result = batch_results[offset]
+                if result is None:
+                    # Entrée manquante ou invalide : nouvelle requête individuelle
+                    result = self.parse_command(commands[index])
+                results[index] = result
 
-            # Parser le JSON
-            result = json.loads(response_text)
+        return results
 
-            # Valider le résultat
-            if 'targets' not in result:
-                return self._fallback_parse(command)
+    def _make_batches(self, commands: List[str], token_budget: int,
+                      max_batch_size: int) -> List[List[int]]:
+        """Découpe les commandes en lots (indices) respectant le budget de tokens"""
+        base_tokens = self._estimate_tokens(self.system_prompt + self.batch_prompt)
 
-            # Ajouter la commande brute
-            result['raw_command'] = command
+        batches = []
+        current: List[int] = []
+        current_tokens = base_tokens
 
-            return result
+        for i, command in enumerate(commands):
+            command_tokens = self._estimate_tokens(command) + RESPONSE_TOKENS_PER_COMMAND
 
+            if current and (current_tokens + command_tokens > token_budget or
+                            len(current) >= max_batch_size):
+                batches.append(current)
+                current = []
+                current_tokens = base_tokens
+
+            current.append(i)
+            current_tokens += command_tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _parse_batch(self, commands: List[str]) -> List[Optional[Dict]]:
+        """
+        Envoie un lot de commandes en une seule requête
+
+        Returns:
+            Liste de résultats alignée sur commands (None si l'entrée est invalide)
+        """
+        if len(commands) == 1:
+            return [self.parse_command(commands[0])]
+
+        results: List[Optional[Dict]] = [None] * len(commands)
+
+        try:
+            numbered = '\n'.join(f"{i}. {command}" for i, command in enumerate(commands))
+            prompt = (f"{self.system_prompt}\n{self.batch_prompt}\n"
+                      f"Commandes:\n{numbered}\n\nRéponds uniquement avec le tableau JSON:")
+
+            response_text = self.circuit_breaker.call(self.backend.generate, prompt)
+            entries = repair_json(response_text)
+        except CircuitOpenError:
+            return results
         except Exception as e:
-            print(f"Erreur LLM: {e}")
-            # Fallback sur le parser simple
-            return self._fallback_parse(command)
+            print(f"Erreur LLM (lot de {len(commands)} commandes): {e}")
+            return results
+
+        if not isinstance(entries, list):
+            return results
+
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+
+            index = entry.pop('index', position)
+            if not isinstance(index, int) or not 0 <= index < len(commands):
+                continue
+
+            try:
+                results[index] = validate_result(entry, commands[index])
+            except ValueError:
+                # Entrée invalide : sera ré-interrogée individuellement
+                continue
+
+        return results
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Estime le nombre de tokens d'un texte"""
+        return len(text) // CHARS_PER_TOKEN + 1
 
-    def _fallback_parse(self, command: str) -> Dict:
-        """Parser simple en cas d'échec du LLM"""
+    def _fallback_parse(self, command: str, circuit_open: bool = False) -> Dict:
+        """Parser simple en cas d'échec du LLM (ou si le circuit est ouvert)"""
         from src.nlp_parser import NLPParser
 
-        simple_parser = NLPParser()
-        simple_result = simple_parser.parse_command(command)
+        if self._simple_parser is None:
+            self._simple_parser = NLPParser()
+        simple_result = self._simple_parser.parse_command(command)
 
         # Convertir au format LLM
         targets = []
@@ -132,18 +284,39 @@ Si la commande n'est pas claire, mets confidence < 0.5.
             'confidence': simple_result['confidence'],
             'interpretation': command,
             'raw_command': command,
-            'fallback': True
+            'fallback': True,
+            'circuit_open': circuit_open
         }
 
-    def explain_parsing(self, command: str) -> str:
-        """Explique comment une commande a été parsée"""
-        parsed = self.parse_command(command)
+    def get_stats(self) -> Dict:
+        """Retourne l'état du disjoncteur et les compteurs d'erreurs"""
+        return self.circuit_breaker.get_stats()
+
+    def print_stats(self):
+        """Affiche l'état du disjoncteur"""
+        stats = self.get_stats()
+        print("\n" + "-"*60)
+        print("ETAT DU LLM")
+        print("-"*60)
+        print(f"  Circuit : {stats['state']}")
+        print(f"  Appels réseau : {stats['total_calls']} (succès: {stats['total_successes']}, "
+              f"échecs: {stats['total_failures']}, court-circuités: {stats['short_circuited']})")
+        print(f"  Ouvertures du circuit : {stats['times_opened']}")
+        for error_name, count in stats['errors'].items():
+            print(f"    - {error_name}: {count}")
+
+    def explain_parsing(self, command: str, parsed: Optional[Dict] = None) -> str:
+        """Explique comment une commande a été parsée (parsed évite un nouvel appel)"""
+        if parsed is None:
+            parsed = self.parse_command(command)
 
         explanation = f"\n📝 Analyse de la commande (LLM): '{command}'\n"
         explanation += f"  - Interprétation: {parsed.get('interpretation', 'N/A')}\n"
         explanation += f"  - Confiance: {parsed.get('confidence', 0)*100:.0f}%\n"
 
-        if parsed.get('fallback'):
+        if parsed.get('circuit_open'):
+            explanation += "  - Mode: Fallback (circuit LLM ouvert)\n"
+        elif parsed.get('fallback'):
             explanation += "  - Mode: Fallback (parser simple)\n"
         else:
             explanation += "  - Mode: LLM (Gemini)\n"
@@ -0,0 +1,185 @@
+"""
+Format binaire compact des cartes
+Un fichier contient les obstacles, les objets, la grille d'occupation
+précalculée et, en option, le champ de distance. Les tableaux sont lus par
+numpy.memmap : le chargement ne copie rien, et plusieurs processus qui
+ouvrent la même carte partagent les pages du cache système.
+
+Disposition (petit-boutiste) :
+    MAGIC (8 octets) | longueur de l'en-tête (uint32) | en-tête JSON
+    | sections alignées sur ALIGNMENT octets
+L'en-tête JSON décrit la carte et, pour chaque section, son décalage, son
+type et sa forme.
+"""
+
+import json
+import struct
+from typing import Dict, List
+
+import numpy as np
+
+from src.entity_store import COLOR_TABLE, SHAPE_TABLE, ObjectStore, ObstacleStore
+from src.environment import POSITION_MARGIN, Environment
+
+
+MAGIC = b'ROBOMAP\0'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Types des sections (format version 1)
+_DTYPES = {
+    'obstacles': '<i4',   # (N, 4) : x, y, largeur, hauteur
+    'objects': '<i4',     # (M, 5) : x, y, taille, indice couleur, indice forme
+    'occupancy': '|b1',   # (grid_height, grid_width), marge de l'en-tête
+    'distance': '<f4',    # (grid_height, grid_width), pixels
+}
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _vocabulary(values: List[str]) -> List[str]:
+    """Valeurs distinctes dans l'ordre d'apparition"""
+    return list(dict.fromkeys(values))
+
+
+def save_map(env: Environment, filename: str, include_distance: bool = False,
+             margin: int = POSITION_MARGIN):
+    """
+    Enregistre un environnement au format binaire
+
+    Args:
+        env: Environnement à enregistrer
+        filename: Chemin du fichier
+        include_distance: Ajouter le champ de distance (calculé si besoin)
+        margin: Marge de la grille d'occupation enregistrée
+    """
+    # Codes des tables du processus -> indices du vocabulaire du fichier
+    objects = np.array(env.objects.rows(), dtype=_DTYPES['objects'])
+    colors = _vocabulary([COLOR_TABLE.name(code) for code in objects[:, 3].tolist()])
+    shapes = _vocabulary([SHAPE_TABLE.name(code) for code in objects[:, 4].tolist()])
+    objects[:, 3] = [colors.index(COLOR_TABLE.name(code)) for code in objects[:, 3].tolist()]
+    objects[:, 4] = [shapes.index(SHAPE_TABLE.name(code)) for code in objects[:, 4].tolist()]
+
+    sections: Dict[str, np.ndarray] = {
+        'obstacles': np.ascontiguousarray(env.obstacles.rows(), dtype=_DTYPES['obstacles']),
+        'objects': objects,
+        'occupancy': np.ascontiguousarray(env.occupancy_grid(margin), dtype=_DTYPES['occupancy']),
+    }
+    if include_distance:
+        sections['distance'] = np.ascontiguousarray(env.distance_field(), dtype=_DTYPES['distance'])
+
+    header = {
+        'version': FORMAT_VERSION,
+        'width': env.width,
+        'height': env.height,
+        'grid_size': env.grid_size,
+        'margin': margin,
+        'colors': colors,
+        'shapes': shapes,
+        'sections': {},
+    }
+
+    # Les décalages dépendent de la taille de l'en-tête : recalculer jusqu'à
+    # ce que les sections commencent après l'en-tête
+    start = 0
+    while True:
+        offset = start
+        for name, array in sections.items():
+            header['sections'][name] = {'offset': offset, 'dtype': _DTYPES[name],
+                                        'shape': list(array.shape)}
+            offset = _align(offset + array.nbytes)
+        header_bytes = json.dumps(header).encode('utf-8')
+        needed = _align(len(MAGIC) + 4 + len(header_bytes))
+        if needed <= start:
+            break
+        start = needed
+
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in sections.items():
+            f.write(b'\0' * (header['sections'][name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+
+
+def read_header(filename: str) -> Dict:
+    """
+    Lit l'en-tête d'un fichier de carte
+
+    Raises:
+        ValueError: si le fichier n'est pas une carte, si sa version est
+                    inconnue ou si l'en-tête est tronqué ou incomplet
+    """
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{filename}: ce n'est pas un fichier de carte")
+        length_bytes = f.read(4)
+        length = struct.unpack('<I', length_bytes)[0] if len(length_bytes) == 4 else 0
+        header_bytes = f.read(length)
+    if not length or len(header_bytes) != length:
+        raise ValueError(f"{filename}: en-tête tronqué")
+
+    try:
+        header = json.loads(header_bytes.decode('utf-8'))
+    except ValueError:
+        raise ValueError(f"{filename}: en-tête illisible") from None
+    if not isinstance(header, dict):
+        raise ValueError(f"{filename}: en-tête illisible")
+
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"{filename}: version de format {header.get('version')} non supportée "
+                         f"(attendue: {FORMAT_VERSION})")
+
+    sections = header.get('sections')
+    required = ('obstacles', 'objects', 'occupancy')
+    if (not isinstance(sections, dict) or any(name not in sections for name in required)
+            or any(not isinstance(section, dict) or section.get('dtype') != _DTYPES.get(name)
+                   for name, section in sections.items())):
+        raise ValueError(f"{filename}: sections de l'en-tête invalides")
+    return header
+
+
+def load_map(filename: str) -> Environment:
+    """
+    Charge une carte enregistrée par save_map
+
+    Les obstacles et les grilles (occupation, distance si présente) restent
+    des vues en lecture seule sur le fichier, copiées seulement en cas de
+    modification ; seuls les codes de couleur et de forme des objets sont
+    traduits vers les tables du processus.
+
+    Returns:
+        Environment prêt pour la planification
+
+    Raises:
+        ValueError: si le fichier n'est pas une carte, si sa version est
+                    inconnue ou si son en-tête est invalide
+    """
+    header = read_header(filename)
+    arrays = {
+        name: np.memmap(filename, dtype=section['dtype'], mode='r',
+                        offset=section['offset'], shape=tuple(section['shape']))
+        if np.prod(section['shape']) else np.empty(section['shape'], dtype=section['dtype'])
+        for name, section in header['sections'].items()
+    }
+
+    objects = np.array(arrays['objects'])
+    color_codes = np.array([COLOR_TABLE.code(name) for name in header['colors']] or [0], dtype=np.int32)
+    shape_codes = np.array([SHAPE_TABLE.code(name) for name in header['shapes']] or [0], dtype=np.int32)
+    objects[:, 3] = color_codes[objects[:, 3]]
+    objects[:, 4] = shape_codes[objects[:, 4]]
+
+    env = Environment(width=header['width'], height=header['height'], grid_size=header['grid_size'])
+    env.obstacles = ObstacleStore.from_rows(arrays['obstacles'])
+    env.objects = ObjectStore.from_rows(objects)
+
+    # Grilles précalculées (l'affectation des obstacles a vidé les caches)
+    env._occupancy[header['margin']] = arrays['occupancy']
+    if 'distance' in arrays:
+        env._distance = arrays['distance']
+
+    return env
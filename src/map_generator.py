@@ -0,0 +1,365 @@
+"""
+Générateur procédural de cartes et de charges de commandes
+Produit des environnements reproductibles (graine) de grande taille pour
+mesurer le passage à l'échelle des planificateurs et des index :
+labyrinthes, rectangles aléatoires, allées d'entrepôt et pièces encombrées
+"""
+
+import random
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.environment import POSITION_MARGIN, Environment
+
+
+# Types de cartes disponibles
+MAP_TYPES = ('maze', 'rectangles', 'warehouse', 'rooms')
+
+# Taille maximale d'une carte (pixels, par côté)
+MAX_MAP_SIZE = 10000
+
+# Couleurs et formes reconnues par les parsers
+COLORS = ['rouge', 'bleu', 'vert', 'jaune', 'orange', 'violet']
+SHAPES = ['square', 'circle']
+SHAPE_WORDS = {'square': 'carre', 'circle': 'cercle'}
+
+# Modèles de commandes (avec et sans forme)
+COMMAND_TEMPLATES = [
+    "Va vers le {shape} {color}",
+    "Atteins le {shape} {color}",
+    "Deplace-toi vers le {shape} {color}",
+    "Rejoins le {shape} {color}",
+]
+COLOR_ONLY_TEMPLATES = [
+    "Va vers le {color}",
+    "Atteins l'objet {color}",
+]
+
+
+class MapGenerator:
+    """Génère des environnements et des commandes à partir d'une graine"""
+
+    def __init__(self, seed: int = 0):
+        """
+        Args:
+            seed: Graine du générateur (même graine = mêmes cartes et commandes)
+        """
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def generate(self, map_type: str = 'rectangles', width: int = 2000, height: int = 2000,
+                 num_objects: int = 50, grid_size: int = 20,
+                 start: Tuple[int, int] = (100, 100), **options) -> Environment:
+        """
+        Génère un environnement
+
+        Les objets sont toujours placés dans des cellules atteignables depuis
+        start, et les obstacles recouvrant start sont retirés.
+
+        Args:
+            map_type: 'maze', 'rectangles', 'warehouse' ou 'rooms'
+            width: Largeur en pixels (max MAX_MAP_SIZE)
+            height: Hauteur en pixels (max MAX_MAP_SIZE)
+            num_objects: Nombre d'objets cibles
+            grid_size: Taille des cellules de planification
+            start: Position de départ du robot (gardée libre)
+            options: Paramètres propres au type de carte (voir les méthodes _generate_*)
+
+        Returns:
+            Environment configuré
+
+        Raises:
+            ValueError: si le type ou la taille est invalide
+        """
+        if map_type not in MAP_TYPES:
+            raise ValueError(f"Type de carte inconnu: {map_type} (choix: {', '.join(MAP_TYPES)})")
+        if not (0 < width <= MAX_MAP_SIZE and 0 < height <= MAX_MAP_SIZE):
+            raise ValueError(f"Taille invalide: {width}x{height} (max {MAX_MAP_SIZE})")
+
+        env = Environment(width=width, height=height, grid_size=grid_size)
+        getattr(self, f'_generate_{map_type}')(env, **options)
+        self._clear_start(env, start)
+        self._place_objects(env, num_objects, start)
+
+        return env
+
+    def _generate_maze(self, env: Environment, cell_size: int = 100, wall: int = 20,
+                       loop_ratio: float = 0.05):
+        """
+        Labyrinthe parfait (parcours en profondeur), avec quelques murs
+        supplémentaires retirés pour créer des boucles
+
+        Args:
+            cell_size: Taille d'une case du labyrinthe (couloir + mur)
+            wall: Épaisseur des murs
+            loop_ratio: Proportion de murs intérieurs retirés en plus
+        """
+        cols = max(1, env.width // cell_size)
+        rows = max(1, env.height // cell_size)
+
+        # Murs encore présents : à droite de (c, r) et en dessous de (c, r)
+        right = np.ones((rows, cols), dtype=bool)
+        down = np.ones((rows, cols), dtype=bool)
+        right[:, -1] = False
+        down[-1, :] = False
+
+        visited = np.zeros((rows, cols), dtype=bool)
+        stack = [(0, 0)]
+        visited[0, 0] = True
+        while stack:
+            c, r = stack[-1]
+            candidates = [(c + dc, r + dr) for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                          if 0 <= c + dc < cols and 0 <= r + dr < rows
+                          and not visited[r + dr, c + dc]]
+            if not candidates:
+                stack.pop()
+                continue
+
+            nc, nr = self.random.choice(candidates)
+            if nc != c:
+                right[r, min(c, nc)] = False
+            else:
+                down[min(r, nr), c] = False
+            visited[nr, nc] = True
+            stack.append((nc, nr))
+
+        # Boucles : retirer quelques murs au hasard
+        for walls in (right, down):
+            remaining = np.argwhere(walls)
+            count = int(len(remaining) * loop_ratio)
+            for index in self.random.sample(range(len(remaining)), count):
+                r, c = remaining[index]
+                walls[r, c] = False
+
+        # Murs verticaux, fusionnés le long des colonnes
+        for c in range(cols):
+            x = (c + 1) * cell_size - wall // 2
+            for r0, r1 in _runs(right[:, c]):
+                env.add_obstacle(x, r0 * cell_size, wall, (r1 - r0) * cell_size)
+
+        # Murs horizontaux, fusionnés le long des lignes
+        for r in range(rows):
+            y = (r + 1) * cell_size - wall // 2
+            for c0, c1 in _runs(down[r, :]):
+                env.add_obstacle(c0 * cell_size, y, (c1 - c0) * cell_size, wall)
+
+    def _generate_rectangles(self, env: Environment, num_obstacles: Optional[int] = None,
+                             min_size: int = 20, max_size: int = 150, density: float = 0.15):
+        """
+        Rectangles de taille aléatoire
+
+        Args:
+            num_obstacles: Nombre d'obstacles (défaut: déduit de density)
+            min_size: Côté minimal d'un rectangle
+            max_size: Côté maximal d'un rectangle
+            density: Fraction approximative de la surface couverte
+        """
+        if num_obstacles is None:
+            mean_area = ((min_size + max_size) / 2) ** 2
+            num_obstacles = int(env.width * env.height * density / mean_area)
+
+        for _ in range(num_obstacles):
+            w = self.random.randint(min_size, max_size)
+            h = self.random.randint(min_size, max_size)
+            x = self.random.randint(0, max(0, env.width - w))
+            y = self.random.randint(0, max(0, env.height - h))
+            env.add_obstacle(x, y, w, h)
+
+    def _generate_warehouse(self, env: Environment, aisle_width: int = 80,
+                            shelf_depth: int = 40, shelf_length: int = 400,
+                            cross_aisle: int = 100, margin: int = 100):
+        """
+        Entrepôt : rangées d'étagères séparées par des allées, coupées
+        régulièrement par des allées transversales
+
+        Args:
+            aisle_width: Largeur des allées entre rangées
+            shelf_depth: Profondeur d'une étagère
+            shelf_length: Longueur d'un bloc d'étagères
+            cross_aisle: Largeur des allées transversales
+            margin: Allée périphérique
+        """
+        for y in range(margin, env.height - margin - shelf_depth + 1, shelf_depth + aisle_width):
+            for x in range(margin, env.width - margin, shelf_length + cross_aisle):
+                length = min(shelf_length, env.width - margin - x)
+                if length > 0:
+                    env.add_obstacle(x, y, length, shelf_depth)
+
+    def _generate_rooms(self, env: Environment, room_size: int = 400, wall: int = 20,
+                        door_width: int = 80, clutter: int = 4, clutter_size: Tuple[int, int] = (20, 60)):
+        """
+        Pièces encombrées : grille de pièces reliées par des portes, avec
+        des obstacles au centre de chaque pièce
+
+        Args:
+            room_size: Taille d'une pièce (murs compris)
+            wall: Épaisseur des murs
+            door_width: Largeur des portes
+            clutter: Obstacles par pièce
+            clutter_size: Côtés min et max des obstacles d'encombrement
+        """
+        cols = max(1, env.width // room_size)
+        rows = max(1, env.height // room_size)
+
+        for r in range(rows):
+            for c in range(cols):
+                x0, y0 = c * room_size, r * room_size
+
+                # Mur de droite et mur du bas, chacun percé d'une porte
+                if c < cols - 1:
+                    self._wall_with_door(env, x0 + room_size - wall // 2, y0, wall, room_size,
+                                         door_width, vertical=True)
+                if r < rows - 1:
+                    self._wall_with_door(env, x0, y0 + room_size - wall // 2, room_size, wall,
+                                         door_width, vertical=False)
+
+                # Encombrement, à distance des murs pour laisser les portes dégagées
+                inner = door_width
+                for _ in range(clutter):
+                    w = self.random.randint(*clutter_size)
+                    h = self.random.randint(*clutter_size)
+                    if room_size - 2 * inner - max(w, h) <= 0:
+                        continue
+                    x = x0 + self.random.randint(inner, room_size - inner - w)
+                    y = y0 + self.random.randint(inner, room_size - inner - h)
+                    env.add_obstacle(x, y, w, h)
+
+    def _wall_with_door(self, env: Environment, x: int, y: int, width: int, height: int,
+                        door_width: int, vertical: bool):
+        """Ajoute un mur en deux parties séparées par une porte placée au hasard"""
+        length = height if vertical else width
+        if length <= door_width + 2 * POSITION_MARGIN:
+            return
+
+        door = self.random.randint(POSITION_MARGIN, length - door_width - POSITION_MARGIN)
+        for start, end in ((0, door), (door + door_width, length)):
+            if end <= start:
+                continue
+            if vertical:
+                env.add_obstacle(x, y + start, width, end - start)
+            else:
+                env.add_obstacle(x + start, y, end - start, height)
+
+    def _clear_start(self, env: Environment, start: Tuple[int, int], radius: int = 40):
+        """Retire les obstacles qui recouvrent la zone de départ du robot"""
+        sx, sy = start
+        x, y, w, h = env.obstacles.rows().T
+        keep = ((x > sx + radius) | (x + w < sx - radius) |
+                (y > sy + radius) | (y + h < sy - radius))
+        env.obstacles = env.obstacles[keep]
+
+    def _place_objects(self, env: Environment, num_objects: int, start: Tuple[int, int]):
+        """Place des objets dans des cellules libres atteignables depuis start"""
+        reachable = reachable_cells(env, start)
+        cells = np.argwhere(reachable)
+        start_cell = env.pixel_to_grid(*start)
+
+        count = min(num_objects, len(cells))
+        for index in self.random.sample(range(len(cells)), count):
+            gy, gx = cells[index]
+            if (gx, gy) == start_cell:
+                continue
+            x, y = env.grid_to_pixel(int(gx), int(gy))
+            env.add_object(x, y, self.random.choice(COLORS), self.random.choice(SHAPES), 35)
+
+    def generate_workload(self, env: Environment, num_commands: int = 100,
+                          color_only_rate: float = 0.2, miss_rate: float = 0.0) -> List[str]:
+        """
+        Génère des commandes aléatoires pour un environnement
+
+        Args:
+            env: Environnement (ses objets servent de cibles)
+            num_commands: Nombre de commandes
+            color_only_rate: Proportion de commandes sans forme ("Va vers le rouge")
+            miss_rate: Proportion de commandes visant un objet absent
+
+        Returns:
+            Liste de commandes en langage naturel
+        """
+        present = {(obj.color, obj.shape) for obj in env.objects}
+        absent = [(color, shape) for color in COLORS for shape in SHAPES
+                  if (color, shape) not in present]
+
+        commands = []
+        for _ in range(num_commands):
+            if absent and self.random.random() < miss_rate:
+                color, shape = self.random.choice(absent)
+            elif env.objects:
+                obj = self.random.choice(env.objects)
+                color, shape = obj.color, obj.shape
+            else:
+                color, shape = self.random.choice(COLORS), self.random.choice(SHAPES)
+
+            if self.random.random() < color_only_rate:
+                template = self.random.choice(COLOR_ONLY_TEMPLATES)
+            else:
+                template = self.random.choice(COMMAND_TEMPLATES)
+            commands.append(template.format(shape=SHAPE_WORDS[shape], color=color))
+
+        return commands
+
+
+def generate_benchmark(map_type: str = 'rectangles', seed: int = 0, num_commands: int = 100,
+                       **kwargs) -> Tuple[Environment, List[str]]:
+    """
+    Génère une carte et sa charge de commandes (reproductible)
+
+    Args:
+        map_type: Type de carte (voir MAP_TYPES)
+        seed: Graine
+        num_commands: Nombre de commandes
+        kwargs: Paramètres de MapGenerator.generate
+
+    Returns:
+        (environnement, commandes)
+    """
+    generator = MapGenerator(seed)
+    env = generator.generate(map_type, **kwargs)
+    return env, generator.generate_workload(env, num_commands)
+
+
+def free_cells(env: Environment, margin: int = POSITION_MARGIN) -> np.ndarray:
+    """
+    Cellules de la grille dont le centre est une position valide
+
+    Returns:
+        Tableau booléen (grid_height, grid_width)
+    """
+    return ~env.occupancy_grid(margin)
+
+
+def reachable_cells(env: Environment, start: Tuple[int, int]) -> np.ndarray:
+    """
+    Cellules libres atteignables depuis start (8-connexité, comme PathFinder)
+
+    Returns:
+        Tableau booléen (grid_height, grid_width)
+    """
+    free = free_cells(env)
+    reachable = np.zeros_like(free)
+
+    sx, sy = env.pixel_to_grid(*start)
+    if not (0 <= sx < env.grid_width and 0 <= sy < env.grid_height) or not free[sy, sx]:
+        return reachable
+
+    height, width = free.shape
+    reachable[sy, sx] = True
+    queue = deque([(sx, sy)])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and free[ny, nx] and not reachable[ny, nx]:
+                reachable[ny, nx] = True
+                queue.append((nx, ny))
+
+    return reachable
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Intervalles [début, fin) des suites de True d'un tableau 1D"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(0, len(edges), 2)]
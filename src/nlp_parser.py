@@ -134,9 +134,10 @@ class NLPParser:
             "Atteins le cercle",
         ]
 
-    def explain_parsing(self, command: str) -> str:
+    def explain_parsing(self, command: str, parsed: Optional[Dict] = None) -> str:
         """Explique comment une commande a été parsée (pour debug)"""
-        parsed = self.parse_command(command)
+        if parsed is None:
+            parsed = self.parse_command(command)
 
         explanation = f"\n📝 Analyse de la commande: '{command}'\n"
         explanation += f"  - Action: {parsed['action'] or 'Non détectée'}\n"
@@ -1,7 +1,25 @@
 import heapq
+import contextlib
+import time
 import numpy as np
 from typing import List, Tuple, Optional
 
+from src.anytime import DIAGONAL_COST, AnytimeSearch, NearestAnytimeSearch
+from src.distance_field import distance_transform
+from src.environment import POSITION_MARGIN, SMALL_OBSTACLE_COUNT
+from src.quadtree import QuadTree
+
+# Dégagement (pixels) au-delà duquel une cellule n'est plus pénalisée
+DEFAULT_CLEARANCE_RANGE = 60
+
+# Délai (ms) accordé à la recherche à temps borné avant de rendre un chemin
+DEFAULT_DEADLINE_MS = 20
+
+# Au-delà de ce nombre de buts, l'heuristique multi-buts est lue dans une
+# transformée de distance au lieu d'un minimum calculé à chaque nœud
+NEAREST_HEURISTIC_GOALS = 16
+
+
 class Node:
     """Représente un nœud dans l'algorithme A*"""
     def __init__(self, position: Tuple[int, int], parent=None):
@@ -21,12 +39,163 @@ class Node:
         return hash(self.position)
 
 
+class _Frontier:
+    """
+    Une direction de la recherche bidirectionnelle : scores g, parents et
+    trois files (priorité MM, f, g) à suppression paresseuse
+    """
+
+    def __init__(self, origins: List[Tuple[int, int]], heuristic):
+        """
+        Args:
+            origins: Cellules d'origine (score 0) : le départ, ou les arrivées
+                     pour la direction arrière (plusieurs si multi-buts)
+            heuristic: Fonction cellule -> estimation du coût restant
+        """
+        self.heuristic = heuristic
+        self.g = {}
+        self.parent = {}
+        self.closed = set()
+        self._queues = ([], [], [])  # (clé, départage, g à l'insertion, nœud)
+        for origin in origins:
+            self.relax(origin, None, 0.0)
+
+    def _push(self, node: Tuple[int, int], g: float):
+        f = g + self.heuristic(node)
+        # À clé égale, le nœud le plus avancé (g le plus grand) d'abord
+        for queue, key in zip(self._queues, (max(f, 2 * g), f, g)):
+            heapq.heappush(queue, (key, -g, g, node))
+
+    def relax(self, node: Tuple[int, int], parent: Tuple[int, int], g: float) -> bool:
+        """Met à jour node si g améliore son score ; True si c'est le cas"""
+        if g >= self.g.get(node, float('inf')):
+            return False
+        self.g[node] = g
+        self.parent[node] = parent
+        self._push(node, g)
+        return True
+
+    def clean(self) -> bool:
+        """Retire les entrées périmées en tête des files ; False si la frontière est vide"""
+        for queue in self._queues:
+            while queue and (queue[0][3] in self.closed or queue[0][2] != self.g[queue[0][3]]):
+                heapq.heappop(queue)
+        return bool(self._queues[0])
+
+    def min_priority(self) -> float:
+        return self._queues[0][0][0]
+
+    def min_f(self) -> float:
+        return self._queues[1][0][0]
+
+    def min_g(self) -> float:
+        return self._queues[2][0][0]
+
+    def pop(self) -> Tuple[int, int]:
+        """Ferme et retourne le nœud de plus petite priorité (après clean)"""
+        node = heapq.heappop(self._queues[0])[3]
+        self.closed.add(node)
+        self.clean()
+        return node
+
+
 class PathFinder:
     """Implémente l'algorithme A* pour la planification de chemin"""
 
-    def __init__(self, environment):
+    def __init__(self, environment, evaluator=None, robot_radius: Optional[float] = None,
+                 clearance_weight: float = 0.0, clearance_range: float = DEFAULT_CLEARANCE_RANGE,
+                 quadtree: bool = False, bidirectional: bool = False,
+                 deadline_ms: Optional[float] = None):
+        """
+        Args:
+            environment: Environnement à parcourir
+            evaluator: Evaluator optionnel (phases et compteurs)
+            robot_radius: Rayon du robot (pixels) ; None = marge fixe
+                          POSITION_MARGIN autour des obstacles
+            clearance_weight: Poids du coût de proximité (0 = chemin le plus court) ;
+                              un pas vers une cellule au contact coûte (1 + poids) fois plus
+            clearance_range: Dégagement (pixels) au-delà duquel il n'y a plus de pénalité
+            quadtree: find_path_to_target cherche sur le quadtree de l'espace libre
+                      (quadtree_a_star) au lieu de la grille ; sans coût de proximité
+            bidirectional: Sur la grille, recherche bidirectionnelle
+                           (bidirectional_a_star) au lieu de a_star
+            deadline_ms: Sur la grille, recherche à temps borné
+                         (anytime_a_star avec ce délai) au lieu de a_star ;
+                         pas de chemin (None) si aucun n'est trouvé dans le délai
+
+        find_path_to_nearest utilise la variante multi-buts du même mode.
+        """
         self.environment = environment
 
+        # Rayon du robot : la recherche utilise alors l'espace des
+        # configurations précalculé pour ce rayon (Environment.cspace_grid),
+        # et is_line_clear le même test de disque (is_position_valid(radius=...))
+        self.robot_radius = robot_radius
+        self.margin = POSITION_MARGIN if robot_radius is None else int(np.ceil(robot_radius))
+
+        # Coût de proximité : grille de multiplicateurs (listes Python, lecture
+        # O(1) par voisin), reconstruite si la pénalité de l'environnement change
+        self.clearance_weight = clearance_weight
+        self.clearance_range = clearance_range
+        self._cost_source = None
+        self._cost_rows = None
+
+        # Quadtree de l'espace libre, reconstruit si la grille interdite change
+        self.use_quadtree = quadtree
+        self.bidirectional = bidirectional
+        self.deadline_ms = deadline_ms
+        self._quadtree_source = None
+        self._quadtree: Optional[QuadTree] = None
+
+        # Grille interdite en listes Python pour ARA*, reconvertie si elle change
+        self._blocked_source = None
+        self._blocked_rows = None
+
+        # Evaluator optionnel : phase 'simplify' et compteurs par commande
+        self.evaluator = evaluator
+
+        # Compteurs cumulés (nœuds développés par A*, tests de collision)
+        self.nodes_expanded = 0
+        self.collision_checks = 0
+
+    def blocked_grid(self) -> np.ndarray:
+        """Cellules interdites pour la recherche (mises en cache par l'environnement)"""
+        if self.robot_radius is None:
+            return self.environment.occupancy_grid()
+        return self.environment.cspace_grid(self.robot_radius)
+
+    def blocked_rows(self) -> List[List[bool]]:
+        """Grille interdite en listes Python (mise en cache), lue par AnytimeSearch"""
+        blocked = self.blocked_grid()
+        if blocked is not self._blocked_source:
+            self._blocked_rows = np.asarray(blocked, dtype=bool).tolist()
+            self._blocked_source = blocked
+        return self._blocked_rows
+
+    def cost_grid(self) -> Optional[List[List[float]]]:
+        """Multiplicateurs de coût par cellule (None sans pondération de dégagement)"""
+        if self.clearance_weight <= 0:
+            return None
+        penalty = self.environment.clearance_penalty(self.clearance_range)
+        if penalty is not self._cost_source:
+            self._cost_rows = (1 + self.clearance_weight * penalty.astype(np.float64)).tolist()
+            self._cost_source = penalty
+        return self._cost_rows
+
+    def quadtree(self) -> QuadTree:
+        """Quadtree de la grille interdite courante (mis en cache)"""
+        blocked = self.blocked_grid()
+        if blocked is not self._quadtree_source:
+            self._quadtree = QuadTree(blocked)
+            self._quadtree_source = blocked
+        return self._quadtree
+
+    def _span(self, phase: str):
+        """Mesure une phase si un Evaluator est attaché"""
+        if self.evaluator is None:
+            return contextlib.nullcontext()
+        return self.evaluator.span(phase)
+
     def heuristic(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """Calcule la distance euclidienne entre deux positions"""
         return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
@@ -36,6 +205,10 @@ class PathFinder:
         x, y = position
         neighbors = []
 
+        # Grille d'occupation précalculée (même test que is_position_valid sur le
+        # centre) ou espace des configurations du robot
+        occupied = self.blocked_grid()
+
         # 8 directions : haut, bas, gauche, droite, et diagonales
         directions = [
             (0, -1), (0, 1), (-1, 0), (1, 0),  # Cardinaux
@@ -49,11 +222,9 @@ class PathFinder:
             if (0 <= new_x < self.environment.grid_width and
                 0 <= new_y < self.environment.grid_height):
 
-                # Convertir en coordonnées pixel
-                pixel_x, pixel_y = self.environment.grid_to_pixel(new_x, new_y)
-
-                # Vérifier si la position est valide (pas d'obstacle)
-                if self.environment.is_position_valid(pixel_x, pixel_y):
+                # Vérifier si le centre de la cellule est valide (pas d'obstacle)
+                self.collision_checks += 1
+                if not occupied[new_y, new_x]:
                     neighbors.append((new_x, new_y))
 
         return neighbors
@@ -83,6 +254,9 @@ class PathFinder:
 
         heapq.heappush(open_list, start_node)
 
+        # Multiplicateurs de coût de proximité (optionnels)
+        cost = self.cost_grid()
+
         # Compteur d'itérations (pour éviter les boucles infinies)
         max_iterations = 10000
         iterations = 0
@@ -92,6 +266,7 @@ class PathFinder:
 
             # Obtenir le nœud avec le plus petit f
             current_node = heapq.heappop(open_list)
+            self.nodes_expanded += 1
 
             # Ajouter à la liste fermée
             closed_set.add(current_node.position)
@@ -111,7 +286,8 @@ class PathFinder:
                 path.reverse()
 
                 # Simplifier le chemin (enlever les points intermédiaires inutiles)
-                simplified_path = self.simplify_path(path)
+                with self._span('simplify'):
+                    simplified_path = self.simplify_path(path)
 
                 return simplified_path
 
@@ -130,7 +306,9 @@ class PathFinder:
                 # Coût supplémentaire pour les diagonales
                 dx = abs(neighbor_pos[0] - current_node.position[0])
                 dy = abs(neighbor_pos[1] - current_node.position[1])
-                move_cost = 1.414 if (dx == 1 and dy == 1) else 1.0
+                move_cost = DIAGONAL_COST if (dx == 1 and dy == 1) else 1.0
+                if cost is not None:
+                    move_cost *= cost[neighbor_pos[1]][neighbor_pos[0]]
 
                 neighbor_node.g = current_node.g + move_cost
                 neighbor_node.h = self.heuristic(neighbor_pos, goal_node.position)
@@ -149,6 +327,534 @@ class PathFinder:
         # Aucun chemin trouvé
         return None
 
+    def bidirectional_a_star(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* bidirectionnel « meet in the middle » (MM) : recherches simultanées
+        depuis le départ et depuis l'arrivée, même coût de chemin que a_star
+
+        Chaque direction ordonne ses nœuds par pr(n) = max(g + h, 2g), si bien
+        qu'aucune ne dépasse la moitié du coût optimal avant de rencontrer
+        l'autre ; on développe la direction de plus petite priorité. best est
+        le coût du meilleur chemin passant par un nœud atteint des deux côtés ;
+        on s'arrête dès que best <= max(C, fmin avant, fmin arrière,
+        gmin avant + gmin arrière + plus petit coût d'arête), C étant la
+        plus petite priorité ouverte : chacun de ces termes minore le coût de
+        tout chemin non encore trouvé.
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goal: Position d'arrivée (x, y) en pixels
+
+        Returns:
+            Liste de positions (en pixels) formant le chemin, ou None si pas de chemin
+        """
+        start_grid = self.environment.pixel_to_grid(start[0], start[1])
+        goal_grid = self.environment.pixel_to_grid(goal[0], goal[1])
+
+        if start_grid == goal_grid:
+            return [self.environment.grid_to_pixel(*start_grid)]
+
+        # Comme a_star : l'arrivée doit être une cellule libre (le départ peut ne pas l'être)
+        goal_cells = self._goal_cells([goal])
+        if not goal_cells:
+            return None
+
+        found = self._bidirectional_search(start_grid, goal_cells,
+                                           lambda node: self.heuristic(node, goal_grid))
+        return None if found is None else found[1]
+
+    def bidirectional_nearest(self, start: Tuple[int, int],
+                              goals: List[Tuple[int, int]]) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        MM vers le plus proche de plusieurs buts, en une seule recherche
+
+        La direction arrière part de tous les buts à la fois (but virtuel
+        relié sans coût à chacun) ; l'heuristique avant est la distance au
+        but le plus proche, comme pour nearest_a_star. Même coût de chemin
+        que nearest_a_star.
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goals: Positions des buts (x, y) en pixels
+
+        Returns:
+            (indice du but atteint dans goals, chemin en pixels), ou None si
+            aucun but n'est atteignable
+        """
+        start_grid = self.environment.pixel_to_grid(start[0], start[1])
+        goal_cells = self._goal_cells(goals)
+        if not goal_cells:
+            return None
+        if start_grid in goal_cells:
+            return goal_cells[start_grid], [self.environment.grid_to_pixel(*start_grid)]
+
+        return self._bidirectional_search(start_grid, goal_cells, self._nearest_heuristic(goal_cells))
+
+    def _bidirectional_search(self, start_grid: Tuple[int, int], goal_cells: dict,
+                              forward_heuristic) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Recherche MM (voir bidirectional_a_star) du départ vers des cellules
+        but libres, distinctes du départ
+
+        Args:
+            start_grid: Cellule de départ
+            goal_cells: Cellule but -> indice du but
+            forward_heuristic: Minorant du coût d'une cellule au but le plus proche
+
+        Returns:
+            (indice du but atteint, chemin en pixels simplifié), ou None
+        """
+        cost = self.cost_grid()
+        grid_size = self.environment.grid_size
+        min_edge = 1.0  # plus petit coût d'arête (multiplicateurs de proximité >= 1)
+
+        forward = _Frontier([start_grid], forward_heuristic)
+        backward = _Frontier(list(goal_cells), lambda node: self.heuristic(node, start_grid))
+
+        best = float('inf')
+        meeting = None
+        max_iterations = 10000
+        iterations = 0
+
+        while iterations < max_iterations:
+            if not forward.clean() or not backward.clean():
+                break
+            priority = min(forward.min_priority(), backward.min_priority())
+            if best <= max(priority, forward.min_f(), backward.min_f(),
+                           forward.min_g() + backward.min_g() + min_edge):
+                break
+
+            is_forward = forward.min_priority() <= backward.min_priority()
+            side, other = (forward, backward) if is_forward else (backward, forward)
+
+            current = side.pop()
+            iterations += 1
+            self.nodes_expanded += 1
+
+            neighbors = self.get_neighbors(current, grid_size)
+            if not is_forward and max(abs(current[0] - start_grid[0]), abs(current[1] - start_grid[1])) == 1:
+                # Le départ peut être une cellule interdite : arête départ -> current
+                neighbors.append(start_grid)
+
+            for neighbor in neighbors:
+                if neighbor in side.closed:
+                    continue
+
+                dx = abs(neighbor[0] - current[0])
+                dy = abs(neighbor[1] - current[1])
+                move_cost = DIAGONAL_COST if (dx == 1 and dy == 1) else 1.0
+                if cost is not None:
+                    # Même coût que l'arête parcourue dans le sens départ -> arrivée
+                    entered = neighbor if is_forward else current
+                    move_cost *= cost[entered[1]][entered[0]]
+
+                tentative = side.g[current] + move_cost
+                if side.relax(neighbor, current, tentative) and neighbor in other.g:
+                    if tentative + other.g[neighbor] < best:
+                        best = tentative + other.g[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            return None
+
+        # Départ -> rencontre (parents avant), puis rencontre -> but (parents arrière)
+        cells = []
+        node = meeting
+        while node is not None:
+            cells.append(node)
+            node = forward.parent[node]
+        cells.reverse()
+        node = backward.parent[meeting]
+        while node is not None:
+            cells.append(node)
+            node = backward.parent[node]
+
+        path = [self.environment.grid_to_pixel(x, y) for x, y in cells]
+        with self._span('simplify'):
+            return goal_cells[cells[-1]], self.simplify_path(path)
+
+    def anytime_search(self, start: Tuple[int, int], goal: Tuple[int, int],
+                       deadline_ms: float = DEFAULT_DEADLINE_MS) -> AnytimeSearch:
+        """
+        Lance une recherche ARA* et la poursuit jusqu'à l'échéance
+
+        Le délai borne toute la recherche, premier chemin compris : si aucun
+        chemin n'est trouvé à temps, anytime_path rend None mais la recherche
+        n'est pas terminée (done False). Elle peut continuer en arrière-plan
+        (start_background), ses chemins étant lus par anytime_path. Seuls les
+        nœuds développés avant l'échéance sont ajoutés aux compteurs du
+        PathFinder.
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goal: Position d'arrivée (x, y) en pixels
+            deadline_ms: Délai accordé à la recherche (ms)
+
+        Returns:
+            AnytimeSearch interrompue à l'échéance (ou terminée), avec ou
+            sans chemin publié
+        """
+        deadline = time.perf_counter() + deadline_ms / 1000
+        search = AnytimeSearch(self.blocked_rows(),
+                               self.environment.pixel_to_grid(start[0], start[1]),
+                               self.environment.pixel_to_grid(goal[0], goal[1]),
+                               self.cost_grid())
+        search.run(deadline)
+        self.nodes_expanded += search.nodes_expanded
+        self.collision_checks += search.collision_checks
+        return search
+
+    def anytime_path(self, search: AnytimeSearch) -> Optional[List[Tuple[int, int]]]:
+        """Dernier chemin publié par une recherche ARA*, en pixels et simplifié"""
+        _, cells, _ = search.result()
+        if cells is None:
+            return None
+        path = [self.environment.grid_to_pixel(x, y) for x, y in cells]
+        with self._span('simplify'):
+            return self.simplify_path(path)
+
+    def anytime_a_star(self, start: Tuple[int, int], goal: Tuple[int, int],
+                       deadline_ms: float = DEFAULT_DEADLINE_MS) -> Optional[List[Tuple[int, int]]]:
+        """
+        Meilleur chemin trouvé par ARA* dans le délai (sans arrière-plan)
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goal: Position d'arrivée (x, y) en pixels
+            deadline_ms: Délai accordé à la recherche (ms)
+
+        Returns:
+            Liste de positions (en pixels) formant le chemin, ou None si pas de
+            chemin ou si aucun n'a été trouvé dans le délai
+        """
+        return self.anytime_path(self.anytime_search(start, goal, deadline_ms))
+
+    def anytime_nearest_search(self, start: Tuple[int, int], goals: List[Tuple[int, int]],
+                               deadline_ms: float = DEFAULT_DEADLINE_MS) -> Optional[NearestAnytimeSearch]:
+        """
+        Lance une recherche ARA* vers le plus proche de plusieurs buts et la
+        poursuit jusqu'à l'échéance
+
+        Un seul délai pour tous les buts ; comme anytime_search, la recherche
+        peut continuer en arrière-plan. L'heuristique est celle de
+        nearest_a_star (transformée de distance au-delà de
+        NEAREST_HEURISTIC_GOALS buts).
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goals: Positions des buts (x, y) en pixels
+            deadline_ms: Délai accordé à la recherche (ms)
+
+        Returns:
+            NearestAnytimeSearch interrompue à l'échéance (ou terminée), lue
+            par anytime_nearest_path ; None si aucun but n'est une cellule libre
+        """
+        deadline = time.perf_counter() + deadline_ms / 1000
+        goal_cells = self._goal_cells(goals)
+        if not goal_cells:
+            return None
+        search = NearestAnytimeSearch(self.blocked_rows(),
+                                      self.environment.pixel_to_grid(start[0], start[1]),
+                                      goal_cells, self._nearest_heuristic(goal_cells),
+                                      self.cost_grid())
+        search.run(deadline)
+        self.nodes_expanded += search.nodes_expanded
+        self.collision_checks += search.collision_checks
+        return search
+
+    def anytime_nearest_path(self, search: AnytimeSearch) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Dernier chemin publié par une recherche ARA* et indice du but auquel
+        il mène (lus ensemble : le but peut changer d'un chemin à l'autre)
+        """
+        _, cells, _ = search.result()
+        if cells is None:
+            return None
+        path = [self.environment.grid_to_pixel(x, y) for x, y in cells]
+        with self._span('simplify'):
+            return search.goals[cells[-1]], self.simplify_path(path)
+
+    def anytime_nearest(self, start: Tuple[int, int], goals: List[Tuple[int, int]],
+                        deadline_ms: float = DEFAULT_DEADLINE_MS) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Meilleur chemin vers le plus proche de plusieurs buts trouvé par ARA*
+        dans le délai (sans arrière-plan)
+
+        Returns:
+            (indice du but atteint dans goals, chemin en pixels), ou None si
+            aucun but n'est atteignable ou si aucun chemin n'a été trouvé
+            dans le délai
+        """
+        search = self.anytime_nearest_search(start, goals, deadline_ms)
+        return None if search is None else self.anytime_nearest_path(search)
+
+    def _goal_cells(self, goals: List[Tuple[int, int]]) -> dict:
+        """Cellule -> premier but qui s'y trouve (buts interdits ou hors grille ignorés, comme pour a_star)"""
+        blocked = self.blocked_grid()
+        height, width = blocked.shape
+        goal_cells = {}
+        for index, (x, y) in enumerate(goals):
+            cell = self.environment.pixel_to_grid(x, y)
+            if 0 <= cell[0] < width and 0 <= cell[1] < height and not blocked[cell[1], cell[0]]:
+                goal_cells.setdefault(cell, index)
+        return goal_cells
+
+    def _nearest_heuristic(self, goal_cells: dict):
+        """
+        Distance (cellules) d'une cellule au but le plus proche : minimum
+        calculé à chaque appel, ou lu dans une transformée de distance
+        au-delà de NEAREST_HEURISTIC_GOALS buts
+        """
+        if len(goal_cells) <= NEAREST_HEURISTIC_GOALS:
+            cells = list(goal_cells)
+
+            def heuristic(node: Tuple[int, int]) -> float:
+                return min(((node[0] - gx) ** 2 + (node[1] - gy) ** 2) ** 0.5 for gx, gy in cells)
+            return heuristic
+
+        targets = np.zeros(self.blocked_grid().shape, dtype=bool)
+        for gx, gy in goal_cells:
+            targets[gy, gx] = True
+        rows = distance_transform(targets).tolist()
+
+        def heuristic(node: Tuple[int, int]) -> float:
+            return rows[node[1]][node[0]]
+        return heuristic
+
+    def nearest_a_star(self, start: Tuple[int, int],
+                       goals: List[Tuple[int, int]]) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        A* d'un départ vers le plus proche de plusieurs buts, en une seule recherche
+
+        L'heuristique est la distance au but le plus proche (admissible) ; la
+        recherche s'arrête dès qu'une cellule but est développée, c'est-à-dire
+        quand le but le moins coûteux à atteindre est fixé.
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goals: Positions des buts (x, y) en pixels
+
+        Returns:
+            (indice du but atteint dans goals, chemin en pixels), ou None si
+            aucun but n'est atteignable
+        """
+        start_grid = self.environment.pixel_to_grid(start[0], start[1])
+        goal_cells = self._goal_cells(goals)
+        if not goal_cells:
+            return None
+        if start_grid in goal_cells:
+            return goal_cells[start_grid], [self.environment.grid_to_pixel(*start_grid)]
+
+        heuristic = self._nearest_heuristic(goal_cells)
+
+        cost = self.cost_grid()
+        g_score = {start_grid: 0.0}
+        parent = {start_grid: None}
+        open_list = [(heuristic(start_grid), 0.0, start_grid)]
+        closed_set = set()
+        max_iterations = 10000
+
+        while open_list and len(closed_set) < max_iterations:
+            _, g, current = heapq.heappop(open_list)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            self.nodes_expanded += 1
+
+            if current in goal_cells:
+                cells_path = []
+                node = current
+                while node is not None:
+                    cells_path.append(node)
+                    node = parent[node]
+                path = [self.environment.grid_to_pixel(x, y) for x, y in reversed(cells_path)]
+                with self._span('simplify'):
+                    return goal_cells[current], self.simplify_path(path)
+
+            for neighbor in self.get_neighbors(current, self.environment.grid_size):
+                if neighbor in closed_set:
+                    continue
+                dx = abs(neighbor[0] - current[0])
+                dy = abs(neighbor[1] - current[1])
+                move_cost = DIAGONAL_COST if (dx == 1 and dy == 1) else 1.0
+                if cost is not None:
+                    move_cost *= cost[neighbor[1]][neighbor[0]]
+
+                tentative = g + move_cost
+                if tentative < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative
+                    parent[neighbor] = current
+                    heapq.heappush(open_list, (tentative + heuristic(neighbor), tentative, neighbor))
+
+        # Aucun but atteint
+        return None
+
+    def quadtree_a_star(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* sur les feuilles rectangulaires de l'espace libre (QuadTree)
+
+        Chaque feuille est un nœud ; on passe d'une feuille à sa voisine par
+        deux cellules adjacentes du côté commun, choisies au plus près de la
+        cellule par laquelle on est entré dans la feuille. Le chemin va en
+        ligne droite de passage en passage (une feuille est convexe et libre),
+        si bien que chaque segment reste dans des cellules libres ; les coûts
+        sont les longueurs de ces segments (en cellules).
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goal: Position d'arrivée (x, y) en pixels
+
+        Returns:
+            Liste de positions (en pixels) formant le chemin, ou None si pas de chemin
+        """
+        tree = self.quadtree()
+        start_cell = self.environment.pixel_to_grid(start[0], start[1])
+        goal_cell = self.environment.pixel_to_grid(goal[0], goal[1])
+
+        # Départ ou arrivée dans une cellule interdite : recherche sur la grille
+        if tree.leaf_at(*start_cell) < 0 or tree.leaf_at(*goal_cell) < 0:
+            return self.a_star(start, goal)
+
+        gx, gy = goal_cell[0] + 0.5, goal_cell[1] + 0.5
+        found = self._leaf_search(tree, start_cell, {goal_cell: 0},
+                                  lambda point: ((point[0] - gx) ** 2 + (point[1] - gy) ** 2) ** 0.5)
+        return None if found is None else found[1]
+
+    def quadtree_nearest(self, start: Tuple[int, int],
+                         goals: List[Tuple[int, int]]) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Recherche sur les feuilles (quadtree_a_star) vers le plus proche de
+        plusieurs buts, arrêtée à la première feuille but fixée
+
+        L'heuristique est la distance au but le plus proche, comme pour
+        nearest_a_star ; les buts interdits sont ignorés.
+
+        Args:
+            start: Position de départ (x, y) en pixels
+            goals: Positions des buts (x, y) en pixels
+
+        Returns:
+            (indice du but atteint dans goals, chemin en pixels), ou None si
+            aucun but n'est atteignable
+        """
+        tree = self.quadtree()
+        start_cell = self.environment.pixel_to_grid(start[0], start[1])
+
+        # Départ dans une cellule interdite : recherche sur la grille
+        if tree.leaf_at(*start_cell) < 0:
+            return self.nearest_a_star(start, goals)
+
+        goal_cells = self._goal_cells(goals)
+        if not goal_cells:
+            return None
+        heuristic = self._nearest_heuristic(goal_cells)
+        return self._leaf_search(tree, start_cell, goal_cells,
+                                 lambda point: heuristic((int(point[0]), int(point[1]))))
+
+    def _leaf_search(self, tree: QuadTree, start_cell: Tuple[int, int], goal_cells: dict,
+                     heuristic) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        A* sur les feuilles, d'une cellule libre vers des cellules but libres
+
+        Les feuilles contenant des buts mènent, en ligne droite depuis leur
+        point d'entrée, au but le plus proche de ce point : un nœud virtuel
+        (GOAL) dont le développement termine la recherche.
+
+        Args:
+            tree: Feuilles de l'espace libre
+            start_cell: Cellule de départ (dans une feuille)
+            goal_cells: Cellule but -> indice du but
+            heuristic: Minorant de la distance d'un point (cellules) au but le plus proche
+
+        Returns:
+            (indice du but atteint, chemin en pixels simplifié), ou None
+        """
+        goal_node = -1
+        goals_in_leaf = {}
+        for cell in goal_cells:
+            goals_in_leaf.setdefault(tree.leaf_at(*cell), []).append(cell)
+
+        def distance(p: Tuple[float, float], q: Tuple[float, float]) -> float:
+            return ((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2) ** 0.5
+
+        # Point d'entrée de chaque feuille (cellules) et passage emprunté pour y entrer
+        start_leaf = tree.leaf_at(*start_cell)
+        start_point = (start_cell[0] + 0.5, start_cell[1] + 0.5)
+        g_score = {start_leaf: 0.0}
+        parent = {start_leaf: None}
+        entry = {start_leaf: start_point}
+        crossing = {}
+        reached = None
+        open_list = [(heuristic(start_point), 0, start_leaf)]
+        closed_set = set()
+        counter = 0
+
+        while open_list:
+            _, _, leaf = heapq.heappop(open_list)
+            if leaf in closed_set:
+                continue
+            if leaf == goal_node:
+                return goal_cells[reached], self._quadtree_path(parent, crossing, parent[goal_node],
+                                                                 start_cell, reached)
+            closed_set.add(leaf)
+            self.nodes_expanded += 1
+
+            leaf_point = entry[leaf]
+            if leaf in goals_in_leaf:
+                # But de la feuille le plus proche du point d'entrée
+                cell = min(goals_in_leaf[leaf], key=lambda c: distance(leaf_point, (c[0] + 0.5, c[1] + 0.5)))
+                cost = g_score[leaf] + distance(leaf_point, (cell[0] + 0.5, cell[1] + 0.5))
+                if cost < g_score.get(goal_node, float('inf')):
+                    g_score[goal_node] = cost
+                    parent[goal_node] = leaf
+                    reached = cell
+                    counter += 1
+                    heapq.heappush(open_list, (cost, counter, goal_node))
+
+            for neighbor in tree.neighbors(leaf):
+                if neighbor in closed_set:
+                    continue
+                self.collision_checks += 1
+
+                cells = tree.transition(leaf, neighbor, leaf_point)
+                (ax, ay), (bx, by) = cells
+                exit_point, entry_point = (ax + 0.5, ay + 0.5), (bx + 0.5, by + 0.5)
+                cost = g_score[leaf] + distance(leaf_point, exit_point) + distance(exit_point, entry_point)
+
+                if cost < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = cost
+                    parent[neighbor] = leaf
+                    entry[neighbor] = entry_point
+                    crossing[neighbor] = cells
+                    counter += 1
+                    heapq.heappush(open_list, (cost + heuristic(entry_point), counter, neighbor))
+
+        # Aucun chemin trouvé
+        return None
+
+    def _quadtree_path(self, parent: dict, crossing: dict, last_leaf: int,
+                       start_cell: Tuple[int, int], goal_cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Reconstruit le chemin en pixels à partir des passages entre feuilles"""
+        leaves = []
+        leaf = last_leaf
+        while leaf is not None:
+            leaves.append(leaf)
+            leaf = parent[leaf]
+        leaves.reverse()
+
+        path = [self.environment.grid_to_pixel(*start_cell)]
+        for leaf in leaves[1:]:
+            exit_cell, entry_cell = crossing[leaf]
+            path.append(self.environment.grid_to_pixel(*exit_cell))
+            path.append(self.environment.grid_to_pixel(*entry_cell))
+        path.append(self.environment.grid_to_pixel(*goal_cell))
+
+        # Retirer les doublons consécutifs (cellules de passage confondues)
+        path = [p for i, p in enumerate(path) if i == 0 or p != path[i - 1]]
+
+        with self._span('simplify'):
+            return self.simplify_path(path)
+
     def simplify_path(self, path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """
         Simplifie le chemin en enlevant les points intermédiaires alignés
@@ -164,14 +870,23 @@ class PathFinder:
 
         simplified = [path[0]]  # Garder le point de départ
 
+        # Avec pondération de dégagement, un raccourci ne doit pas passer plus
+        # près des obstacles que la portion de chemin qu'il remplace
+        clearances = self.environment.clearances(path) if self.clearance_weight > 0 else None
+        segment_start = 0
+
         for i in range(1, len(path) - 1):
             prev = simplified[-1]
             current = path[i]
             next_point = path[i + 1]
 
             # Vérifier si le point actuel peut être sauté (ligne directe possible)
-            if not self.is_line_clear(prev, next_point):
+            skip = self.is_line_clear(prev, next_point)
+            if skip and clearances is not None:
+                skip = self.line_clearance(prev, next_point) >= clearances[segment_start:i + 2].min()
+            if not skip:
                 simplified.append(current)
+                segment_start = i
 
         simplified.append(path[-1])  # Garder le point d'arrivée
 
@@ -189,15 +904,35 @@ class PathFinder:
         Returns:
             True si la ligne est claire, False sinon
         """
-        for i in range(num_checks + 1):
-            t = i / num_checks
-            x = int(pos1[0] + t * (pos2[0] - pos1[0]))
-            y = int(pos1[1] + t * (pos2[1] - pos1[1]))
-
-            if not self.environment.is_position_valid(x, y):
-                return False
-
-        return True
+        if len(self.environment.obstacles) < SMALL_OBSTACLE_COUNT:
+            # Peu d'obstacles : boucle simple, arrêt au premier point invalide
+            for i in range(num_checks + 1):
+                t = i / num_checks
+                x = int(pos1[0] + t * (pos2[0] - pos1[0]))
+                y = int(pos1[1] + t * (pos2[1] - pos1[1]))
+
+                self.collision_checks += 1
+                if not self.environment.is_position_valid(x, y, self.margin, self.robot_radius):
+                    return False
+
+            return True
+
+        # Tous les points de la ligne testés en un seul appel (troncature comme int())
+        t = np.arange(num_checks + 1) / num_checks
+        points = np.empty((num_checks + 1, 2), dtype=np.int64)
+        points[:, 0] = pos1[0] + t * (pos2[0] - pos1[0])
+        points[:, 1] = pos1[1] + t * (pos2[1] - pos1[1])
+
+        self.collision_checks += num_checks + 1
+        return bool(self.environment.are_positions_valid(points, self.margin, self.robot_radius).all())
+
+    def line_clearance(self, pos1: Tuple[int, int], pos2: Tuple[int, int], num_checks: int = 10) -> float:
+        """Dégagement minimal (pixels) le long d'un segment, lu dans le champ de distance"""
+        t = np.arange(num_checks + 1) / num_checks
+        points = np.empty((num_checks + 1, 2), dtype=np.int64)
+        points[:, 0] = pos1[0] + t * (pos2[0] - pos1[0])
+        points[:, 1] = pos1[1] + t * (pos2[1] - pos1[1])
+        return float(self.environment.clearances(points).min())
 
     def find_path_to_target(self, robot_pos: Tuple[int, int], target_pos: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
         """
@@ -210,4 +945,52 @@ class PathFinder:
         Returns:
             Liste de waypoints formant le chemin, ou None si aucun chemin
         """
-        return self.a_star(robot_pos, target_pos)
+        if self.use_quadtree:
+            search = self.quadtree_a_star
+        elif self.bidirectional:
+            search = self.bidirectional_a_star
+        elif self.deadline_ms is not None:
+            def search(start, goal):
+                return self.anytime_a_star(start, goal, self.deadline_ms)
+        else:
+            search = self.a_star
+        return self._counted(search, robot_pos, target_pos)
+
+    def find_path_to_nearest(self, robot_pos: Tuple[int, int],
+                             target_positions: List[Tuple[int, int]]) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Trouve un chemin vers la plus proche (en coût de chemin) de plusieurs cibles
+
+        Une seule recherche multi-buts, dans le mode de find_path_to_target :
+        quadtree_nearest, bidirectional_nearest, anytime_nearest (un seul
+        délai pour toutes les cibles) ou nearest_a_star.
+
+        Args:
+            robot_pos: Position actuelle du robot (x, y)
+            target_positions: Positions des cibles candidates (x, y)
+
+        Returns:
+            (indice de la cible choisie, waypoints), ou None si aucune
+            cible n'est atteignable
+        """
+        if self.use_quadtree:
+            search = self.quadtree_nearest
+        elif self.bidirectional:
+            search = self.bidirectional_nearest
+        elif self.deadline_ms is not None:
+            def search(start, goals):
+                return self.anytime_nearest(start, goals, self.deadline_ms)
+        else:
+            search = self.nearest_a_star
+        return self._counted(search, robot_pos, target_positions)
+
+    def _counted(self, search, *args):
+        """Exécute une recherche en reportant ses compteurs à l'Evaluator"""
+        if self.evaluator is None:
+            return search(*args)
+
+        expanded, checks = self.nodes_expanded, self.collision_checks
+        result = search(*args)
+        self.evaluator.count('nodes_expanded', self.nodes_expanded - expanded)
+        self.evaluator.count('collision_checks', self.collision_checks - checks)
+        return result
@@ -0,0 +1,197 @@
+"""
+Pipeline d'exécution d'une commande : parsing → cibles → planification → mouvement
+Utilisé sans affichage par le mode lot de main.py et les outils d'automatisation
+"""
+
+import contextlib
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Environnements prédéfinis : nom (et alias) -> (nom affiché, méthode de création)
+ENVIRONMENTS = {
+    'simple': ('Simple', 'create_simple_environment'),
+    'labyrinthe': ('Labyrinthe', 'create_maze_environment'),
+    'maze': ('Labyrinthe', 'create_maze_environment'),
+    'ouvert': ('Ouvert', 'create_open_environment'),
+    'open': ('Ouvert', 'create_open_environment'),
+}
+
+# Pas de simulation maximum pour atteindre une cible
+MAX_STEPS_PER_TARGET = 1000
+
+
+def setup_environment(env, name: str) -> str:
+    """
+    Configure un environnement prédéfini
+
+    Args:
+        env: Environnement à configurer
+        name: Nom de l'environnement (simple, labyrinthe/maze, ouvert/open ou 1-3)
+
+    Returns:
+        Nom affiché de l'environnement
+
+    Raises:
+        ValueError: si le nom est inconnu
+    """
+    key = {'1': 'simple', '2': 'labyrinthe', '3': 'ouvert'}.get(name, name.lower())
+    if key not in ENVIRONMENTS:
+        raise ValueError(f"Environnement inconnu: {name} (choix: {', '.join(ENVIRONMENTS)})")
+
+    env_name, method = ENVIRONMENTS[key]
+    getattr(env, method)()
+    return env_name
+
+
+def resolve_targets(parsed: Dict, env) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Associe le résultat du parser aux objets de l'environnement
+
+    Accepte le format LLM (liste 'targets') et le format simple (color/shape).
+
+    Returns:
+        (cibles trouvées, cibles introuvables) ; chaque cible trouvée est un
+        Dict avec 'object' (premier objet correspondant), 'candidates' (tous
+        les objets correspondants), 'type', 'color', 'shape'
+    """
+    if 'targets' in parsed:
+        wanted = [(t.get('color'), t.get('shape'), t.get('type', 'target'))
+                  for t in parsed['targets']]
+    elif parsed.get('color') or parsed.get('shape'):
+        wanted = [(parsed.get('color'), parsed.get('shape'), 'target')]
+    else:
+        wanted = []
+
+    found = []
+    missing = []
+    for color, shape, target_type in wanted:
+        target_info = {'type': target_type, 'color': color, 'shape': shape}
+        candidates = env.find_objects(color, shape)
+        if candidates:
+            found.append({'object': candidates[0], 'candidates': candidates, **target_info})
+        else:
+            missing.append(target_info)
+
+    return found, missing
+
+
+def plan_to_target(pathfinder, position: Tuple[int, int], target: Dict):
+    """
+    Planifie vers une cible résolue par resolve_targets
+
+    Si plusieurs objets correspondent, le plus proche atteignable est choisi
+    (PathFinder.find_path_to_nearest : une seule recherche multi-buts, dans
+    le mode du PathFinder) ; target['object'] devient cet objet.
+
+    Returns:
+        (objet visé, chemin ou None)
+    """
+    candidates = target.get('candidates') or [target['object']]
+    if len(candidates) == 1:
+        target_obj = candidates[0]
+        return target_obj, pathfinder.find_path_to_target(position, (target_obj.x, target_obj.y))
+
+    found = pathfinder.find_path_to_nearest(position, [(obj.x, obj.y) for obj in candidates])
+    if found is None:
+        return target['object'], None
+
+    index, path = found
+    target['object'] = candidates[index]
+    return target['object'], path
+
+
+def execute_command(command: str, env, robot, parser, pathfinder,
+                    on_step: Optional[Callable[[int], None]] = None,
+                    max_steps_per_target: int = MAX_STEPS_PER_TARGET,
+                    evaluator=None,
+                    on_event: Optional[Callable[[Dict], None]] = None,
+                    parsed: Optional[Dict] = None) -> Dict:
+    """
+    Exécute une commande de bout en bout sans attendre l'affichage
+
+    Args:
+        command: Commande en langage naturel
+        env: Environnement
+        robot: Robot (part de sa position actuelle)
+        parser: NLPParser, LLMParser ou TieredParser
+        pathfinder: PathFinder de l'environnement
+        on_step: Appelé après chaque pas de simulation (rendu optionnel)
+        max_steps_per_target: Pas maximum pour atteindre chaque cible
+        evaluator: Evaluator optionnel recevant les temps par phase
+                   (parse, lookup, plan, execute)
+        on_event: Appelé avec {'type': 'path', 'target', 'path'} après chaque
+                  planification et {'type': 'target_reached', 'target',
+                  'color', 'shape'} à chaque cible atteinte
+        parsed: Résultat du parser déjà calculé (parsing par lot) ; parser
+                n'est alors pas appelé
+
+    Returns:
+        Dict résultat (succès, cibles atteintes, actions, waypoints, durée, erreur)
+    """
+    def span(phase: str):
+        return evaluator.span(phase) if evaluator is not None else contextlib.nullcontext()
+
+    start = time.perf_counter()
+
+    if parsed is None:
+        with span('parse'):
+            parsed = parser.parse_command(command)
+    with span('lookup'):
+        targets, missing = resolve_targets(parsed, env)
+
+    result = {
+        'command': command,
+        'success': False,
+        'targets': len(targets) + len(missing),
+        'reached': 0,
+        'actions': 0,
+        'waypoints': 0,
+        'error': None,
+    }
+    if 'tier' in parsed:
+        result['tier'] = parsed['tier']
+    if parsed.get('fallback'):
+        result['fallback'] = True
+
+    if missing:
+        result['error'] = "Cible non trouvée: " + ', '.join(
+            f"{t['color']} {t['shape']}" for t in missing)
+    elif not targets:
+        result['error'] = "Aucune cible dans la commande"
+    else:
+        for index, target in enumerate(targets):
+            with span('plan'):
+                target_obj, path = plan_to_target(pathfinder, robot.get_position(), target)
+            if path is None:
+                result['error'] = f"Aucun chemin vers {target['color']} {target['shape']}"
+                break
+
+            robot.set_path(path)
+            result['waypoints'] += len(path)
+            if on_event is not None:
+                on_event({'type': 'path', 'target': index, 'path': path})
+
+            steps = 0
+            with span('execute'):
+                while not robot.reached_target and steps < max_steps_per_target:
+                    robot.move_along_path()
+                    steps += 1
+                    if on_step is not None:
+                        on_step(steps)
+
+            if not robot.has_reached_target(target_obj.x, target_obj.y):
+                result['error'] = f"Cible non atteinte: {target['color']} {target['shape']}"
+                break
+
+            result['reached'] += 1
+            if on_event is not None:
+                on_event({'type': 'target_reached', 'target': index,
+                          'color': target['color'], 'shape': target['shape']})
+
+        result['success'] = result['error'] is None
+
+    result['actions'] = robot.total_actions
+    result['time_ms'] = (time.perf_counter() - start) * 1000
+
+    return result
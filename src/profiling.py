@@ -0,0 +1,271 @@
+"""
+Profilage optionnel des commandes
+Activé par la variable d'environnement ROBOT_PROFILE (ou --profile) :
+- cprofile : un fichier .prof par commande (pstats, snakeviz...)
+- sample   : échantillonnage de la pile du thread principal, fichiers
+             « collapsed stacks » prêts pour flamegraph.pl / speedscope
+Les agrégats de toutes les commandes sont écrits à la fermeture.
+Désactivé, aucun profileur n'est créé (profiler_from_env retourne None).
+"""
+
+import contextlib
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+PROFILE_ENV = 'ROBOT_PROFILE'
+PROFILE_DIR_ENV = 'ROBOT_PROFILE_DIR'
+
+# Modes disponibles (ROBOT_PROFILE=cprofile,sample ; 1/all = les deux)
+MODES = ('cprofile', 'sample')
+
+# Intervalle d'échantillonnage par défaut (secondes)
+SAMPLE_INTERVAL = 0.001
+
+AGGREGATE_PROF = 'aggregate.prof'
+AGGREGATE_COLLAPSED = 'aggregate.collapsed'
+
+
+def parse_modes(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Lit la valeur de ROBOT_PROFILE
+
+    Raises:
+        ValueError: si un mode est inconnu
+    """
+    value = (value or '').strip().lower()
+    if value in ('', '0', 'off', 'false', 'no'):
+        return ()
+    if value in ('1', 'on', 'true', 'yes', 'all'):
+        return MODES
+
+    modes = tuple(mode.strip() for mode in value.split(',') if mode.strip())
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        raise ValueError(f"Mode de profilage inconnu: {', '.join(unknown)} "
+                         f"(choix: {', '.join(MODES)}, all)")
+    return modes
+
+
+def default_output_dir() -> str:
+    """Répertoire d'une exécution : profiles/run-AAAAMMJJ-HHMMSS-pid"""
+    return os.path.join('profiles', time.strftime('run-%Y%m%d-%H%M%S') + f'-{os.getpid()}')
+
+
+def profiler_from_env(modes: Optional[str] = None) -> Optional['CommandProfiler']:
+    """
+    Crée un profileur si le profilage est activé
+
+    Args:
+        modes: Valeur à utiliser à la place de ROBOT_PROFILE
+
+    Returns:
+        CommandProfiler, ou None si le profilage est désactivé
+    """
+    parsed = parse_modes(modes if modes is not None else os.getenv(PROFILE_ENV))
+    if not parsed:
+        return None
+    return CommandProfiler(parsed, os.getenv(PROFILE_DIR_ENV) or default_output_dir())
+
+
+def maybe_profile(profiler: Optional['CommandProfiler'], label: str):
+    """Contexte de profilage d'une commande (sans effet si profiler est None)"""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.profile(label)
+
+
+class StackSampler:
+    """Échantillonne périodiquement la pile d'un thread depuis un thread séparé"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.target_id: Optional[int] = None
+        self.counts: Optional[Counter] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, target_id: int) -> Counter:
+        """Commence à compter les piles du thread target_id"""
+        self.target_id = target_id
+        self.counts = Counter()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self.counts
+
+    def stop(self) -> Counter:
+        """Arrête le comptage et retourne les piles comptées"""
+        counts, self.counts = self.counts, None
+        return counts or Counter()
+
+    def close(self):
+        """Arrête le thread d'échantillonnage"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            counts = self.counts
+            if counts is None:
+                continue
+            frame = sys._current_frames().get(self.target_id)
+            if frame is not None:
+                counts[_collapse(frame)] += 1
+
+
+def _collapse(frame) -> str:
+    """Pile d'appel au format « collapsed » : racine;...;feuille"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _slug(label: str) -> str:
+    """Nom de fichier court dérivé d'une commande"""
+    return re.sub(r'[^0-9A-Za-z]+', '_', label).strip('_')[:40] or 'commande'
+
+
+class CommandProfiler:
+    """Profile chaque commande et écrit un fichier par commande"""
+
+    def __init__(self, modes: Tuple[str, ...] = MODES, output_dir: Optional[str] = None,
+                 interval: float = SAMPLE_INTERVAL):
+        """
+        Args:
+            modes: 'cprofile' et/ou 'sample'
+            output_dir: Répertoire des fichiers (créé si besoin)
+            interval: Intervalle d'échantillonnage du mode 'sample' (secondes)
+        """
+        self.modes = modes
+        self.output_dir = output_dir or default_output_dir()
+        self.sampler = StackSampler(interval) if 'sample' in modes else None
+        self.index = 0
+        self.files: List[str] = []
+
+        self._label: Optional[str] = None
+        self._profile: Optional[cProfile.Profile] = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @property
+    def active(self) -> bool:
+        return self._label is not None
+
+    def begin(self, label: str):
+        """Commence le profil d'une commande (termine le précédent s'il est ouvert)"""
+        if self.active:
+            self.end()
+
+        self._label = label
+        if self.sampler is not None:
+            self.sampler.start(threading.get_ident())
+        if 'cprofile' in self.modes:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def end(self):
+        """Termine le profil en cours et écrit ses fichiers"""
+        if not self.active:
+            return
+
+        # Arrêter les mesures avant d'écrire les fichiers
+        counts = self.sampler.stop() if self.sampler is not None else None
+        if self._profile is not None:
+            self._profile.disable()
+
+        base = os.path.join(self.output_dir, f"{os.getpid()}-{self.index:05d}-{_slug(self._label)}")
+        self.index += 1
+
+        if self._profile is not None:
+            self._profile.dump_stats(base + '.prof')
+            self.files.append(base + '.prof')
+            self._profile = None
+
+        if counts is not None:
+            write_collapsed(counts, base + '.collapsed')
+            self.files.append(base + '.collapsed')
+
+        self._label = None
+
+    @contextlib.contextmanager
+    def profile(self, label: str):
+        """Profile le bloc : with profiler.profile(command): ..."""
+        self.begin(label)
+        try:
+            yield self
+        finally:
+            self.end()
+
+    def close(self) -> List[str]:
+        """Termine le profil en cours, arrête l'échantillonnage et écrit les agrégats"""
+        self.end()
+        if self.sampler is not None:
+            self.sampler.close()
+        written = aggregate_profiles(self.output_dir)
+        if written:
+            print(f"\n🔬 Profils écrits dans '{self.output_dir}' "
+                  f"({len(self.files)} fichier(s) par commande, agrégats: "
+                  f"{', '.join(os.path.basename(f) for f in written)})")
+        return written
+
+
+def write_collapsed(counts: Dict[str, int], filename: str):
+    """Écrit des piles comptées au format « collapsed » (une pile et son nombre par ligne)"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for stack, count in sorted(counts.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(filename: str) -> Counter:
+    """Lit un fichier « collapsed »"""
+    counts = Counter()
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack:
+                counts[stack] += int(count)
+    return counts
+
+
+def aggregate_profiles(output_dir: str) -> List[str]:
+    """
+    Agrège les profils par commande d'un répertoire (tous processus confondus)
+
+    Returns:
+        Fichiers écrits (aggregate.prof, aggregate.collapsed)
+    """
+    names = sorted(os.listdir(output_dir)) if os.path.isdir(output_dir) else []
+    profs = [os.path.join(output_dir, n) for n in names
+             if n.endswith('.prof') and n != AGGREGATE_PROF]
+    collapsed = [os.path.join(output_dir, n) for n in names
+                 if n.endswith('.collapsed') and n != AGGREGATE_COLLAPSED]
+
+    written = []
+    if profs:
+        stats = pstats.Stats(profs[0])
+        for filename in profs[1:]:
+            stats.add(filename)
+        stats.dump_stats(os.path.join(output_dir, AGGREGATE_PROF))
+        written.append(os.path.join(output_dir, AGGREGATE_PROF))
+
+    if collapsed:
+        total = Counter()
+        for filename in collapsed:
+            total.update(read_collapsed(filename))
+        write_collapsed(total, os.path.join(output_dir, AGGREGATE_COLLAPSED))
+        written.append(os.path.join(output_dir, AGGREGATE_COLLAPSED))
+
+    return written
@@ -0,0 +1,158 @@
+"""
+Décomposition de l'espace libre en feuilles rectangulaires
+Les cellules libres de la grille de planification sont regroupées en
+rectangles uniformément libres : grands rectangles dans les zones dégagées
+et le long des couloirs, cellules unitaires dans les recoins. La recherche
+de chemin (PathFinder.quadtree_a_star) parcourt les feuilles au lieu des
+cellules.
+
+Les feuilles étaient d'abord les carrés d'un quadtree, alignés sur des
+puissances de 2 : sur les cartes générées (cellules de 20 px), cet
+alignement découpait couloirs et abords d'obstacles en carrés de 1 ou 2
+cellules, et aucune feuille n'atteignait MAX_LEAF_SIZE. Le nom est conservé
+pour l'API (PathFinder(quadtree=True)).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Côté maximal d'une feuille (cellules) : borne les détours dans une feuille.
+# Mesuré sur 10 buts par carte 6000×6000 : 16, 32 ou 64 donnent à peu près
+# autant de feuilles (les obstacles les bornent avant), 32 gardant les
+# chemins à moins de 10 % de l'optimal en moyenne
+MAX_LEAF_SIZE = 32
+
+
+class QuadTree:
+    """Feuilles libres d'une grille d'occupation et leur voisinage (8-connexité)"""
+
+    def __init__(self, blocked: np.ndarray, max_leaf_size: int = MAX_LEAF_SIZE):
+        """
+        Args:
+            blocked: Grille booléenne (hauteur, largeur), True = cellule interdite
+            max_leaf_size: Côté maximal d'une feuille (cellules)
+        """
+        self.blocked = blocked
+        self.height, self.width = blocked.shape
+
+        leaves = self._decompose(max_leaf_size)
+        self.leaves = np.array(leaves, dtype=np.int32).reshape(-1, 4)  # x0, y0, largeur, hauteur
+
+        # Feuille de chaque cellule (-1 = cellule interdite)
+        self.leaf_of = np.full((self.height, self.width), -1, dtype=np.int32)
+        for index, (x0, y0, width, height) in enumerate(leaves):
+            self.leaf_of[y0:y0 + height, x0:x0 + width] = index
+
+        self._neighbors: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def _decompose(self, max_leaf_size: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Rectangles libres gloutons, dans l'ordre des lignes : chaque cellule
+        libre non couverte ouvre une feuille, étendue vers la droite puis vers
+        le bas tant que les cellules sont libres et non couvertes
+        """
+        covered = np.array(self.blocked, dtype=bool)
+        leaves = []
+        for y0 in range(self.height):
+            row = covered[y0]
+            x0 = 0
+            while True:
+                free = np.flatnonzero(~row[x0:])
+                if not len(free):
+                    break
+                x0 += int(free[0])
+
+                stop = np.flatnonzero(row[x0:x0 + max_leaf_size])
+                width = int(stop[0]) if len(stop) else min(max_leaf_size, self.width - x0)
+                height = 1
+                while (height < max_leaf_size and y0 + height < self.height
+                       and not covered[y0 + height, x0:x0 + width].any()):
+                    height += 1
+
+                covered[y0:y0 + height, x0:x0 + width] = True
+                leaves.append((x0, y0, width, height))
+                x0 += width
+        return leaves
+
+    def leaf_at(self, gx: int, gy: int) -> int:
+        """Feuille contenant la cellule (gx, gy), -1 si interdite ou hors grille"""
+        if 0 <= gx < self.width and 0 <= gy < self.height:
+            return int(self.leaf_of[gy, gx])
+        return -1
+
+    def center(self, leaf: int) -> Tuple[float, float]:
+        """Centre d'une feuille (coordonnées de grille, en cellules)"""
+        x0, y0, width, height = self.leaves[leaf].tolist()
+        return (x0 + width / 2, y0 + height / 2)
+
+    def neighbors(self, leaf: int) -> List[int]:
+        """Feuilles qui touchent la feuille par un côté ou un coin (mis en cache)"""
+        cached = self._neighbors.get(leaf)
+        if cached is not None:
+            return cached
+
+        x0, y0, width, height = self.leaves[leaf].tolist()
+        x1, y1 = x0 + width, y0 + height
+        cx0, cx1 = max(x0 - 1, 0), min(x1 + 1, self.width)
+        cy0, cy1 = max(y0 - 1, 0), min(y1 + 1, self.height)
+
+        ring = []
+        if y0 > 0:
+            ring.append(self.leaf_of[y0 - 1, cx0:cx1])
+        if y1 < self.height:
+            ring.append(self.leaf_of[y1, cx0:cx1])
+        if x0 > 0:
+            ring.append(self.leaf_of[y0:y1, x0 - 1])
+        if x1 < self.width:
+            ring.append(self.leaf_of[y0:y1, x1])
+
+        ids = np.unique(np.concatenate(ring)) if ring else np.empty(0, dtype=np.int32)
+        result = [int(i) for i in ids if i >= 0]
+        self._neighbors[leaf] = result
+        return result
+
+    def transition(self, a: int, b: int,
+                   near: Optional[Tuple[float, float]] = None) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Passage entre deux feuilles voisines
+
+        Args:
+            a, b: Feuilles voisines
+            near: Point (cellules) dont le passage doit être le plus proche
+                  le long du côté commun ; None = milieu du côté
+
+        Returns:
+            (cellule de a, cellule de b) adjacentes, sur le côté commun
+            (ou au coin commun)
+        """
+        ax0, ay0, a_width, a_height = self.leaves[a].tolist()
+        bx0, by0, b_width, b_height = self.leaves[b].tolist()
+        near_x, near_y = (None, None) if near is None else near
+        ax, bx = _crossing(ax0, ax0 + a_width, bx0, bx0 + b_width, near_x)
+        ay, by = _crossing(ay0, ay0 + a_height, by0, by0 + b_height, near_y)
+        return (ax, ay), (bx, by)
+
+    def leaf_size_histogram(self) -> Dict[int, int]:
+        """Nombre de feuilles par plus grand côté"""
+        sizes, counts = np.unique(self.leaves[:, 2:].max(axis=1), return_counts=True)
+        return dict(zip(sizes.tolist(), counts.tolist()))
+
+
+def _crossing(a0: int, a1: int, b0: int, b1: int, near: Optional[float] = None) -> Tuple[int, int]:
+    """Coordonnées (dans a, dans b) du passage le long d'un axe"""
+    if a1 == b0:
+        return a1 - 1, b0
+    if b1 == a0:
+        return a0, b1 - 1
+    low, high = max(a0, b0), min(a1, b1) - 1
+    if near is None:
+        middle = (low + high) // 2
+    else:
+        middle = min(max(int(near), low), high)
+    return middle, middle
+
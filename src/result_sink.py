@@ -0,0 +1,123 @@
+"""
+Écriture en continu des résultats de l'Evaluator
+Chaque résultat est ajouté au fichier dès la fin de la commande (JSONL ou
+CSV, compressé en gzip si le nom se termine par .gz) : la mémoire reste
+bornée et un arrêt brutal ne perd que les résultats non encore vidés
+"""
+
+import abc
+import csv
+import gzip
+import json
+import os
+from typing import Dict, List, Optional, TextIO
+
+from src.evaluator import PHASES
+
+
+# Colonnes CSV (les phases et compteurs sont aplatis)
+CSV_COLUMNS = (
+    ['command', 'environment', 'success', 'actions_count', 'path_length',
+     'execution_time', 'start_time', 'end_time']
+    + [f'{phase}_ms' for phase in PHASES]
+    + ['nodes_expanded', 'collision_checks', 'reasoning_steps']
+)
+
+
+def _json_default(value):
+    """Convertit les scalaires numpy (ex: bool de has_reached_target)"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
+class ResultSink(abc.ABC):
+    """Fichier de résultats en ajout seul (format défini par la sous-classe : _write)"""
+
+    def __init__(self, filename: str, flush_every: int = 1):
+        """
+        Ouvre le fichier en ajout (créé si besoin)
+
+        Args:
+            filename: Chemin du fichier (.gz pour compresser)
+            flush_every: Vider le tampon tous les N résultats (1 = après chaque
+                         résultat ; plus grand = moins d'écritures, surtout en gzip)
+        """
+        self.filename = filename
+        self.flush_every = max(1, flush_every)
+        self.written = 0
+        self.is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self.file: TextIO = self._open(filename)
+
+    @staticmethod
+    def _open(filename: str) -> TextIO:
+        if filename.endswith('.gz'):
+            return gzip.open(filename, 'at', encoding='utf-8', newline='')
+        return open(filename, 'a', encoding='utf-8', newline='')
+
+    def write(self, result: Dict):
+        """Ajoute un résultat"""
+        self._write(result)
+        self.written += 1
+        if self.written % self.flush_every == 0:
+            self.file.flush()
+
+    @abc.abstractmethod
+    def _write(self, result: Dict):
+        """Écrit un résultat dans self.file"""
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        """Vide le tampon et ferme le fichier"""
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class JSONLSink(ResultSink):
+    """Un objet JSON par ligne (résultat complet, phases et compteurs compris)"""
+
+    def _write(self, result: Dict):
+        self.file.write(json.dumps(result, ensure_ascii=False, default=_json_default) + '\n')
+
+
+class CSVSink(ResultSink):
+    """Une ligne CSV par résultat (colonnes CSV_COLUMNS)"""
+
+    def __init__(self, filename: str, flush_every: int = 1,
+                 columns: Optional[List[str]] = None):
+        super().__init__(filename, flush_every)
+        self.columns = list(columns or CSV_COLUMNS)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction='ignore')
+        if self.is_new:
+            self.writer.writeheader()
+
+    def _write(self, result: Dict):
+        row = {key: value for key, value in result.items()
+               if key not in ('phases', 'counters', 'reasoning_steps')}
+        row['success'] = bool(result.get('success'))
+        for phase, ms in result.get('phases', {}).items():
+            row[f'{phase}_ms'] = f"{ms:.3f}"
+        row.update(result.get('counters', {}))
+        row['reasoning_steps'] = ' | '.join(result.get('reasoning_steps', []))
+        self.writer.writerow(row)
+
+
+def open_sink(filename: str, **kwargs) -> ResultSink:
+    """
+    Ouvre un fichier de résultats selon son extension
+
+    .jsonl / .json (défaut) -> JSONLSink, .csv -> CSVSink ; suffixe .gz pour gzip
+    """
+    base = filename[:-3] if filename.endswith('.gz') else filename
+    if base.endswith('.csv'):
+        return CSVSink(filename, **kwargs)
+    return JSONLSink(filename, **kwargs)
@@ -1,6 +1,9 @@
-import pygame
 import numpy as np
-from typing import List, Tuple
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Pygame n'est importé qu'au premier affichage
+    import pygame
 
 class Robot:
     """Robot virtuel qui peut naviguer dans l'environnement"""
@@ -74,8 +77,10 @@ class Robot:
         """Vérifie si le robot a atteint la cible"""
         return self.distance_to_target(target_x, target_y) < threshold
 
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: 'pygame.Surface'):
         """Dessine le robot sur l'écran"""
+        import pygame
+
         # Corps du robot (triangle pointant vers le haut)
         points = [
             (self.x, self.y - self.size // 2),  # Haut
@@ -0,0 +1,296 @@
+"""
+Service robot longue durée (sans affichage)
+Chaque session possède son propre Environment, Robot et PathFinder ; les
+commandes sont exécutées une par une par pipeline.execute_command dans le
+thread de la session, et la progression est diffusée aux abonnés (WebSocket)
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from src.environment import Environment
+from src.evaluator import Evaluator
+from src.pathfinding import PathFinder
+from src.pipeline import execute_command, setup_environment
+from src.robot import Robot
+
+
+# Nombre de résultats de commandes conservés par session
+MAX_KEPT_RESULTS = 1000
+
+
+class SessionError(Exception):
+    """Erreur de session (inconnue, limite atteinte, file pleine)"""
+
+
+class _CommandStopped(Exception):
+    """Arrête le thread d'une commande dont la tâche a été annulée"""
+
+
+class RobotSession:
+    """Une session : un environnement et un robot pilotés par une file de commandes"""
+
+    def __init__(self, session_id: str, env_choice: str, parser,
+                 tick_rate: float = 60.0, steps_per_tick: int = 1, max_queue: int = 1000):
+        """
+        Initialise la session
+
+        Args:
+            session_id: Identifiant de la session
+            env_choice: Environnement prédéfini (simple, labyrinthe, ouvert)
+            parser: Parser partagé entre les sessions
+            tick_rate: Fréquence de simulation (pas de temps par seconde)
+            steps_per_tick: Déplacements du robot par pas de temps (vitesse)
+            max_queue: Nombre maximal de commandes en attente
+        """
+        self.session_id = session_id
+        self.env = Environment(width=800, height=600, grid_size=20)
+        self.env_name = setup_environment(self.env, env_choice)
+        self.robot = Robot(x=100, y=100, size=25)
+        self.pathfinder = PathFinder(self.env)
+        # Agrégats seulement : une session peut exécuter des commandes sans fin
+        self.evaluator = Evaluator(keep_results=False)
+        self.parser = parser
+
+        self.tick_interval = 1.0 / tick_rate if tick_rate > 0 else 0.0
+        self.steps_per_tick = max(1, steps_per_tick)
+
+        self.commands: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.results: Dict[int, Dict] = {}
+        self.waiters: Dict[int, asyncio.Future] = {}
+        self.command_ids = itertools.count()
+        self.current_command: Optional[str] = None
+        self.created_at = time.time()
+        self.task: Optional[asyncio.Task] = None
+        # Un thread par session : les commandes s'y exécutent l'une après
+        # l'autre sans occuper l'exécuteur par défaut pendant le mouvement
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"session-{session_id}")
+
+    def start(self):
+        """Démarre la tâche d'exécution des commandes"""
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Arrête la session"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+        for future in self.waiters.values():
+            if not future.done():
+                future.set_exception(SessionError("Session fermée avant la fin de la commande"))
+                future.exception()  # personne n'attend forcément ce résultat
+        self._publish({'type': 'closed'})
+
+    def submit(self, command: str) -> int:
+        """
+        Ajoute une commande à la file d'attente
+
+        Returns:
+            Identifiant de la commande
+
+        Raises:
+            SessionError: si la file d'attente est pleine
+        """
+        command_id = next(self.command_ids)
+        try:
+            self.commands.put_nowait((command_id, command))
+        except asyncio.QueueFull:
+            raise SessionError("File de commandes pleine")
+
+        self.waiters[command_id] = asyncio.get_running_loop().create_future()
+        return command_id
+
+    async def wait_result(self, command_id: int) -> Dict:
+        """
+        Attend la fin d'une commande et retourne son résultat
+
+        Raises:
+            SessionError: si la session est fermée avant la fin de la commande
+                          (ou si le résultat n'est plus conservé)
+        """
+        if command_id in self.results:
+            return self.results[command_id]
+
+        future = self.waiters.get(command_id)
+        if future is None:
+            raise SessionError(f"Résultat de la commande {command_id} non disponible")
+        # close() termine la future par une SessionError ; shield : l'annulation
+        # d'une requête (client déconnecté) ne touche pas les autres attentes
+        return await asyncio.shield(future)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Abonne un client aux événements de la session"""
+        subscriber: asyncio.Queue = asyncio.Queue(maxsize=256)
+        self.subscribers.add(subscriber)
+        subscriber.put_nowait({'type': 'state', **self.get_state()})
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        """Désabonne un client"""
+        self.subscribers.discard(subscriber)
+
+    def _publish(self, event: Dict):
+        """Envoie un événement aux abonnés (les clients trop lents perdent des positions)"""
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.put_nowait(event)
+            except asyncio.QueueFull:
+                if event['type'] != 'position':
+                    # Libérer une place pour les événements importants
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+
+    def get_state(self) -> Dict:
+        """État courant du robot et de la session"""
+        return {
+            'session_id': self.session_id,
+            'environment': self.env_name,
+            'x': self.robot.x,
+            'y': self.robot.y,
+            'waypoint': self.robot.current_path_index,
+            'waypoints': len(self.robot.path),
+            'current_command': self.current_command,
+            'pending': self.commands.qsize(),
+            'completed': self.evaluator.total_tests,
+            'success_rate': self.evaluator.get_success_rate(),
+        }
+
+    async def _run(self):
+        """Boucle de la session : exécute les commandes une par une"""
+        while True:
+            command_id, command = await self.commands.get()
+            self.current_command = command
+            self._publish({'type': 'command_started', 'command_id': command_id, 'command': command})
+
+            try:
+                result = await self._execute(command)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = {'command': command, 'success': False, 'error': f"Erreur interne: {e}"}
+
+            result['command_id'] = command_id
+            self.results[command_id] = result
+            if len(self.results) > MAX_KEPT_RESULTS:
+                # Mémoire bornée : oublier les résultats les plus anciens
+                del self.results[next(iter(self.results))]
+            self.current_command = None
+            self._publish({'type': 'command_finished', **result})
+
+            future = self.waiters.pop(command_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+            self.robot.reset()
+
+    async def _execute(self, command: str) -> Dict:
+        """
+        Exécute une commande avec pipeline.execute_command dans le thread de
+        la session (parsing, planification) ; chaque pas de temps attend
+        tick_interval et la progression est diffusée sur la boucle asyncio
+        """
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        current = {'target': 0}
+
+        def publish(event: Dict):
+            loop.call_soon_threadsafe(self._publish, event)
+
+        def on_event(event: Dict):
+            current['target'] = event['target']
+            publish(event)
+
+        def on_step(steps: int):
+            if steps % self.steps_per_tick and not self.robot.reached_target:
+                return
+            publish({
+                'type': 'position',
+                'x': self.robot.x,
+                'y': self.robot.y,
+                'target': current['target'],
+                'waypoint': self.robot.current_path_index,
+                'waypoints': len(self.robot.path),
+            })
+            # Pas de temps suivant ; interrompu dès que la tâche est annulée
+            if stop.wait(self.tick_interval):
+                raise _CommandStopped()
+
+        def run() -> Dict:
+            self.evaluator.start_test(command, self.env_name)
+            result = execute_command(command, self.env, self.robot, self.parser, self.pathfinder,
+                                     on_step=on_step, on_event=on_event)
+            self.evaluator.end_test(result['success'], self.robot)
+            return result
+
+        try:
+            return await loop.run_in_executor(self.executor, run)
+        finally:
+            stop.set()
+
+
+class SessionManager:
+    """Gère les sessions du service"""
+
+    def __init__(self, parser, max_sessions: int = 1000, **session_options):
+        """
+        Args:
+            parser: Parser partagé par toutes les sessions
+            max_sessions: Nombre maximal de sessions simultanées
+            session_options: Options par défaut des sessions (tick_rate, steps_per_tick...)
+        """
+        self.parser = parser
+        self.max_sessions = max_sessions
+        self.session_options = session_options
+        self.sessions: Dict[str, RobotSession] = {}
+
+    def create(self, env_choice: str = 'simple', **options) -> RobotSession:
+        """
+        Crée et démarre une session
+
+        Raises:
+            SessionError: si la limite de sessions est atteinte
+            ValueError: si l'environnement est inconnu
+        """
+        if len(self.sessions) >= self.max_sessions:
+            raise SessionError("Nombre maximal de sessions atteint")
+
+        session_id = uuid.uuid4().hex[:12]
+        session = RobotSession(session_id, env_choice, self.parser,
+                               **{**self.session_options, **options})
+        session.start()
+        self.sessions[session_id] = session
+        return session
+
+    def get(self, session_id: str) -> RobotSession:
+        """
+        Raises:
+            SessionError: si la session n'existe pas
+        """
+        if session_id not in self.sessions:
+            raise SessionError(f"Session inconnue: {session_id}")
+        return self.sessions[session_id]
+
+    async def delete(self, session_id: str):
+        """Ferme et supprime une session"""
+        session = self.get(session_id)
+        del self.sessions[session_id]
+        await session.close()
+
+    async def close_all(self):
+        """Ferme toutes les sessions"""
+        for session_id in list(self.sessions):
+            await self.delete(session_id)
+
+    def list_states(self) -> List[Dict]:
+        """États de toutes les sessions"""
+        return [session.get_state() for session in self.sessions.values()]
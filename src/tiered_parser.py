@@ -0,0 +1,262 @@
+"""
+Parser hiérarchisé : parser local d'abord, LLM seulement si nécessaire
+Les commandes simples sont traitées localement en quelques microsecondes,
+les commandes ambiguës ou multi-cibles sont transmises au LLM
+"""
+
+import math
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.nlp_parser import NLPParser
+
+
+class LatencyHistogram:
+    """Histogramme de latences à seaux logarithmiques (en millisecondes)"""
+
+    BUCKETS_MS = [0.01, 0.1, 1, 10, 100, 500, 1000, 2000, 5000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Mesures enregistrées depuis plusieurs threads (service)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        """Ajoute une mesure de latence"""
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if latency_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+
+    def mean(self) -> float:
+        """Latence moyenne en millisecondes"""
+        if self.count == 0:
+            return 0.0
+        return self.total_ms / self.count
+
+    def percentile(self, p: float) -> float:
+        """
+        Percentile p (0 à 100) en millisecondes : borne supérieure du seau qui
+        le contient, limitée à la latence maximale (jamais sous la vraie valeur)
+        """
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            max_ms = self.max_ms
+
+        if count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(p / 100 * count))
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else max_ms
+                return min(bound, max_ms)
+        return max_ms
+
+    def format(self) -> str:
+        """Représentation textuelle de l'histogramme"""
+        lines = []
+        lower = 0.0
+        for i, count in enumerate(self.counts):
+            if count == 0:
+                lower = self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else lower
+                continue
+
+            if i < len(self.BUCKETS_MS):
+                label = f"{lower:g}-{self.BUCKETS_MS[i]:g} ms"
+                lower = self.BUCKETS_MS[i]
+            else:
+                label = f"> {self.BUCKETS_MS[-1]:g} ms"
+
+            bar = '#' * max(1, int(40 * count / self.count))
+            lines.append(f"    {label:>16} | {bar} {count}")
+
+        return '\n'.join(lines)
+
+
+class TieredParser:
+    """Parser en deux niveaux : NLPParser local puis LLMParser si la confiance est faible"""
+
+    TIERS = ('local', 'llm', 'fallback')
+
+    def __init__(self, llm_parser=None, confidence_threshold: float = 0.7,
+                 escalation_keywords: Optional[List[str]] = None):
+        """
+        Initialise le parser hiérarchisé
+
+        Args:
+            llm_parser: Parser LLM utilisé pour l'escalade (None = local uniquement)
+            confidence_threshold: Confiance minimale pour accepter le résultat local
+            escalation_keywords: Connecteurs indiquant une commande multi-cibles
+        """
+        self.local_parser = NLPParser()
+        self.llm_parser = llm_parser
+        self.confidence_threshold = confidence_threshold
+
+        if escalation_keywords is None:
+            escalation_keywords = [
+                'puis', 'en passant par', 'passe par', 'ensuite', 'avant',
+                'après', 'apres', "d'abord", 'finis', 'then', 'via', 'after', 'before',
+            ]
+
+        self.escalation_pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in escalation_keywords) + r')\b'
+        )
+        self.color_pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in self.local_parser.color_keywords) + r')\b'
+        )
+
+        # Statistiques par niveau
+        self.latencies = {tier: LatencyHistogram() for tier in self.TIERS}
+
+    def needs_escalation(self, command: str, local_result: Dict) -> bool:
+        """Détermine si une commande doit être transmise au LLM"""
+        if local_result['confidence'] < self.confidence_threshold:
+            return True
+
+        lowered = command.lower()
+
+        # Connecteurs de séquence ("puis", "en passant par"...)
+        if self.escalation_pattern.search(lowered):
+            return True
+
+        # Plusieurs couleurs mentionnées : commande multi-cibles
+        colors = {self.local_parser.color_keywords[m] for m in self.color_pattern.findall(lowered)}
+        return len(colors) > 1
+
+    def parse_command(self, command: str) -> Dict:
+        """
+        Parse une commande avec le niveau le moins coûteux suffisant
+
+        Args:
+            command: Commande en langage naturel
+
+        Returns:
+            Dict au format LLM (targets, confidence, interpretation) avec 'tier'
+        """
+        start = time.perf_counter()
+        result = self._parse_local(command, start)
+        if result is None:
+            result = self.llm_parser.parse_command(command)
+            self._record_llm(result, (time.perf_counter() - start) * 1000)
+
+        return result
+
+    def parse_commands(self, commands: List[str], **batch_options) -> List[Dict]:
+        """
+        Parse plusieurs commandes : niveau local pour chacune, puis un appel
+        groupé au LLM (LLMParser.parse_commands) pour celles à escalader
+
+        Args:
+            commands: Liste de commandes en langage naturel
+            batch_options: token_budget, max_batch_size de LLMParser.parse_commands
+
+        Returns:
+            Liste de Dict (même ordre que commands), au format de parse_command
+        """
+        results: List[Optional[Dict]] = []
+        escalated = []
+        for index, command in enumerate(commands):
+            result = self._parse_local(command, time.perf_counter())
+            if result is None:
+                escalated.append(index)
+            results.append(result)
+
+        if escalated:
+            start = time.perf_counter()
+            llm_results = self.llm_parser.parse_commands([commands[i] for i in escalated], **batch_options)
+            # Latence d'une commande escaladée : sa part de l'appel groupé
+            share_ms = (time.perf_counter() - start) * 1000 / len(escalated)
+            for index, result in zip(escalated, llm_results):
+                self._record_llm(result, share_ms)
+                results[index] = result
+
+        return results
+
+    def _parse_local(self, command: str, start: float) -> Optional[Dict]:
+        """Résultat du niveau local, ou None si la commande doit être escaladée"""
+        local_result = self.local_parser.parse_command(command)
+        if self.llm_parser is not None and self.needs_escalation(command, local_result):
+            return None
+
+        result = self._local_to_targets(command, local_result)
+        result['tier'] = 'local'
+        self.latencies['local'].record((time.perf_counter() - start) * 1000)
+        return result
+
+    def _record_llm(self, result: Dict, latency_ms: float):
+        """Marque le niveau d'un résultat du LLM et enregistre sa latence"""
+        tier = 'fallback' if result.get('fallback') else 'llm'
+        result['tier'] = tier
+        self.latencies[tier].record(latency_ms)
+
+    def _local_to_targets(self, command: str, local_result: Dict) -> Dict:
+        """Convertit le résultat du parser local au format LLM"""
+        targets = []
+        if local_result['color'] or local_result['shape']:
+            targets.append({
+                'color': local_result['color'],
+                'shape': local_result['shape'],
+                'type': 'target'
+            })
+
+        return {
+            'targets': targets,
+            'confidence': local_result['confidence'],
+            'interpretation': command,
+            'raw_command': command,
+        }
+
+    def get_alternative_commands(self) -> list:
+        """Retourne des exemples de commandes valides"""
+        return self.local_parser.get_alternative_commands()
+
+    def explain_parsing(self, command: str, parsed: Optional[Dict] = None) -> str:
+        """Explique comment une commande a été parsée et par quel niveau"""
+        if parsed is None:
+            parsed = self.parse_command(command)
+
+        explanation = f"\n📝 Analyse de la commande: '{command}'\n"
+        explanation += f"  - Niveau: {parsed.get('tier', 'N/A')}\n"
+        explanation += f"  - Interprétation: {parsed.get('interpretation', 'N/A')}\n"
+        explanation += f"  - Confiance: {parsed.get('confidence', 0)*100:.0f}%\n"
+        explanation += f"  - Nombre de cibles: {len(parsed.get('targets', []))}\n"
+
+        for i, target in enumerate(parsed.get('targets', []), 1):
+            target_type = target.get('type', 'target')
+            color = target.get('color', 'N/A')
+            shape = target.get('shape', 'N/A')
+            explanation += f"    {i}. [{target_type}] {color} {shape}\n"
+
+        return explanation
+
+    def print_latency_report(self):
+        """Affiche les histogrammes de latence par niveau"""
+        print("\n" + "-"*60)
+        print("LATENCE DU PARSING PAR NIVEAU")
+        print("-"*60)
+
+        for tier in self.TIERS:
+            histogram = self.latencies[tier]
+            if histogram.count == 0:
+                continue
+
+            print(f"\n  {tier}: {histogram.count} commande(s), "
+                  f"moyenne {histogram.mean():.3f} ms, p50 <= {histogram.percentile(50):g} ms, "
+                  f"p95 <= {histogram.percentile(95):g} ms, max {histogram.max_ms:.3f} ms")
+            print(histogram.format())
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 """
 Test du parser LLM avec Gemini
+
+Usage:
+    python3 test_llm.py                  # Appels réels à Gemini
+    python3 test_llm.py --replay         # Réponses enregistrées, sans réseau
+    python3 test_llm.py --replay FICHIER # Autre fichier de réponses (JSONL)
 """
 
 import os
+import sys
 from src.llm_parser import LLMParser
+from src.llm_backends import ReplayBackend
+
+DEFAULT_REPLAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   'tests', 'fixtures', 'llm_responses.jsonl')
 
 
 def main():
@@ -12,10 +22,18 @@ def main():
     print("TEST DU PARSER LLM (GEMINI)")
     print("="*60)
 
+    # Mode rejeu : réponses enregistrées, aucun accès réseau
+    backend = None
+    if '--replay' in sys.argv:
+        index = sys.argv.index('--replay')
+        replay_file = sys.argv[index + 1] if index + 1 < len(sys.argv) else DEFAULT_REPLAY_FILE
+        backend = ReplayBackend.from_file(replay_file)
+        print(f"\n🔁 Mode rejeu: {replay_file}")
+
     # Vérifier la clé API
     api_key = os.getenv('GEMINI_API_KEY')
 
-    if not api_key:
+    if backend is None and not api_key:
         print("\n❌ Clé API Gemini non trouvée !")
         print("\nPour configurer:")
         print("1. Obtenir une clé API sur: https://makersuite.google.com/app/apikey")
@@ -26,11 +44,12 @@ def main():
         print("   # Éditer .env et ajouter votre clé")
         return
 
-    print(f"\n✅ Clé API trouvée: {api_key[:10]}...")
+    if backend is None:
+        print(f"\n✅ Clé API trouvée: {api_key[:10]}...")
 
     # Initialiser le parser
     try:
-        parser = LLMParser(api_key=api_key)
+        parser = LLMParser(api_key=api_key, backend=backend)
         print("✅ Parser LLM initialisé\n")
     except Exception as e:
         print(f"❌ Erreur: {e}")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Exécution parallèle des scénarios de test
+Chaque commande de SCENARIOS est une unité de travail indépendante (le robot
+repart de sa position de départ) ; les unités sont réparties sur un pool de
+processus, chacun avec ses propres environnements sans affichage. Les
+résultats sont fusionnés dans l'ordre (scénario, commande), quel que soit
+l'ordre de fin des processus.
+
+Usage:
+    python3 tests/run_parallel.py                     # tous les cœurs
+    python3 tests/run_parallel.py --workers 4
+    python3 tests/run_parallel.py --shard 0/2 --output shard0.jsonl
+    python3 tests/run_parallel.py --shard 1/2 --output shard1.jsonl
+    python3 tests/run_parallel.py --merge shard0.jsonl shard1.jsonl
+    python3 tests/run_parallel.py --profile sample    # profils par commande
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+# Mode headless avant tout import de pygame (également hérité par les processus)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.environment import Environment
+from src.evaluator import Evaluator
+from src.nlp_parser import NLPParser
+from src.pathfinding import PathFinder
+from src.profiling import (PROFILE_DIR_ENV, PROFILE_ENV, aggregate_profiles,
+                           default_output_dir, maybe_profile, parse_modes, profiler_from_env)
+from src.robot import Robot
+from tests.test_scenarios import SCENARIOS, print_global_summary, run_command, scenario_snapshot
+
+
+# Unité de travail : (indice du scénario, indice de la commande)
+Unit = Tuple[int, int]
+
+# Composants construits une seule fois par processus et par scénario
+_worker_components: Dict[int, tuple] = {}
+
+# Profileur du processus (ROBOT_PROFILE), créé à la première unité
+_worker_profiler = None
+_worker_profiler_ready = False
+
+
+def build_units() -> List[Unit]:
+    """Liste ordonnée de toutes les unités de travail"""
+    return [(scenario_index, command_index)
+            for scenario_index, (_, _, commands) in enumerate(SCENARIOS)
+            for command_index in range(len(commands))]
+
+
+def select_shard(units: List[Unit], shard_index: int, shard_count: int) -> List[Unit]:
+    """Unités du shard shard_index sur shard_count (répartition entrelacée)"""
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard invalide: {shard_index}/{shard_count}")
+    return units[shard_index::shard_count]
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Lit un shard au format 'i/n'"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format attendu i/n, reçu: {value}")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard invalide: {value}")
+    return index, count
+
+
+def _components(scenario_index: int) -> tuple:
+    """Environnement, robot, parser et pathfinder du scénario (cache du processus)"""
+    if scenario_index not in _worker_components:
+        _, setup_method, _ = SCENARIOS[scenario_index]
+        env = Environment.from_snapshot(scenario_snapshot(setup_method))
+        _worker_components[scenario_index] = (
+            env, Robot(x=100, y=100, size=25), NLPParser(), PathFinder(env)
+        )
+    return _worker_components[scenario_index]
+
+
+def run_unit(unit: Unit) -> Tuple[Unit, Dict, str]:
+    """
+    Exécute une unité de travail
+
+    Returns:
+        (unité, résultat de l'Evaluator, sortie console capturée)
+    """
+    scenario_index, command_index = unit
+    env_name, setup_method, commands = SCENARIOS[scenario_index]
+    command = commands[command_index]
+    env, robot, parser, pathfinder = _components(scenario_index)
+    env.restore(scenario_snapshot(setup_method))
+
+    global _worker_profiler, _worker_profiler_ready
+    if not _worker_profiler_ready:
+        _worker_profiler = profiler_from_env()
+        _worker_profiler_ready = True
+
+    evaluator = Evaluator()
+    pathfinder.evaluator = evaluator
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print(f"\n[{env_name} {command_index + 1}/{len(commands)}] Commande: '{command}'")
+        with maybe_profile(_worker_profiler, command):
+            run_command(command, env_name, env, robot, parser, pathfinder, evaluator)
+
+    return unit, evaluator.last_result, output.getvalue()
+
+
+def run_units(units: List[Unit], workers: int) -> List[Tuple[Unit, Dict, str]]:
+    """Exécute les unités sur un pool de processus (ou en direct si workers=1)"""
+    if workers <= 1:
+        return [run_unit(unit) for unit in units]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_unit, units, chunksize=1))
+
+
+def merge_results(records: List[Tuple[Unit, Dict]]) -> List[Evaluator]:
+    """
+    Fusionne des résultats en un Evaluator par scénario
+
+    L'ordre est celui de SCENARIOS, indépendamment de l'ordre d'arrivée.
+    """
+    evaluators = [Evaluator() for _ in SCENARIOS]
+    for (scenario_index, _), result in sorted(records, key=lambda record: record[0]):
+        evaluators[scenario_index].add_result(result)
+    return [evaluator for evaluator in evaluators if evaluator.total_tests]
+
+
+def _json_default(value):
+    """Convertit les scalaires numpy (ex: bool de has_reached_target)"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
+def save_records(records: List[Tuple[Unit, Dict]], filename: str):
+    """Enregistre les résultats d'un shard (JSONL)"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for (scenario_index, command_index), result in records:
+            f.write(json.dumps({'scenario': scenario_index, 'command_index': command_index,
+                                'result': result}, ensure_ascii=False,
+                               default=_json_default) + '\n')
+
+
+def load_records(filenames: List[str]) -> List[Tuple[Unit, Dict]]:
+    """Charge les résultats de plusieurs shards"""
+    records = []
+    for filename in filenames:
+        with open(filename, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records.append(((record['scenario'], record['command_index']),
+                                    record['result']))
+    return records
+
+
+def report(evaluators: List[Evaluator], export: bool, suffix: str = ''):
+    """Affiche les résumés et exporte les résultats"""
+    for evaluator in evaluators:
+        evaluator.print_summary()
+    print_global_summary(evaluators)
+
+    if export:
+        print("\nExportation des resultats...")
+        for i, evaluator in enumerate(evaluators, 1):
+            evaluator.export_results(f"test_results_{i}{suffix}.txt")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Exécution parallèle des scénarios de test")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Nombre de processus (défaut: nombre de cœurs)")
+    parser.add_argument('--shard', type=parse_shard, default=(0, 1), metavar='I/N',
+                        help="N'exécuter que le shard I sur N (ex: 0/4)")
+    parser.add_argument('--output', help="Enregistrer les résultats du shard (JSONL)")
+    parser.add_argument('--merge', nargs='+', metavar='FICHIER',
+                        help="Fusionner des résultats de shards au lieu d'exécuter")
+    parser.add_argument('--export', action='store_true',
+                        help="Exporter les résultats (test_results_*.txt)")
+    parser.add_argument('--profile', nargs='?', const='all', metavar='MODES',
+                        help="Profiler chaque commande : cprofile, sample ou all")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.merge:
+        records = load_records(args.merge)
+        evaluators = merge_results(records)
+        report(evaluators, args.export)
+        return 0 if all(r['success'] for _, r in records) else 1
+
+    shard_index, shard_count = args.shard
+    units = select_shard(build_units(), shard_index, shard_count)
+
+    # Les processus héritent de l'environnement : même répertoire de profils pour tous
+    if args.profile is not None:
+        os.environ[PROFILE_ENV] = args.profile
+    profiling = bool(parse_modes(os.getenv(PROFILE_ENV)))
+    if profiling:
+        os.environ.setdefault(PROFILE_DIR_ENV, default_output_dir())
+
+    print("="*60)
+    print("TESTS AUTOMATIQUES PARALLELES - ROBOT VIRTUEL")
+    print("="*60)
+    print(f"Unites: {len(units)} | Processus: {args.workers} | Shard: {shard_index}/{shard_count}")
+
+    start = time.perf_counter()
+    outcomes = run_units(units, args.workers)
+    elapsed = time.perf_counter() - start
+
+    # Sortie des processus, dans l'ordre des unités
+    for _, _, output in sorted(outcomes, key=lambda outcome: outcome[0]):
+        print(output, end='')
+
+    records = [(unit, result) for unit, result, _ in outcomes]
+    if args.output:
+        save_records(records, args.output)
+        print(f"\nResultats du shard enregistres dans '{args.output}'")
+
+    if profiling:
+        written = aggregate_profiles(os.environ[PROFILE_DIR_ENV])
+        print(f"\nProfils ecrits dans '{os.environ[PROFILE_DIR_ENV]}' "
+              f"(agregats: {', '.join(os.path.basename(f) for f in written)})")
+
+    suffix = f"_shard{shard_index}" if shard_count > 1 else ''
+    report(merge_results(records), args.export, suffix)
+    print(f"\nDuree totale: {elapsed:.2f}s")
+
+    return 0 if all(result['success'] for _, result in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
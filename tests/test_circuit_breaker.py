@@ -0,0 +1,224 @@
+"""
+Tests du disjoncteur (src/circuit_breaker.py) avec une horloge simulée
+Transitions fermé → ouvert → demi-ouvert → fermé, bornes du backoff et
+appel d'essai unique quand le disjoncteur est partagé entre threads.
+
+Usage:
+    python -m pytest -q tests/test_circuit_breaker.py
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import circuit_breaker
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Horloge et attente simulées : sleep avance l'horloge"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def failing():
+    raise ConnectionError("réseau indisponible")
+
+
+def make_breaker(clock: FakeClock, **options) -> CircuitBreaker:
+    options = {'failure_threshold': 3, 'cooldown': 10.0, 'max_cooldown': 40.0,
+               'max_retries': 0, **options}
+    return CircuitBreaker(clock=clock, sleep=clock.sleep, **options)
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+
+def test_opens_after_threshold():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 1
+    assert breaker.error_counts == {'ConnectionError': 3}
+
+
+def test_success_resets_failure_count():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 1
+
+
+def test_open_short_circuits_until_cooldown():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+
+    calls = []
+    clock.now += 9.9
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 'appel')
+    assert calls == []
+    assert breaker.short_circuited == 1
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 0.1
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_success_closes():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+
+    clock.now += 10.0
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.cooldown == 10.0
+
+
+def test_half_open_failure_doubles_cooldown_up_to_max():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+
+    for expected in (20.0, 40.0, 40.0):
+        clock.now += breaker.cooldown
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.cooldown == expected
+        assert breaker.opened_at == clock.now
+
+    # Une réussite après refroidissement rétablit la durée initiale
+    clock.now += breaker.cooldown
+    breaker.call(lambda: 'ok')
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.cooldown == 10.0
+
+
+def test_retries_sleep_within_backoff_bounds():
+    clock = FakeClock()
+    breaker = make_breaker(clock, failure_threshold=10, max_retries=3,
+                           base_delay=0.5, max_delay=1.5)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+
+    # Pas d'attente après le dernier essai
+    assert len(clock.sleeps) == 3
+    for attempt, delay in enumerate(clock.sleeps):
+        assert 0 <= delay <= min(1.5, 0.5 * 2 ** attempt)
+    assert breaker.total_failures == 4
+
+
+def test_backoff_upper_bound(monkeypatch):
+    monkeypatch.setattr(circuit_breaker.random, 'uniform', lambda low, high: high)
+    breaker = CircuitBreaker(base_delay=0.5, max_delay=3.0)
+
+    assert [breaker.backoff_delay(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_no_retry_once_circuit_opens():
+    clock = FakeClock()
+    breaker = make_breaker(clock, failure_threshold=2, max_retries=5)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+
+    # Le deuxième échec ouvre le circuit : plus de réessai
+    assert breaker.total_failures == 2
+    assert len(clock.sleeps) == 1
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_allows_a_single_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+
+    clock.now += 10.0
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'ok')
+
+    # Essai sans réponse depuis une durée de refroidissement : nouvel essai permis
+    clock.now += 10.0
+    assert breaker.allow_request()
+
+
+def test_concurrent_callers_share_one_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    open_breaker(breaker)
+    clock.now += 10.0
+
+    started = threading.Event()
+    release = threading.Event()
+    probes = []
+
+    def probe():
+        probes.append(threading.current_thread().name)
+        started.set()
+        release.wait(5)
+        return 'ok'
+
+    results = []
+
+    def caller():
+        try:
+            results.append(breaker.call(probe))
+        except CircuitOpenError:
+            results.append('court-circuit')
+
+    first = threading.Thread(target=caller)
+    first.start()
+    assert started.wait(5)
+
+    others = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in others:
+        thread.start()
+    for thread in others:
+        thread.join(5)
+    release.set()
+    first.join(5)
+
+    assert len(probes) == 1
+    assert sorted(results) == ['court-circuit'] * 8 + ['ok']
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.short_circuited == 8
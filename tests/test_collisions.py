@@ -0,0 +1,127 @@
+"""
+Tests de cohérence des tests de collision : Environment.are_positions_valid,
+ObstacleStore.collide_points et PathFinder.is_line_clear donnent les mêmes
+réponses que Environment.is_position_valid, de part et d'autre de
+SMALL_OBSTACLE_COUNT (liste Python en dessous, NumPy au-dessus), sur des
+points aléatoires et sur les bords exacts des obstacles.
+
+Usage:
+    python -m pytest -q tests/test_collisions.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src import entity_store
+from src.environment import POSITION_MARGIN, SMALL_OBSTACLE_COUNT, Environment
+from src.map_generator import MAP_TYPES, MapGenerator
+from src.pathfinding import PathFinder
+
+
+COUNTS = [0, 1, SMALL_OBSTACLE_COUNT - 1, SMALL_OBSTACLE_COUNT, SMALL_OBSTACLE_COUNT + 1, 300]
+MARGINS = [0, 7, POSITION_MARGIN]
+
+
+def random_environment(count: int, seed: int) -> Environment:
+    rng = np.random.default_rng(seed)
+    env = Environment(width=800, height=600, grid_size=20)
+    for _ in range(count):
+        width, height = rng.integers(5, 120, size=2)
+        env.add_obstacle(int(rng.integers(-40, 800)), int(rng.integers(-40, 600)), int(width), int(height))
+    return env
+
+
+def sample_points(env: Environment, seed: int, count: int = 2000) -> np.ndarray:
+    """Points aléatoires (dont hors carte) et points sur les bords des obstacles ± 1"""
+    rng = np.random.default_rng(seed)
+    points = [np.column_stack([rng.integers(-30, env.width + 30, count),
+                               rng.integers(-30, env.height + 30, count)])]
+    for x, y, width, height in env.obstacles.rows().tolist()[:100]:
+        for margin in MARGINS:
+            for px in (x - margin - 1, x - margin, x + width + margin, x + width + margin + 1):
+                for py in (y - margin - 1, y - margin, y + height + margin, y + height + margin + 1):
+                    points.append([[px, py]])
+    return np.concatenate(points).astype(np.int64)
+
+
+def expected_valid(env: Environment, points, margin: int) -> np.ndarray:
+    return np.array([env.is_position_valid(x, y, margin) for x, y in points.tolist()], dtype=bool)
+
+
+@pytest.mark.parametrize('margin', MARGINS)
+@pytest.mark.parametrize('count', COUNTS)
+def test_are_positions_valid_matches_scalar(count, margin):
+    env = random_environment(count, seed=count)
+    points = sample_points(env, seed=count + 1)
+
+    valid = env.are_positions_valid(points, margin)
+    np.testing.assert_array_equal(valid, expected_valid(env, points, margin))
+    assert valid.any() and (count == 0 or not valid.all())
+
+
+@pytest.mark.parametrize('margin', MARGINS)
+@pytest.mark.parametrize('count', COUNTS)
+def test_collide_points_matches_views(count, margin):
+    env = random_environment(count, seed=count)
+    points = sample_points(env, seed=count + 2, count=500)
+
+    expected = np.array([any(obstacle.collides_with_point(x, y, margin) for obstacle in env.obstacles)
+                         for x, y in points.tolist()], dtype=bool)
+    np.testing.assert_array_equal(env.obstacles.collide_points(points, margin), expected)
+
+
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_generated_maps(map_type):
+    env = MapGenerator(5).generate(map_type, width=1500, height=1000, num_objects=5)
+    points = sample_points(env, seed=6)
+    np.testing.assert_array_equal(env.are_positions_valid(points), expected_valid(env, points, POSITION_MARGIN))
+
+
+def test_float_points():
+    env = random_environment(SMALL_OBSTACLE_COUNT + 10, seed=3)
+    points = np.random.default_rng(4).uniform(-10, 810, (3000, 2))
+    points[:, 1] *= 0.75
+    expected = np.array([env.is_position_valid(x, y) for x, y in points.tolist()], dtype=bool)
+    np.testing.assert_array_equal(env.are_positions_valid(points), expected)
+
+
+def test_points_processed_in_chunks(monkeypatch):
+    # Petites tranches : plusieurs passes sur les points, même résultat
+    env = random_environment(SMALL_OBSTACLE_COUNT * 2, seed=8)
+    points = sample_points(env, seed=9)
+    expected = env.are_positions_valid(points)
+    monkeypatch.setattr(entity_store, '_CHUNK_ELEMENTS', 1000)
+    np.testing.assert_array_equal(env.are_positions_valid(points), expected)
+
+
+@pytest.mark.parametrize('count', [SMALL_OBSTACLE_COUNT - 1, SMALL_OBSTACLE_COUNT])
+def test_threshold_changes_after_add(count):
+    # Passage du seuil par add_obstacle puis par une vue : bornes en cache recalculées
+    env = random_environment(count, seed=11)
+    points = sample_points(env, seed=12, count=500)
+    env.is_position_valid(400, 300)
+
+    env.add_obstacle(300, 200, 200, 200)
+    env.obstacles[0].x = 380
+    np.testing.assert_array_equal(env.are_positions_valid(points), expected_valid(env, points, POSITION_MARGIN))
+    assert not env.is_position_valid(400, 300)
+
+
+@pytest.mark.parametrize('count', COUNTS)
+def test_is_line_clear_matches_scalar(count):
+    env = random_environment(count, seed=count + 20)
+    pathfinder = PathFinder(env)
+    rng = np.random.default_rng(count)
+
+    for _ in range(200):
+        (x0, y0), (x1, y1) = rng.integers(0, 600, size=(2, 2)).tolist()
+        num_checks = int(rng.integers(1, 40))
+        samples = [(int(x0 + i / num_checks * (x1 - x0)), int(y0 + i / num_checks * (y1 - y0)))
+                   for i in range(num_checks + 1)]
+        expected = all(env.is_position_valid(x, y, pathfinder.margin) for x, y in samples)
+        assert pathfinder.is_line_clear((x0, y0), (x1, y1), num_checks) == expected
@@ -0,0 +1,108 @@
+"""
+Tests du lecteur de commandes en arrière-plan (src/command_reader.py)
+L'entrée standard est simulée par une file de lignes (None = fin de fichier).
+
+Usage:
+    python -m pytest -q tests/test_command_reader.py
+"""
+
+import builtins
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.command_reader import CommandReader
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    """Lignes à lire par input() ; None simule la fin de l'entrée standard"""
+    lines = queue.Queue()
+
+    def fake_input(prompt=''):
+        line = lines.get(timeout=5)
+        if line is None:
+            raise EOFError
+        return line
+
+    monkeypatch.setattr(builtins, 'input', fake_input)
+    yield lines
+    # Fin de l'entrée : le thread de lecture encore en attente se termine
+    lines.put(None)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "délai dépassé"
+        time.sleep(0.001)
+
+
+def ask_then_type(reader: CommandReader, stdin, line, **options) -> str:
+    """Pose la question, puis tape line une fois la question affichée"""
+    answer = []
+    thread = threading.Thread(target=lambda: answer.append(reader.ask("Exporter ? ", **options)))
+    thread.start()
+    wait_for(reader._asking.is_set)
+    stdin.put(line)
+    thread.join(5)
+    return answer[0]
+
+
+def test_commands_are_queued(stdin):
+    reader = CommandReader()
+    reader.start()
+    stdin.put('va vers le rouge')
+    wait_for(lambda: reader.pending() == 1)
+    assert reader.get_command() == 'va vers le rouge'
+    assert reader.get_command() is None
+
+
+def test_ask_ignores_commands_typed_ahead(stdin):
+    reader = CommandReader()
+    reader.start()
+    stdin.put('va vers le rouge')
+    stdin.put('va vers le bleu')
+    wait_for(lambda: reader.pending() == 2)
+
+    assert ask_then_type(reader, stdin, 'o') == 'o'
+    assert reader.pending() == 0
+
+    # Après la question, les lignes redeviennent des commandes
+    stdin.put('reset')
+    wait_for(lambda: reader.pending() == 1)
+    assert reader.get_command() == 'reset'
+
+
+def test_ask_after_eof_returns_default(stdin):
+    reader = CommandReader()
+    reader.start()
+    stdin.put(None)
+    wait_for(lambda: not reader.thread.is_alive())
+
+    assert reader.get_command() == 'quit'
+    assert reader.ask("Exporter ? ", default='n') == 'n'
+
+
+def test_ask_eof_while_waiting_returns_default(stdin):
+    reader = CommandReader()
+    reader.start()
+    assert ask_then_type(reader, stdin, None, default='n') == 'n'
+
+
+def test_ask_after_quit_reads_stdin(stdin):
+    reader = CommandReader()
+    reader.start()
+    stdin.put('quit')
+    wait_for(lambda: not reader.thread.is_alive())
+
+    stdin.put('o')
+    assert reader.ask("Exporter ? ") == 'o'
+    stdin.put(None)
+    assert reader.ask("Exporter ? ", default='n') == 'n'
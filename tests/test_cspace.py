@@ -0,0 +1,137 @@
+"""
+Tests de l'espace des configurations (Environment.cspace_grid) : chaque
+cellule est interdite exactement quand is_position_valid refuse son centre
+pour le rayon du robot, les grilles sont recalculées après un ajout ou une
+modification d'obstacle, et PathFinder(robot_radius=...) teste les segments
+avec la même règle que sa grille.
+
+Usage:
+    python -m pytest -q tests/test_cspace.py
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.environment import SMALL_OBSTACLE_COUNT, Environment
+from src.map_generator import MAP_TYPES, MapGenerator
+from src.pathfinding import PathFinder
+
+
+RADII = [5, 12.5, 15, 17.3, 30]
+
+
+def cell_centers(env: Environment) -> np.ndarray:
+    """Centres (x, y) de toutes les cellules, ligne par ligne"""
+    g = env.grid_size
+    gy, gx = np.mgrid[:env.grid_height, :env.grid_width]
+    return np.column_stack([gx.ravel() * g + g // 2, gy.ravel() * g + g // 2])
+
+
+def expected_blocked(env: Environment, radius: float) -> np.ndarray:
+    """Cellules dont le centre est refusé par is_position_valid pour ce rayon"""
+    blocked = [not env.is_position_valid(x, y, radius=radius) for x, y in cell_centers(env).tolist()]
+    return np.array(blocked).reshape(env.grid_height, env.grid_width)
+
+
+def random_environment(count: int, seed: int) -> Environment:
+    rng = np.random.default_rng(seed)
+    env = Environment(width=600, height=400, grid_size=20)
+    for _ in range(count):
+        width, height = rng.integers(5, 90, size=2)
+        env.add_obstacle(int(rng.integers(-30, 600)), int(rng.integers(-30, 400)), int(width), int(height))
+    return env
+
+
+@pytest.mark.parametrize('radius', RADII)
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_cells_match_is_position_valid(map_type, radius):
+    env = MapGenerator(7).generate(map_type, width=1000, height=700, num_objects=4)
+    cspace = env.cspace_grid(radius)
+    np.testing.assert_array_equal(cspace, expected_blocked(env, radius))
+
+    # Version vectorisée : même réponse
+    valid = env.are_positions_valid(cell_centers(env), radius=radius)
+    np.testing.assert_array_equal(~valid.reshape(cspace.shape), cspace)
+
+
+@pytest.mark.parametrize('radius', RADII)
+@pytest.mark.parametrize('count', [3, SMALL_OBSTACLE_COUNT - 1, SMALL_OBSTACLE_COUNT + 1])
+def test_cells_match_on_both_sides_of_threshold(count, radius):
+    env = random_environment(count, seed=count)
+    np.testing.assert_array_equal(env.cspace_grid(radius), expected_blocked(env, radius))
+
+
+@pytest.mark.parametrize('radius', RADII)
+def test_disc_contained_in_rectangular_margin(radius):
+    # Disque de rayon r dans le carré de demi-côté ceil(r) : une cellule
+    # interdite pour le robot l'est aussi avec la marge rectangulaire
+    env = random_environment(20, seed=1)
+    cspace = env.cspace_grid(radius)
+    margin = math.ceil(radius)
+    for (x, y), blocked in zip(cell_centers(env).tolist(), cspace.ravel().tolist()):
+        if blocked:
+            assert not env.is_position_valid(x, y, margin)
+
+
+def test_corner_allowed_for_disc_only():
+    env = Environment(width=400, height=400, grid_size=20)
+    env.add_obstacle(100, 100, 50, 50)
+
+    # (158, 158) : à 11,3 px du coin, dans le carré de marge 10
+    assert env.is_position_valid(158, 158, radius=10)
+    assert not env.is_position_valid(158, 158, 10)
+    assert not env.is_position_valid(157, 157, radius=10)
+
+    # Segment le long de la diagonale : accepté avec la règle de la grille
+    pathfinder = PathFinder(env, robot_radius=10)
+    assert pathfinder.is_line_clear((158, 158), (300, 300))
+    assert not pathfinder.is_line_clear((157, 157), (300, 300))
+
+
+@pytest.mark.parametrize('count', [5, SMALL_OBSTACLE_COUNT + 5])
+def test_is_line_clear_uses_robot_radius(count):
+    env = random_environment(count, seed=count + 1)
+    pathfinder = PathFinder(env, robot_radius=12.5)
+    rng = np.random.default_rng(count)
+
+    for _ in range(200):
+        (x0, y0), (x1, y1) = rng.integers(0, 400, size=(2, 2)).tolist()
+        samples = [(int(x0 + i / 10 * (x1 - x0)), int(y0 + i / 10 * (y1 - y0))) for i in range(11)]
+        expected = all(env.is_position_valid(x, y, radius=12.5) for x, y in samples)
+        assert pathfinder.is_line_clear((x0, y0), (x1, y1)) == expected
+
+
+def test_cspace_rebuilt_after_add_obstacle():
+    env = random_environment(10, seed=4)
+    pathfinder = PathFinder(env, robot_radius=12.5)
+    cspace = env.cspace_grid(12.5)
+    distance = env.distance_field()
+    assert env.cspace_grid(12.5) is cspace and pathfinder.blocked_grid() is cspace
+    assert not cspace[10, 15]
+
+    env.add_obstacle(290, 190, 20, 20)
+    rebuilt = env.cspace_grid(12.5)
+    assert rebuilt is not cspace and env.distance_field() is not distance
+    assert rebuilt[10, 15] and not cspace[10, 15]
+    np.testing.assert_array_equal(rebuilt, expected_blocked(env, 12.5))
+    assert pathfinder.blocked_grid() is rebuilt
+
+    # Modification par la vue de l'obstacle : même effet
+    env.obstacles[len(env.obstacles) - 1].x = 500
+    moved = env.cspace_grid(12.5)
+    assert moved is not rebuilt and not moved[10, 15]
+    np.testing.assert_array_equal(moved, expected_blocked(env, 12.5))
+
+
+def test_cspace_cached_per_radius():
+    env = random_environment(10, seed=5)
+    small, large = env.cspace_grid(5), env.cspace_grid(30)
+    assert env.cspace_grid(5) is small and env.cspace_grid(30) is large
+    # Plus grand rayon : au moins autant de cellules interdites
+    assert (large | ~small).all() and large.sum() > small.sum()
@@ -0,0 +1,108 @@
+"""
+Tests de la transformée de distance (src/distance_field.py) et du champ de
+distance de l'environnement, comparés à un calcul par force brute
+
+Usage:
+    python -m pytest -q tests/test_distance_field.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src import distance_field
+from src.distance_field import distance_transform, parabola_envelope
+from src.environment import Environment
+from src.map_generator import MAP_TYPES, MapGenerator
+
+
+def brute_transform(occupied: np.ndarray) -> np.ndarray:
+    """Distance de chaque cellule à la cellule occupée la plus proche (toutes les paires)"""
+    ys, xs = np.nonzero(occupied)
+    gy, gx = np.mgrid[:occupied.shape[0], :occupied.shape[1]]
+    return np.sqrt(((gy[..., None] - ys) ** 2 + (gx[..., None] - xs) ** 2).min(axis=2))
+
+
+def brute_field(env: Environment) -> np.ndarray:
+    """Distance exacte des centres de cellules aux rectangles et aux bords"""
+    g = env.grid_size
+    x, y = np.meshgrid(np.arange(env.grid_width) * g + g // 2, np.arange(env.grid_height) * g + g // 2)
+    field = np.minimum(np.minimum(x, env.width - x), np.minimum(y, env.height - y)).astype(np.float64)
+    for ox, oy, w, h in env.obstacles.rows().tolist():
+        dx = np.maximum(np.maximum(ox - x, x - (ox + w)), 0)
+        dy = np.maximum(np.maximum(oy - y, y - (oy + h)), 0)
+        np.minimum(field, np.sqrt(dx ** 2 + dy ** 2), out=field)
+    return field
+
+
+@pytest.fixture
+def numpy_only(monkeypatch):
+    """Force l'implémentation NumPy même si scipy est installé"""
+    monkeypatch.setattr(distance_field, 'SCIPY_AVAILABLE', False)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('density', [0.002, 0.05, 0.5])
+def test_transform_matches_brute_force(numpy_only, seed, density):
+    rng = np.random.default_rng(seed)
+    occupied = rng.random((37, 53)) < density
+    occupied[rng.integers(37), rng.integers(53)] = True
+
+    np.testing.assert_allclose(distance_transform(occupied), brute_transform(occupied), rtol=1e-6)
+
+
+def test_transform_limits(numpy_only):
+    assert np.isinf(distance_transform(np.zeros((4, 6), dtype=bool))).all()
+    assert (distance_transform(np.ones((4, 6), dtype=bool)) == 0).all()
+
+    # Une seule ligne, une seule colonne
+    row = np.zeros((1, 9), dtype=bool)
+    row[0, 2] = True
+    np.testing.assert_allclose(distance_transform(row)[0], np.abs(np.arange(9) - 2))
+    np.testing.assert_allclose(distance_transform(row.T)[:, 0], np.abs(np.arange(9) - 2))
+
+
+@pytest.mark.skipif(not distance_field.SCIPY_AVAILABLE, reason="scipy non installé")
+def test_transform_matches_scipy():
+    occupied = np.random.default_rng(0).random((60, 45)) < 0.02
+    expected = distance_transform(occupied)
+    np.testing.assert_allclose(np.sqrt(distance_field._squared_distance_numpy(occupied)), expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_parabola_envelope_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    positions = np.unique(rng.uniform(-50, 50, rng.integers(1, 40)))
+    values = rng.uniform(0, 400, (rng.integers(1, 8), len(positions)))
+    queries = np.sort(rng.uniform(-70, 70, rng.integers(1, 40)))
+
+    brute = ((queries[None, :, None] - positions[None, None, :]) ** 2 + values[:, None, :]).min(axis=2)
+    np.testing.assert_allclose(parabola_envelope(positions, values, queries), brute)
+
+
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_field_exact_outside_obstacles(map_type):
+    env = MapGenerator(3).generate(map_type, width=1200, height=900, num_objects=5)
+    field = env.distance_field()
+    expected = brute_field(env)
+
+    # Exact à l'extérieur (y compris loin des obstacles), négatif ou nul à l'intérieur
+    outside = expected > 0
+    np.testing.assert_allclose(field[outside], expected[outside], rtol=1e-5, atol=1e-3)
+    assert (field[~outside] <= 0).all()
+
+
+def test_field_far_from_single_obstacle():
+    # Loin du seul obstacle, la distance reste exacte (plus de borne inférieure)
+    env = Environment(width=2000, height=2000, grid_size=20)
+    env.add_obstacle(990, 990, 20, 20)
+
+    assert env.clearance(510, 1000) == pytest.approx(min(480, 510))
+    assert env.clearance(700, 700) == pytest.approx(np.hypot(280, 280), abs=1e-3)  # centre (710, 710)
+    expected = brute_field(env)
+    outside = expected > 0
+    np.testing.assert_allclose(env.distance_field()[outside], expected[outside], rtol=1e-5, atol=1e-3)
@@ -0,0 +1,181 @@
+"""
+Tests du stockage en colonnes (src/entity_store.py)
+API par attributs des vues GameObject et Obstacle, copie à la première
+modification d'un stockage partagé, et invalidation des grilles de
+l'environnement quand un obstacle est modifié par sa vue.
+
+Usage:
+    python -m pytest -q tests/test_entity_store.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.entity_store import COLOR_MAP, DEFAULT_RGB, GameObject, Obstacle, ObjectStore, ObstacleStore
+from src.environment import Environment
+from src.pathfinding import PathFinder
+
+
+def test_object_view_attributes():
+    store = ObjectStore()
+    obj = store.append(100, 200, 'rouge', 'square', 40)
+
+    assert (obj.x, obj.y, obj.size, obj.color, obj.shape) == (100, 200, 40, 'rouge', 'square')
+    assert obj.get_rgb_color() == COLOR_MAP['rouge']
+    assert repr(obj) == "GameObject(100, 200, 'rouge', 'square', 40)"
+
+    # Écriture par la vue : stockée dans les colonnes, relue par toute autre vue
+    obj.x = 150
+    obj.color = 'Turquoise'
+    assert store[0].x == 150 and store.column('x')[0] == 150
+    assert store[0].color == 'Turquoise'
+    assert store[0].get_rgb_color() == DEFAULT_RGB
+
+    # Vues égales si elles désignent la même ligne du même stockage
+    assert store[0] == obj and hash(store[-1]) == hash(obj)
+    assert obj != GameObject(150, 200, 'Turquoise', 'square', 40)
+
+
+def test_standalone_views_and_from_views():
+    obstacle = Obstacle(10, 20, 30, 40)
+    assert (obstacle.x, obstacle.y, obstacle.width, obstacle.height) == (10, 20, 30, 40)
+    assert obstacle.collides_with_point(40, 60) and not obstacle.collides_with_point(41, 60)
+    assert obstacle.collides_with_point(41, 60, margin=1)
+
+    store = ObstacleStore.from_views([obstacle, Obstacle(0, 0, 5, 5)])
+    assert len(store) == 2 and store.rows().tolist() == [[10, 20, 30, 40], [0, 0, 5, 5]]
+
+    # Copie des valeurs : modifier le stockage ne touche pas l'obstacle autonome
+    store[0].x = 99
+    assert obstacle.x == 10
+
+
+def test_store_indexing_and_search():
+    store = ObjectStore()
+    store.append(1, 1, 'rouge', 'square')
+    store.append(2, 2, 'bleu', 'circle')
+    store.append(3, 3, 'Rouge', 'circle')
+
+    assert [obj.x for obj in store] == [1, 2, 3]
+    assert store[-1].x == 3
+    with pytest.raises(IndexError):
+        store[3]
+
+    assert [obj.x for obj in store.find_all('ROUGE')] == [1, 3]
+    assert store.find('rouge', 'circle').x == 3
+    assert store.find('vert') is None
+
+    # Tranche ou masque : nouveau stockage
+    assert [obj.x for obj in store[1:]] == [2, 3]
+    assert [obj.x for obj in store[np.array([True, False, True])]] == [1, 3]
+
+
+def test_rows_are_read_only():
+    store = ObstacleStore()
+    store.append(0, 0, 10, 10)
+    with pytest.raises(ValueError):
+        store.rows()[0, 0] = 5
+    with pytest.raises(ValueError):
+        store.column('x')[0] = 5
+
+
+def test_copy_on_write_after_from_rows():
+    rows = np.array([[0, 0, 10, 10], [50, 50, 20, 20]], dtype=np.int32)
+    rows.flags.writeable = False
+    store = ObstacleStore.from_rows(rows)
+
+    # Partagé sans copie jusqu'à la première modification
+    assert np.shares_memory(store.rows(), rows)
+
+    store[0].x = 5
+    store.append(90, 90, 5, 5)
+    assert rows.tolist() == [[0, 0, 10, 10], [50, 50, 20, 20]]
+    assert store.rows().tolist() == [[5, 0, 10, 10], [50, 50, 20, 20], [90, 90, 5, 5]]
+    assert not np.shares_memory(store.rows(), rows)
+
+
+def test_copy_on_write_after_freeze():
+    store = ObjectStore()
+    store.append(1, 2, 'rouge', 'square')
+    frozen = store.freeze()
+
+    store[0].y = 7
+    assert frozen.tolist()[0][:2] == [1, 2]
+    assert store[0].y == 7
+
+
+def test_version_counts_modifications():
+    store = ObstacleStore()
+    versions = [store.version]
+    obstacle = store.append(0, 0, 10, 10)
+    versions.append(store.version)
+    obstacle.width = 20
+    versions.append(store.version)
+    assert versions[0] < versions[1] < versions[2]
+
+    # Lecture : pas de nouvelle version
+    obstacle.width, store.rows()
+    assert store.version == versions[2]
+
+
+@pytest.fixture
+def env():
+    env = Environment(width=400, height=400, grid_size=20)
+    env.add_obstacle(180, 0, 40, 300)
+    return env
+
+
+def test_obstacle_view_write_invalidates_caches(env):
+    # Caches remplis avec l'ancienne géométrie
+    assert not env.is_position_valid(200, 100)
+    occupancy = env.occupancy_grid()
+    distance = env.distance_field()
+    cspace = env.cspace_grid(10)
+    assert occupancy[5, 10] and distance[5, 10] <= 0 and cspace[5, 10]
+
+    # L'obstacle est déplacé par sa vue : toutes les grilles suivent
+    env.obstacles[0].x = 300
+    assert env.is_position_valid(200, 100)
+    assert not env.is_position_valid(320, 100)
+    assert env.occupancy_grid() is not occupancy
+    assert not env.occupancy_grid()[5, 10] and env.occupancy_grid()[5, 15]
+    assert env.distance_field()[5, 10] > 0 and env.distance_field()[5, 15] <= 0
+    assert not env.cspace_grid(10)[5, 10]
+    assert env.clearance_penalty(60)[5, 15] == 1
+
+
+def test_store_append_invalidates_caches(env):
+    assert env.is_position_valid(100, 350)
+    env.occupancy_grid()
+
+    # Ajout direct dans le stockage (sans add_obstacle)
+    env.obstacles.append(80, 330, 40, 40)
+    assert not env.is_position_valid(100, 350)
+    assert env.occupancy_grid()[17, 5]
+
+
+def test_planning_follows_moved_obstacle(env):
+    pathfinder = PathFinder(env)
+    assert pathfinder.find_path_to_target((100, 100), (300, 100)) is not None
+
+    # Mur prolongé jusqu'en bas par sa vue : plus de passage
+    env.obstacles[0].height = 400
+    assert pathfinder.find_path_to_target((100, 100), (300, 100)) is None
+
+
+def test_restored_snapshot_tracks_view_writes(env):
+    env.occupancy_grid()
+    snapshot = env.snapshot()
+    restored = Environment.from_snapshot(snapshot)
+
+    # Grilles partagées avec l'instantané, puis recalculées après modification
+    assert restored.occupancy_grid() is snapshot.occupancy[15]
+    restored.obstacles[0].x = 300
+    assert not restored.occupancy_grid()[5, 10]
+    assert snapshot.occupancy[15][5, 10] and snapshot.obstacles[0, 0] == 180
+    assert env.occupancy_grid()[5, 10]
@@ -0,0 +1,220 @@
+"""
+Tests de l'évaluateur (src/evaluator.py) : précision des percentiles de
+RunningStats (seaux logarithmiques), temps exclusif des phases imbriquées
+(horloge simulée), fusion d'évaluateurs et oubli des mesures en cours.
+
+Usage:
+    python -m pytest -q tests/test_evaluator.py
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src import evaluator as evaluator_module
+from src.evaluator import Evaluator, RunningStats
+from src.robot import Robot
+
+
+class FakeClock:
+    """Remplace le module time de src.evaluator : le temps n'avance que par advance()"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, ms: float):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(evaluator_module, 'time', clock)
+    return clock
+
+
+def exact_percentile(values, p: float) -> float:
+    """Percentile au rang le plus proche (même définition que RunningStats)"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+@pytest.mark.parametrize('distribution', ['lognormal', 'uniform', 'exponential', 'entiers'])
+def test_percentiles_within_bucket_error(distribution):
+    rng = np.random.default_rng(0)
+    values = {
+        'lognormal': rng.lognormal(1.0, 1.5, 5000),
+        'uniform': rng.uniform(0.01, 50, 5000),
+        'exponential': rng.exponential(3.0, 5000),
+        'entiers': rng.integers(1, 10_000, 5000).astype(float),
+    }[distribution].tolist()
+
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean() == pytest.approx(np.mean(values))
+    assert (stats.min, stats.max) == (min(values), max(values))
+    for p in (1, 10, 50, 90, 95, 99, 99.9, 100):
+        expected = exact_percentile(values, p)
+        assert abs(stats.percentile(p) - expected) <= (RunningStats.GROWTH - 1) * expected
+
+
+def test_percentiles_with_zero_and_negative_values():
+    stats = RunningStats()
+    for value in [0.0] * 50 + [-2.0] * 10 + [5.0] * 40:
+        stats.add(value)
+
+    # Seau des valeurs nulles ou négatives : 0 (ou le max s'il est négatif)
+    assert stats.percentile(50) == 0.0
+    assert stats.percentile(95) == pytest.approx(5.0, rel=RunningStats.GROWTH - 1)
+    assert stats.percentile(0) == 0.0
+
+    negative = RunningStats()
+    negative.add(-3.0)
+    negative.add(-1.0)
+    assert negative.percentile(50) == -1.0
+
+
+def test_percentiles_bounded_by_observed_values():
+    stats = RunningStats()
+    stats.add(10.0)
+    assert stats.percentile(1) == stats.percentile(99) == 10.0
+    assert RunningStats().percentile(50) == 0.0 and RunningStats().mean() == 0.0
+
+
+def test_running_stats_merge_matches_single_instance():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(0, 2, 3000).tolist()
+    whole, parts = RunningStats(), [RunningStats() for _ in range(3)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 3].add(value)
+
+    merged = RunningStats()
+    for part in parts:
+        merged.merge(part)
+    merged.merge(RunningStats())    # instance vide : sans effet
+
+    assert merged.buckets == whole.buckets
+    assert merged.summary() == pytest.approx(whole.summary())
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+
+
+def test_nested_spans_exclusive_time(clock):
+    evaluator = Evaluator()
+    evaluator.start_test('commande', 'Simple')
+
+    with evaluator.span('plan'):
+        clock.advance(2)
+        with evaluator.span('simplify'):
+            clock.advance(3)
+            with evaluator.span('lookup'):
+                clock.advance(4)
+            clock.advance(1)
+        clock.advance(5)
+    with evaluator.span('plan'):        # phase répétée (seconde cible) : cumulée
+        clock.advance(6)
+
+    evaluator.end_test(True, Robot(x=100, y=100, size=25))
+    phases = evaluator.last_result['phases']
+    assert phases == pytest.approx({'plan': 13, 'simplify': 4, 'lookup': 4})
+
+    # Somme des temps exclusifs = temps total mesuré
+    assert sum(phases.values()) == pytest.approx(2 + 3 + 4 + 1 + 5 + 6)
+    assert evaluator.phase_stats['plan'].count == 1
+
+
+def test_span_closed_on_exception(clock):
+    evaluator = Evaluator()
+    with pytest.raises(RuntimeError):
+        with evaluator.span('plan'):
+            clock.advance(2)
+            with evaluator.span('simplify'):
+                clock.advance(1)
+                raise RuntimeError("échec")
+    assert not evaluator._span_stack
+
+    # Mesures commencées avant start_test : gardées pour la commande
+    evaluator.start_test('commande', 'Simple')
+    evaluator.end_test(False, Robot(x=100, y=100, size=25))
+    assert evaluator.last_result['phases'] == pytest.approx({'plan': 2, 'simplify': 1})
+
+
+def test_reset_spans_forgets_current_measures(clock):
+    evaluator = Evaluator()
+    robot = Robot(x=100, y=100, size=25)
+
+    with evaluator.span('parse'):
+        clock.advance(5)
+    evaluator.count('nodes_expanded', 40)
+    evaluator.reset_spans()         # commande abandonnée
+
+    evaluator.start_test('commande', 'Simple')
+    with evaluator.span('plan'):
+        clock.advance(1)
+    evaluator.count('nodes_expanded', 3)
+    evaluator.end_test(True, robot)
+
+    assert evaluator.last_result['phases'] == pytest.approx({'plan': 1})
+    assert evaluator.last_result['counters'] == {'nodes_expanded': 3}
+    assert 'parse' not in evaluator.phase_stats
+
+    # end_test repart aussi de zéro
+    evaluator.start_test('suivante', 'Simple')
+    evaluator.end_test(True, robot)
+    assert evaluator.last_result['phases'] == {} and evaluator.last_result['counters'] == {}
+
+
+def run_commands(evaluator: Evaluator, clock: FakeClock, durations, first: int = 0):
+    """Une commande par durée (ms) : phase plan, compteur, succès si la durée est paire"""
+    robot = Robot(x=100, y=100, size=25)
+    for i, duration in enumerate(durations, first):
+        evaluator.start_test(f"commande {i}", 'Simple')
+        with evaluator.span('plan'):
+            clock.advance(duration)
+        evaluator.count('nodes_expanded', duration * 10)
+        evaluator.end_test(duration % 2 == 0, robot)
+
+
+def test_merge_matches_single_evaluator(clock):
+    durations = [3, 8, 1, 12, 7, 4, 30, 2, 9]
+    single = Evaluator()
+    run_commands(single, clock, durations)
+
+    parts = [Evaluator(), Evaluator(keep_results=False), Evaluator()]
+    run_commands(parts[0], clock, durations[:4])
+    run_commands(parts[1], clock, durations[4:6], first=4)
+    run_commands(parts[2], clock, durations[6:], first=6)
+    merged = Evaluator.merge(parts)
+
+    assert merged.total_tests == single.total_tests == len(durations)
+    assert merged.successes == single.successes
+    assert merged.get_success_rate() == pytest.approx(single.get_success_rate())
+    assert merged.get_average_execution_time() == pytest.approx(single.get_average_execution_time())
+    for name, summary in single.get_phase_stats().items():
+        assert merged.get_phase_stats()[name] == pytest.approx(summary)
+    for name, summary in single.get_counter_stats().items():
+        assert merged.get_counter_stats()[name] == pytest.approx(summary)
+    assert list(merged.get_phase_stats()) == list(single.get_phase_stats())
+
+    # Résultats conservés : ceux des évaluateurs qui les gardent, dans l'ordre
+    assert [r['command'] for r in merged.results] == [f"commande {i}" for i in (0, 1, 2, 3, 6, 7, 8)]
+
+
+def test_merge_empty():
+    merged = Evaluator.merge([])
+    assert merged.total_tests == 0 and merged.get_success_rate() == 0.0
+    assert merged.format_phase_report() == ""
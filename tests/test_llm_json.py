@@ -0,0 +1,92 @@
+"""
+Tests de l'extraction du JSON renvoyé par le LLM (src/llm_json.py)
+Chaque cas de tests/fixtures/json_repairs.jsonl est décodé d'un bloc par
+repair_json et morceau par morceau par IncrementalJSONParser ; les cas
+marqués "valid" sont en plus passés à validate_result (false : refusé).
+
+Usage:
+    python -m pytest -q tests/test_llm_json.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.llm_json import IncrementalJSONParser, repair_json, validate_result
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'json_repairs.jsonl')
+
+with open(FIXTURES, encoding='utf-8') as f:
+    CASES = [json.loads(line) for line in f if line.strip()]
+
+VALIDATED = [case for case in CASES if 'valid' in case]
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_repair_json(case):
+    assert repair_json(case['response']) == case['expected']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7])
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_incremental_parser(case, chunk_size):
+    parser = IncrementalJSONParser()
+    text = case['response']
+    for i in range(0, len(text), chunk_size):
+        parser.feed(text[i:i + chunk_size])
+    assert parser.result() == case['expected']
+
+
+def test_targets_complete_before_end_of_object():
+    parser = IncrementalJSONParser()
+    parser.feed('{"confidence": 0.9, "interpretation": "x", "targets": [{"color": "bleu"}]')
+    assert parser.targets_complete and not parser.complete
+    assert parser.result() == {'confidence': 0.9, 'interpretation': 'x', 'targets': [{'color': 'bleu'}]}
+
+
+@pytest.mark.parametrize('text', ['Aucune cible', 'Voir [la doc] et {le guide}'])
+def test_no_json(text):
+    with pytest.raises(ValueError):
+        repair_json(text)
+
+
+@pytest.mark.parametrize('case', VALIDATED, ids=[case['name'] for case in VALIDATED])
+def test_validate_repaired(case):
+    result = repair_json(case['response'])
+    if case['valid']:
+        assert validate_result(result, 'commande')['targets']
+    else:
+        with pytest.raises(ValueError):
+            validate_result(result, 'commande')
+
+
+def test_validate_normalizes_aliases():
+    result = validate_result({'targets': [{'color': 'Red', 'shape': 'carré'},
+                                          {'color': 'VIOLET', 'type': 'waypoint'},
+                                          {'shape': 'cercle', 'type': 'inconnu'}]}, 'commande')
+    assert result['targets'] == [
+        {'color': 'rouge', 'shape': 'square', 'type': 'target'},
+        {'color': 'violet', 'shape': None, 'type': 'waypoint'},
+        {'color': None, 'shape': 'circle', 'type': 'target'},
+    ]
+
+
+@pytest.mark.parametrize('target', [{'color': 'rou'}, {'shape': 'car'}, {'color': 'rouge', 'shape': 'triangle'},
+                                    {}, {'color': '', 'shape': None}, {'color': 3}])
+def test_validate_rejects_unknown_targets(target):
+    with pytest.raises(ValueError):
+        validate_result({'targets': [target]}, 'commande')
+
+
+@pytest.mark.parametrize('interpretation, expected', [(None, ''), ('va au rouge', 'va au rouge'), (2, '2')])
+def test_validate_interpretation(interpretation, expected):
+    result = validate_result({'targets': [], 'interpretation': interpretation}, 'commande')
+    assert result['interpretation'] == expected
+    assert result['raw_command'] == 'commande'
+
+    # Champ absent (réponse coupée avant lui) : la commande d'origine
+    assert validate_result({'targets': []}, 'commande')['interpretation'] == 'commande'
@@ -0,0 +1,124 @@
+"""
+Tests du parsing par lot (LLMParser.parse_commands, TieredParser.parse_commands
+et mode lot de main.run_batch) avec le stand-in ReplayBackend : découpage en
+lots sous le budget de tokens, une requête par lot, et nouvelle requête
+individuelle pour les seules entrées manquantes ou invalides.
+
+Usage:
+    python -m pytest -q tests/test_llm_parser.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+from src.llm_backends import ReplayBackend
+from src.llm_parser import RESPONSE_TOKENS_PER_COMMAND, LLMParser
+from src.tiered_parser import TieredParser
+
+
+def response(*targets, confidence=0.9):
+    """Réponse brute du modèle pour des cibles (couleur, forme)"""
+    return json.dumps({'confidence': confidence, 'interpretation': 'x',
+                       'targets': [{'color': color, 'shape': shape} for color, shape in targets]})
+
+
+COMMANDS = [f"va au carré rouge puis au cercle bleu n°{i}" for i in range(12)]
+RESPONSES = {command: response(('rouge', 'square'), ('bleu', 'circle')) for command in COMMANDS}
+
+
+def make_parser(responses=None, **options) -> LLMParser:
+    return LLMParser(backend=ReplayBackend(dict(RESPONSES, **(responses or {})), **options))
+
+
+@pytest.mark.parametrize('token_budget', [200, 300, 1000])
+@pytest.mark.parametrize('max_batch_size', [1, 4, 20])
+def test_batches_respect_token_budget(token_budget, max_batch_size):
+    parser = make_parser()
+    commands = [command * (1 + i % 3) for i, command in enumerate(COMMANDS)]
+    batches = parser._make_batches(commands, token_budget, max_batch_size)
+
+    def tokens(batch):
+        base = parser._estimate_tokens(parser.system_prompt + parser.batch_prompt)
+        return base + sum(parser._estimate_tokens(commands[i]) + RESPONSE_TOKENS_PER_COMMAND
+                          for i in batch)
+
+    # Toutes les commandes, dans l'ordre, une seule fois
+    assert [i for batch in batches for i in batch] == list(range(len(commands)))
+
+    for batch, following in zip(batches, batches[1:] + [None]):
+        assert 1 <= len(batch) <= max_batch_size
+        # Au-dessus du budget : seulement une commande seule
+        assert tokens(batch) <= token_budget or len(batch) == 1
+        # Lot fermé avant d'être plein : la commande suivante aurait dépassé le budget
+        if following is not None and len(batch) < max_batch_size:
+            assert tokens(batch + following[:1]) > token_budget
+
+
+def test_one_request_per_batch():
+    parser = make_parser()
+    results = parser.parse_commands(COMMANDS, max_batch_size=5)
+
+    assert parser.backend.calls == 3
+    assert all(not result.get('fallback') for result in results)
+    assert [result['raw_command'] for result in results] == COMMANDS
+    assert results[0]['targets'] == [{'color': 'rouge', 'shape': 'square', 'type': 'target'},
+                                     {'color': 'bleu', 'shape': 'circle', 'type': 'target'}]
+
+
+def test_invalid_entries_requeried_individually():
+    truncated = response(('vert', 'circle'))[:-2]     # absent du tableau du lot
+    parser = make_parser({COMMANDS[1]: truncated, COMMANDS[3]: response(('rou', 'square'))})
+    results = parser.parse_commands(COMMANDS[:5])
+
+    # Un lot, puis une requête par entrée manquante ou invalide
+    assert parser.backend.calls == 3
+
+    # Réponse tronquée : réparée par le parsing en streaming
+    assert results[1]['targets'] == [{'color': 'vert', 'shape': 'circle', 'type': 'target'}]
+    assert not results[1].get('fallback')
+
+    # Couleur inconnue, refusée deux fois : parser simple
+    assert results[3]['fallback'] and results[3]['targets'][0]['color'] == 'rouge'
+    assert all(not results[i].get('fallback') for i in (0, 2, 4))
+
+
+def test_failed_batch_requeries_every_command():
+    parser = make_parser(error_rate=1.0, seed=0)
+    results = parser.parse_commands(COMMANDS[:3])
+    assert all(result['fallback'] for result in results)
+
+
+def test_tiered_batch_escalates_only_complex_commands():
+    parser = TieredParser(make_parser())
+    commands = ['va au cercle vert'] + COMMANDS[:3] + ['carré jaune']
+    results = parser.parse_commands(commands)
+
+    assert [result['tier'] for result in results] == ['local', 'llm', 'llm', 'llm', 'local']
+    assert parser.llm_parser.backend.calls == 1
+    assert results[0]['targets'] == [{'color': 'vert', 'shape': 'circle', 'type': 'target'}]
+    assert parser.latencies['llm'].count == 3 and parser.latencies['local'].count == 2
+
+
+def test_run_batch_parses_commands_in_batches(tmp_path, monkeypatch):
+    parser = TieredParser(make_parser())
+    monkeypatch.setattr(main, 'create_parser', lambda: (parser, True))
+    monkeypatch.setattr(main, 'MAX_BATCH_SIZE', 4)
+
+    commands = tmp_path / 'commandes.txt'
+    commands.write_text('\n'.join(COMMANDS[:6] + ['va au carré vert']) + '\n', encoding='utf-8')
+    output = tmp_path / 'resultats.jsonl'
+    main.run_batch('simple', str(commands), str(output))
+
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [result['index'] for result in results] == list(range(7))
+    assert [result['tier'] for result in results] == ['llm'] * 6 + ['local']
+    assert all(result['success'] and result['reached'] == result['targets'] for result in results)
+
+    # Paquets de 4 commandes : deux requêtes groupées pour les six escaladées
+    assert parser.llm_parser.backend.calls == 2
@@ -0,0 +1,172 @@
+"""
+Tests du format binaire des cartes (src/map_format.py) : aller-retour
+save_map -> load_map (obstacles, objets, métadonnées, grilles), lecture par
+numpy.memmap sans copie, et refus des fichiers dont l'en-tête ou la version
+est invalide.
+
+Usage:
+    python -m pytest -q tests/test_map_format.py
+"""
+
+import json
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.environment import Environment
+from src.map_format import FORMAT_VERSION, MAGIC, load_map, read_header, save_map
+from src.map_generator import MAP_TYPES, MapGenerator
+
+
+def objects_of(env: Environment):
+    return [(obj.x, obj.y, obj.size, obj.color, obj.shape) for obj in env.objects]
+
+
+@pytest.fixture
+def rooms():
+    return MapGenerator(4).generate('rooms', width=1200, height=900, num_objects=8)
+
+
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_round_trip(tmp_path, map_type):
+    env = MapGenerator(1).generate(map_type, width=1000, height=800, num_objects=6)
+    filename = str(tmp_path / 'carte.map')
+    save_map(env, filename, include_distance=True)
+    loaded = load_map(filename)
+
+    assert (loaded.width, loaded.height, loaded.grid_size) == (env.width, env.height, env.grid_size)
+    assert loaded.obstacles.rows().tolist() == env.obstacles.rows().tolist()
+    assert objects_of(loaded) == objects_of(env)
+    np.testing.assert_array_equal(loaded.occupancy_grid(), env.occupancy_grid())
+    np.testing.assert_array_equal(loaded.distance_field(), env.distance_field())
+
+    # Même réponse aux requêtes de l'environnement
+    for obj in env.objects:
+        assert loaded.find_object(obj.color, obj.shape) is not None
+        assert loaded.is_position_valid(obj.x, obj.y) == env.is_position_valid(obj.x, obj.y)
+
+
+def test_header_metadata(tmp_path, rooms):
+    rooms.add_object(50, 50, 'Turquoise', 'triangle', 20)
+    filename = str(tmp_path / 'carte.map')
+    save_map(rooms, filename, margin=7)
+    header = read_header(filename)
+
+    assert header['version'] == FORMAT_VERSION and header['margin'] == 7
+    assert (header['width'], header['height'], header['grid_size']) == (1200, 900, rooms.grid_size)
+    assert 'distance' not in header['sections']
+    assert header['colors'] == list(dict.fromkeys(obj.color for obj in rooms.objects))
+    assert header['sections']['obstacles']['shape'] == [len(rooms.obstacles), 4]
+
+    # Vocabulaire du fichier : couleurs et formes hors des tables par défaut conservées
+    loaded = load_map(filename)
+    assert objects_of(loaded) == objects_of(rooms)
+    assert loaded.find_object('Turquoise', 'triangle') is not None
+
+    # Grille précalculée pour la marge enregistrée, champ de distance calculé à la demande
+    np.testing.assert_array_equal(loaded.occupancy_grid(7), rooms.occupancy_grid(7))
+    np.testing.assert_array_equal(loaded.distance_field(), rooms.distance_field())
+
+
+def test_loaded_arrays_are_memmaps(tmp_path, rooms):
+    filename = str(tmp_path / 'carte.map')
+    save_map(rooms, filename, include_distance=True)
+    header = read_header(filename)
+    loaded = load_map(filename)
+
+    # Grilles et obstacles lus dans le fichier, en lecture seule, sans copie
+    for grid in (loaded.occupancy_grid(header['margin']), loaded.distance_field()):
+        assert isinstance(grid, np.memmap) and not grid.flags.writeable
+    rows = loaded.obstacles.rows()
+    assert not rows.flags.writeable
+    assert any(isinstance(base, np.memmap) for base in (rows, rows.base, getattr(rows.base, 'base', None)))
+
+    # Modification : copie en mémoire, fichier intact
+    loaded.obstacles[0].x += 10
+    loaded.add_obstacle(0, 0, 40, 40)
+    assert not isinstance(loaded.occupancy_grid(header['margin']), np.memmap)
+    assert load_map(filename).obstacles.rows().tolist() == rooms.obstacles.rows().tolist()
+
+
+def test_empty_map(tmp_path):
+    env = Environment(width=400, height=300, grid_size=20)
+    filename = str(tmp_path / 'vide.map')
+    save_map(env, filename)
+    loaded = load_map(filename)
+
+    assert len(loaded.obstacles) == 0 and len(loaded.objects) == 0
+    np.testing.assert_array_equal(loaded.occupancy_grid(), env.occupancy_grid())
+    assert loaded.is_position_valid(200, 150)
+
+
+def test_sections_aligned(tmp_path, rooms):
+    filename = str(tmp_path / 'carte.map')
+    save_map(rooms, filename, include_distance=True)
+    header = read_header(filename)
+
+    offsets = sorted(section['offset'] for section in header['sections'].values())
+    assert all(offset % 64 == 0 for offset in offsets)
+    header_end = len(MAGIC) + 4 + len(json.dumps(header).encode('utf-8'))
+    assert offsets[0] >= header_end
+
+
+def write_raw(path, header: dict) -> str:
+    """Écrit un fichier de carte avec un en-tête arbitraire (sans sections)"""
+    data = json.dumps(header).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(data)) + data)
+    return str(path)
+
+
+@pytest.fixture
+def valid_header(tmp_path, rooms):
+    filename = str(tmp_path / 'carte.map')
+    save_map(rooms, filename)
+    return read_header(filename)
+
+
+@pytest.mark.parametrize('data', [
+    b'ROBOMAP',                                          # magique incomplet
+    b'PNG\0\0\0\0\0' + b'\0' * 8,                         # autre format
+    MAGIC,                                               # longueur absente
+    MAGIC + struct.pack('<I', 500) + b'{"version": 1}',  # en-tête tronqué
+    MAGIC + struct.pack('<I', 9) + b'{version:',         # JSON illisible
+    MAGIC + struct.pack('<I', 2) + b'[]',                # pas un objet
+    MAGIC + struct.pack('<I', 2) + b'\xff\xfe',          # pas de l'UTF-8
+])
+def test_rejects_bad_header_bytes(tmp_path, data):
+    filename = tmp_path / 'mauvais.map'
+    filename.write_bytes(data)
+    with pytest.raises(ValueError):
+        load_map(str(filename))
+
+
+@pytest.mark.parametrize('version', [0, 2, '1', None])
+def test_rejects_unknown_version(tmp_path, valid_header, version):
+    valid_header['version'] = version
+    with pytest.raises(ValueError, match='version'):
+        load_map(write_raw(tmp_path / 'version.map', valid_header))
+
+
+@pytest.mark.parametrize('change', [
+    lambda header: header.pop('sections'),
+    lambda header: header['sections'].pop('occupancy'),
+    lambda header: header['sections']['obstacles'].update(dtype='<f8'),
+    lambda header: header['sections'].update(objects=[0, '<i4']),
+    lambda header: header['sections'].update(extra={'offset': 0, 'dtype': '<i4', 'shape': [1]}),
+])
+def test_rejects_bad_sections(tmp_path, valid_header, change):
+    change(valid_header)
+    with pytest.raises(ValueError, match='sections'):
+        load_map(write_raw(tmp_path / 'sections.map', valid_header))
+
+
+def test_rejects_sections_past_end_of_file(tmp_path, valid_header):
+    # En-tête valide mais fichier coupé avant les sections
+    with pytest.raises(ValueError):
+        load_map(write_raw(tmp_path / 'coupe.map', valid_header))
@@ -0,0 +1,299 @@
+"""
+Tests des recherches de chemin (src/pathfinding.py) sur des cartes générées
+Les variantes de A* doivent trouver des chemins de même coût que a_star
+(chemins bruts, avant simplification) et None quand le but est inatteignable ;
+les recherches vers plusieurs buts (une par mode) choisissent le moins
+coûteux, et la recherche à temps borné respecte son délai avant même le
+premier chemin, un seul délai valant pour tous les buts.
+
+Usage:
+    python -m pytest -q tests/test_pathfinding.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.environment import Environment
+from src.map_generator import MAP_TYPES, MapGenerator, reachable_cells
+from src import pathfinding
+from src.pathfinding import DIAGONAL_COST, NEAREST_HEURISTIC_GOALS, PathFinder
+
+
+START = (100, 100)
+SEEDS = (0, 1, 2)
+
+
+def make_pathfinder(map_type: str, seed: int, clearance_weight: float = 0.0) -> PathFinder:
+    """PathFinder sur une carte générée, chemins rendus sans simplification"""
+    env = MapGenerator(seed).generate(map_type, width=1000, height=1000, num_objects=6, start=START)
+    pathfinder = PathFinder(env, clearance_weight=clearance_weight)
+    pathfinder.simplify_path = lambda path: path
+    return pathfinder
+
+
+def path_cost(pathfinder: PathFinder, path) -> float:
+    """Coût d'un chemin brut (cellule par cellule), avec les multiplicateurs de dégagement"""
+    env = pathfinder.environment
+    cost = pathfinder.cost_grid()
+    cells = [env.pixel_to_grid(x, y) for x, y in path]
+    total = 0.0
+    for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+        assert max(abs(x1 - x0), abs(y1 - y0)) == 1, "pas non adjacent dans un chemin brut"
+        step = DIAGONAL_COST if x1 != x0 and y1 != y0 else 1.0
+        if cost is not None:
+            step *= cost[y1][x1]
+        total += step
+    return total
+
+
+def enclose(pathfinder: PathFinder, center) -> tuple:
+    """Entoure center d'un anneau d'obstacles ; rend le centre de la cellule enfermée"""
+    env = pathfinder.environment
+    x, y = env.grid_to_pixel(*env.pixel_to_grid(*center))
+    outer, wall = 100, 20
+    env.add_obstacle(x - outer, y - outer, 2 * outer, wall)
+    env.add_obstacle(x - outer, y + outer - wall, 2 * outer, wall)
+    env.add_obstacle(x - outer, y - outer, wall, 2 * outer)
+    env.add_obstacle(x + outer - wall, y - outer, wall, 2 * outer)
+    return x, y
+
+
+def test_diagonal_cost_matches_heuristic():
+    # Sans obstacle, la diagonale pure coûte exactement la distance euclidienne :
+    # l'heuristique ne surestime jamais le coût (condition de la règle d'arrêt MM)
+    pathfinder = PathFinder(Environment(width=400, height=400, grid_size=20))
+    pathfinder.simplify_path = lambda path: path
+    goal = (START[0] + 5 * 20, START[1] + 5 * 20)
+    env = pathfinder.environment
+
+    for search in (pathfinder.a_star, pathfinder.bidirectional_a_star):
+        path = search(START, goal)
+        assert len(path) == 6
+        expected = pathfinder.heuristic(env.pixel_to_grid(*START), env.pixel_to_grid(*goal))
+        assert path_cost(pathfinder, path) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('clearance_weight', [0.0, 2.0], ids=['distance', 'clearance'])
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_bidirectional_cost_matches_a_star(map_type, seed, clearance_weight):
+    pathfinder = make_pathfinder(map_type, seed, clearance_weight)
+
+    for obj in pathfinder.environment.objects:
+        goal = (obj.x, obj.y)
+        expected = pathfinder.a_star(START, goal)
+        path = pathfinder.bidirectional_a_star(START, goal)
+
+        # Objets placés dans des cellules atteignables : les deux trouvent un chemin
+        assert expected is not None and path is not None
+        assert path[0] == expected[0] and path[-1] == expected[-1]
+        assert path_cost(pathfinder, path) == pytest.approx(path_cost(pathfinder, expected))
+
+
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_bidirectional_unreachable_goal(map_type):
+    pathfinder = make_pathfinder(map_type, 0)
+    obj = pathfinder.environment.objects[0]
+    goal = enclose(pathfinder, (obj.x, obj.y))
+
+    # Le but reste libre mais n'est plus relié au départ
+    gx, gy = pathfinder.environment.pixel_to_grid(*goal)
+    assert not pathfinder.blocked_grid()[gy, gx]
+
+    assert pathfinder.a_star(START, goal) is None
+    assert pathfinder.bidirectional_a_star(START, goal) is None
+
+
+def test_bidirectional_blocked_goal():
+    pathfinder = make_pathfinder('rectangles', 0)
+    obstacle = pathfinder.environment.obstacles[0]
+    goal = (obstacle.x + obstacle.width // 2, obstacle.y + obstacle.height // 2)
+    gx, gy = pathfinder.environment.pixel_to_grid(*goal)
+    assert pathfinder.blocked_grid()[gy, gx]
+
+    assert pathfinder.bidirectional_a_star(START, goal) is None
+
+
+def sample_goals(pathfinder: PathFinder, count: int, seed: int) -> list:
+    """Centres de cellules atteignables tirés au hasard (reproductible)"""
+    env = pathfinder.environment
+    ys, xs = reachable_cells(env, START).nonzero()
+    cells = random.Random(seed).sample(list(zip(xs.tolist(), ys.tolist())), count)
+    return [env.grid_to_pixel(x, y) for x, y in cells]
+
+
+# Recherches multi-buts optimales sur la grille (ARA* sans délai effectif : jusqu'à ε = 1)
+NEAREST_SEARCHES = {
+    'a_star': lambda pathfinder: pathfinder.nearest_a_star,
+    'bidirectional': lambda pathfinder: pathfinder.bidirectional_nearest,
+    'anytime': lambda pathfinder: lambda start, goals: pathfinder.anytime_nearest(start, goals, 60000),
+}
+
+
+@pytest.mark.parametrize('search', NEAREST_SEARCHES)
+@pytest.mark.parametrize('clearance_weight', [0.0, 2.0], ids=['distance', 'clearance'])
+@pytest.mark.parametrize('count', [3, NEAREST_HEURISTIC_GOALS, NEAREST_HEURISTIC_GOALS + 24])
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_nearest_matches_best_a_star(map_type, count, clearance_weight, search, monkeypatch):
+    pathfinder = make_pathfinder(map_type, 1, clearance_weight)
+    goals = sample_goals(pathfinder, count, seed=count)
+
+    # Au-delà de NEAREST_HEURISTIC_GOALS buts, l'heuristique lit une transformée de distance
+    calls = []
+    transform = pathfinding.distance_transform
+    monkeypatch.setattr(pathfinding, 'distance_transform',
+                        lambda grid: calls.append(grid) or transform(grid))
+
+    index, path = NEAREST_SEARCHES[search](pathfinder)(START, goals)
+    assert len(calls) == (count > NEAREST_HEURISTIC_GOALS)
+    assert path[0] == pathfinder.environment.grid_to_pixel(*pathfinder.environment.pixel_to_grid(*START))
+    assert path[-1] == goals[index]
+
+    best = min(path_cost(pathfinder, pathfinder.a_star(START, goal)) for goal in goals)
+    assert path_cost(pathfinder, path) == pytest.approx(best)
+
+
+@pytest.mark.parametrize('search', ['nearest_a_star', 'bidirectional_nearest', 'quadtree_nearest', 'anytime_nearest'])
+def test_nearest_unreachable_goals(search):
+    pathfinder = make_pathfinder('rooms', 0)
+    nearest = getattr(pathfinder, search)
+    obstacle = pathfinder.environment.obstacles[0]
+    blocked = (obstacle.x + obstacle.width // 2, obstacle.y + obstacle.height // 2)
+    enclosed = enclose(pathfinder, sample_goals(pathfinder, 1, seed=0)[0])
+
+    assert nearest(START, [blocked, enclosed]) is None
+    assert nearest(START, []) is None
+
+    # Un but atteignable parmi des buts inatteignables : c'est lui qui est choisi
+    reachable = sample_goals(pathfinder, 1, seed=1)[0]
+    index, path = nearest(START, [blocked, enclosed, reachable])
+    assert index == 2 and path[-1] == reachable
+
+    # Départ sur un but : chemin réduit à ce point
+    assert nearest(reachable, [blocked, reachable]) == (1, [reachable])
+
+
+@pytest.mark.parametrize('mode, variant', [({'quadtree': True}, 'quadtree_nearest'),
+                                           ({'bidirectional': True}, 'bidirectional_nearest'),
+                                           ({'deadline_ms': 1000}, 'anytime_nearest')],
+                         ids=['quadtree', 'bidirectional', 'deadline'])
+def test_nearest_follows_search_mode(mode, variant, monkeypatch):
+    env = MapGenerator(1).generate('rooms', width=1000, height=1000, num_objects=6, start=START)
+    pathfinder = PathFinder(env, **mode)
+    goals = sample_goals(pathfinder, 5, seed=5)
+
+    # Une seule recherche multi-buts, celle du mode (pas de recherche par cible)
+    calls = []
+    search = getattr(pathfinder, variant)
+    monkeypatch.setattr(pathfinder, variant, lambda *args: calls.append(args) or search(*args))
+    monkeypatch.setattr(pathfinder, 'find_path_to_target', None)
+
+    def no_grid_search(*args):
+        raise AssertionError("nearest_a_star ne doit pas être utilisé dans ce mode")
+    monkeypatch.setattr(pathfinder, 'nearest_a_star', no_grid_search)
+
+    index, path = pathfinder.find_path_to_nearest(START, goals)
+    assert len(calls) == 1
+    assert path[-1] == goals[index]
+
+    # Le but choisi est (à l'approximation des feuilles près) le plus proche
+    def length(path) -> float:
+        return sum(((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) ** 0.5 for a, b in zip(path, path[1:]))
+
+    monkeypatch.undo()
+    lengths = [length(pathfinder.find_path_to_target(START, goal)) for goal in goals]
+    assert length(path) == pytest.approx(lengths[index], rel=0.1)
+    assert lengths[index] <= 1.1 * min(lengths)
+
+
+def test_anytime_nearest_single_deadline():
+    env = MapGenerator(0).generate('maze', width=4000, height=4000, num_objects=1, start=START)
+    pathfinder = PathFinder(env)
+    pathfinder.blocked_rows()
+
+    # Cellules atteignables les plus éloignées du départ : aucun chemin en 5 ms
+    cells = reachable_cells(env, START).nonzero()
+    order = (cells[0] + cells[1]).argsort()[-40:]
+    goals = [env.grid_to_pixel(int(cells[1][i]), int(cells[0][i])) for i in order]
+
+    began = time.perf_counter()
+    search = pathfinder.anytime_nearest_search(START, goals, 5)
+    elapsed = time.perf_counter() - began
+
+    # Un délai pour les 40 buts (et non un par but)
+    assert elapsed < 0.05
+    assert pathfinder.anytime_nearest_path(search) is None and not search.done
+    search.cancel()
+
+
+def test_anytime_nearest_in_background():
+    pathfinder = make_pathfinder('maze', 0)
+    goals = sample_goals(pathfinder, 8, seed=3)
+
+    # Délai nul, puis poursuite en arrière-plan jusqu'au plus proche (ε = 1)
+    search = pathfinder.anytime_nearest_search(START, goals, 0)
+    assert search.nodes_expanded == 0
+    search.start_background()
+    search.join(timeout=30)
+    assert search.done
+
+    index, path = pathfinder.anytime_nearest_path(search)
+    assert path[-1] == goals[index]
+    best = min(path_cost(pathfinder, pathfinder.a_star(START, goal)) for goal in goals)
+    assert path_cost(pathfinder, path) == pytest.approx(best)
+
+
+def test_anytime_deadline_before_first_path():
+    pathfinder = make_pathfinder('maze', 0)
+    goal = (pathfinder.environment.objects[0].x, pathfinder.environment.objects[0].y)
+
+    # Délai nul : aucun nœud développé, pas de chemin, recherche non terminée
+    search = pathfinder.anytime_search(START, goal, 0)
+    assert search.nodes_expanded == 0
+    assert pathfinder.anytime_path(search) is None
+    assert not search.done
+    assert pathfinder.anytime_a_star(START, goal, 0) is None
+
+    # Poursuivie en arrière-plan, elle trouve le chemin optimal (ε = 1)
+    search.start_background()
+    search.join(timeout=30)
+    assert search.done
+    path = pathfinder.anytime_path(search)
+    assert path is not None
+    assert path_cost(pathfinder, path) == pytest.approx(path_cost(pathfinder, pathfinder.a_star(START, goal)))
+
+
+def test_anytime_deadline_on_large_maze():
+    env = MapGenerator(0).generate('maze', width=4000, height=4000, num_objects=1, start=START)
+    pathfinder = PathFinder(env)
+    pathfinder.blocked_rows()
+
+    # Cellule atteignable la plus proche du coin opposé
+    cells = reachable_cells(env, START).nonzero()
+    index = (cells[0] + cells[1]).argmax()
+    goal = env.grid_to_pixel(int(cells[1][index]), int(cells[0][index]))
+
+    began = time.perf_counter()
+    search = pathfinder.anytime_search(START, goal, 5)
+    elapsed = time.perf_counter() - began
+
+    # Le délai est respecté même sans premier chemin (marge pour la machine de test)
+    assert elapsed < 0.05
+    search.cancel()
+
+
+def test_blocked_rows_cached():
+    pathfinder = make_pathfinder('rooms', 0)
+    rows = pathfinder.blocked_rows()
+    assert pathfinder.blocked_rows() is rows
+    assert rows == pathfinder.blocked_grid().tolist()
+
+    # Nouvel obstacle : nouvelle grille interdite, listes reconverties
+    pathfinder.environment.add_obstacle(400, 400, 60, 60)
+    assert pathfinder.blocked_rows() is not rows
@@ -0,0 +1,190 @@
+"""
+Tests du profilage optionnel (src/profiling.py) : lecture de ROBOT_PROFILE,
+format « collapsed stacks » (écriture, relecture, piles échantillonnées),
+fichiers par commande et agrégation de plusieurs commandes (et processus).
+
+Usage:
+    python -m pytest -q tests/test_profiling.py
+"""
+
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.profiling import (AGGREGATE_COLLAPSED, AGGREGATE_PROF, MODES, PROFILE_DIR_ENV,
+                           PROFILE_ENV, CommandProfiler, StackSampler, aggregate_profiles,
+                           maybe_profile, parse_modes, profiler_from_env, read_collapsed,
+                           write_collapsed)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, ()),
+    ('', ()),
+    ('  0 ', ()),
+    ('off', ()),
+    ('False', ()),
+    ('1', MODES),
+    ('ALL', MODES),
+    ('yes', MODES),
+    ('cprofile', ('cprofile',)),
+    (' Sample ', ('sample',)),
+    ('sample, cprofile', ('sample', 'cprofile')),
+    ('cprofile,,', ('cprofile',)),
+])
+def test_parse_modes(value, expected):
+    assert parse_modes(value) == expected
+
+
+@pytest.mark.parametrize('value', ['perf', 'cprofile,perf', 'sample;cprofile'])
+def test_parse_modes_rejects_unknown(value):
+    with pytest.raises(ValueError, match='inconnu'):
+        parse_modes(value)
+
+
+def test_profiler_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    assert profiler_from_env() is None
+
+    monkeypatch.setenv(PROFILE_ENV, 'off')
+    assert profiler_from_env() is None
+
+    monkeypatch.setenv(PROFILE_ENV, 'cprofile')
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path / 'profils'))
+    profiler = profiler_from_env()
+    assert profiler.modes == ('cprofile',) and profiler.sampler is None
+    assert profiler.output_dir == str(tmp_path / 'profils') and os.path.isdir(profiler.output_dir)
+
+    # Valeur explicite prioritaire sur l'environnement
+    assert profiler_from_env('0') is None
+    monkeypatch.setenv(PROFILE_ENV, 'inconnu')
+    with pytest.raises(ValueError):
+        profiler_from_env()
+
+
+def test_maybe_profile_without_profiler():
+    with maybe_profile(None, "va au carré rouge") as profiler:
+        assert profiler is None
+
+
+def test_collapsed_format(tmp_path):
+    counts = Counter({
+        'main (main.py:1);run (main.py:10);plan (pathfinding.py:42)': 7,
+        'main (main.py:1);run (main.py:10)': 3,
+        'main (main.py:1);parse (llm_parser.py:5)': 1,
+    })
+    filename = str(tmp_path / 'piles.collapsed')
+    write_collapsed(counts, filename)
+
+    with open(filename, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    # Une pile par ligne (racine;...;feuille), triées, nombre séparé par une espace
+    assert lines == [f"{stack} {counts[stack]}" for stack in sorted(counts)]
+    assert read_collapsed(filename) == counts
+
+
+def test_sampled_stacks_are_collapsed():
+    def busy_leaf(stop):
+        while not stop.is_set():
+            sum(range(100))
+
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_leaf, args=(stop,))
+    thread.start()
+    sampler = StackSampler(interval=0.001)
+    try:
+        counts = sampler.start(thread.ident)
+        deadline = time.monotonic() + 5
+        while sum(counts.values()) < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        counts = sampler.stop()
+    finally:
+        stop.set()
+        thread.join()
+        sampler.close()
+
+    assert sum(counts.values()) >= 20
+    for stack in counts:
+        frames = stack.split(';')
+        # Racine d'abord (démarrage du thread), puis busy_leaf et ses appels : « nom (fichier:ligne) »
+        assert frames[0].startswith('_bootstrap (threading.py:')
+        assert all(frame.endswith(')') and ' (' in frame for frame in frames)
+        leaf = [i for i, frame in enumerate(frames) if frame.startswith('busy_leaf (test_profiling.py:')]
+        assert leaf and len(frames) - leaf[0] <= 2
+    assert sampler.stop() == Counter()
+
+
+def work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_files_per_command(tmp_path):
+    profiler = CommandProfiler(('cprofile',), str(tmp_path))
+    for command in ("va au carré rouge", "va au cercle bleu !"):
+        with profiler.profile(command):
+            work(20000)
+
+    names = [os.path.basename(f) for f in profiler.files]
+    pid = os.getpid()
+    assert names == [f"{pid}-00000-va_au_carr_rouge.prof", f"{pid}-00001-va_au_cercle_bleu.prof"]
+    assert not profiler.active
+
+    # begin() termine le profil encore ouvert
+    profiler.begin("première")
+    profiler.begin("seconde")
+    profiler.end()
+    profiler.end()
+    assert len(profiler.files) == 4
+
+
+def calls_of(filename: str, function: str) -> int:
+    stats = pstats.Stats(filename).stats
+    return sum(nc for (_, _, name), (_, nc, *_) in stats.items() if name == function)
+
+
+def test_aggregate_across_commands(tmp_path):
+    profiler = CommandProfiler(MODES, str(tmp_path), interval=0.001)
+    for i in range(3):
+        with profiler.profile(f"commande {i}"):
+            work(200000 * (i + 1))
+    written = profiler.close()
+
+    assert [os.path.basename(f) for f in written] == [AGGREGATE_PROF, AGGREGATE_COLLAPSED]
+    profs = [f for f in profiler.files if f.endswith('.prof')]
+    collapsed = [f for f in profiler.files if f.endswith('.collapsed')]
+    assert len(profs) == len(collapsed) == 3
+
+    # Appels et échantillons : somme de ceux des commandes
+    aggregate = os.path.join(str(tmp_path), AGGREGATE_PROF)
+    assert calls_of(aggregate, 'work') == 3
+    assert calls_of(aggregate, 'work') == sum(calls_of(f, 'work') for f in profs)
+    total = Counter()
+    for filename in collapsed:
+        total.update(read_collapsed(filename))
+    assert read_collapsed(os.path.join(str(tmp_path), AGGREGATE_COLLAPSED)) == total
+
+    # Agréger à nouveau ignore les agrégats existants
+    assert aggregate_profiles(str(tmp_path)) == written
+    assert calls_of(aggregate, 'work') == 3
+    assert read_collapsed(os.path.join(str(tmp_path), AGGREGATE_COLLAPSED)) == total
+
+
+def test_aggregate_across_processes(tmp_path):
+    # Fichiers de plusieurs processus (run_parallel) dans le même répertoire
+    write_collapsed({'a;b': 2, 'a;c': 1}, str(tmp_path / '101-00000-x.collapsed'))
+    write_collapsed({'a;b': 5}, str(tmp_path / '202-00000-y.collapsed'))
+    write_collapsed({'a;d': 4}, str(tmp_path / '202-00001-z.collapsed'))
+
+    assert aggregate_profiles(str(tmp_path)) == [str(tmp_path / AGGREGATE_COLLAPSED)]
+    assert read_collapsed(str(tmp_path / AGGREGATE_COLLAPSED)) == {'a;b': 7, 'a;c': 1, 'a;d': 4}
+
+
+def test_aggregate_empty_or_missing_directory(tmp_path):
+    assert aggregate_profiles(str(tmp_path)) == []
+    assert aggregate_profiles(str(tmp_path / 'absent')) == []
@@ -0,0 +1,173 @@
+"""
+Tests de la décomposition en feuilles (src/quadtree.py) et de la recherche
+sur les feuilles (PathFinder.quadtree_a_star) sur des cartes générées
+Les feuilles couvrent exactement les cellules libres ; les chemins ne
+traversent aucune cellule interdite, restent proches en longueur de ceux de
+a_star, et valent None quand le but est inatteignable.
+
+Usage:
+    python -m pytest -q tests/test_quadtree.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.environment import Environment
+from src.map_generator import MAP_TYPES, MapGenerator
+from src.pathfinding import PathFinder
+from src.quadtree import MAX_LEAF_SIZE, QuadTree
+
+
+START = (100, 100)
+SEEDS = (0, 1, 2)
+
+# Longueur des chemins sur les feuilles rapportée à celle de a_star (chemins
+# simplifiés) : mesurée sous 1,11 sur les cartes 6000×6000
+MAX_LENGTH_RATIO = 1.25
+
+
+def make_pathfinder(map_type: str, seed: int, raw: bool = False) -> PathFinder:
+    """PathFinder en mode quadtree sur une carte générée (raw : chemins non simplifiés)"""
+    env = MapGenerator(seed).generate(map_type, width=1000, height=1000, num_objects=6, start=START)
+    pathfinder = PathFinder(env, quadtree=True)
+    if raw:
+        pathfinder.simplify_path = lambda path: path
+    return pathfinder
+
+
+def length(path) -> float:
+    return sum(((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) ** 0.5 for a, b in zip(path, path[1:]))
+
+
+def crossed_cells(env: Environment, path, samples: int = 64) -> set:
+    """Cellules traversées par les segments d'un chemin (points échantillonnés)"""
+    cells = set()
+    t = (np.arange(samples) + 0.5) / samples   # jamais 0,5 : évite le coin exact d'un pas diagonal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        for x, y in zip(x0 + t * (x1 - x0), y0 + t * (y1 - y0)):
+            cells.add(env.pixel_to_grid(int(x), int(y)))
+    return cells
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_leaves_cover_free_cells(map_type, seed):
+    blocked = make_pathfinder(map_type, seed).blocked_grid()
+    tree = QuadTree(blocked)
+
+    covered = np.zeros(blocked.shape, dtype=np.int32)
+    for x0, y0, width, height in tree.leaves.tolist():
+        assert 1 <= width <= MAX_LEAF_SIZE and 1 <= height <= MAX_LEAF_SIZE
+        assert not blocked[y0:y0 + height, x0:x0 + width].any()
+        covered[y0:y0 + height, x0:x0 + width] += 1
+
+    # Chaque cellule libre dans exactement une feuille, leaf_of cohérent
+    assert (covered == ~blocked).all()
+    assert ((tree.leaf_of >= 0) == ~blocked).all()
+
+
+def test_neighbors_are_symmetric():
+    tree = make_pathfinder('rooms', 0).quadtree()
+    for leaf in range(len(tree)):
+        for neighbor in tree.neighbors(leaf):
+            assert leaf in tree.neighbors(neighbor)
+            (ax, ay), (bx, by) = tree.transition(leaf, neighbor)
+            assert tree.leaf_at(ax, ay) == leaf and tree.leaf_at(bx, by) == neighbor
+            assert max(abs(ax - bx), abs(ay - by)) == 1
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_paths_avoid_blocked_cells(map_type, seed):
+    pathfinder = make_pathfinder(map_type, seed, raw=True)
+    env = pathfinder.environment
+    blocked = pathfinder.blocked_grid()
+
+    for obj in env.objects:
+        path = pathfinder.quadtree_a_star(START, (obj.x, obj.y))
+        assert path is not None
+        assert path[0] == env.grid_to_pixel(*env.pixel_to_grid(*START))
+        assert path[-1] == env.grid_to_pixel(*env.pixel_to_grid(obj.x, obj.y))
+        assert not any(blocked[y, x] for x, y in crossed_cells(env, path))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_length_close_to_a_star(map_type, seed):
+    pathfinder = make_pathfinder(map_type, seed)
+
+    for obj in pathfinder.environment.objects:
+        goal = (obj.x, obj.y)
+        expected = pathfinder.a_star(START, goal)
+        path = pathfinder.quadtree_a_star(START, goal)
+        assert path is not None and expected is not None
+
+        # Chemin simplifié : segments libres selon is_line_clear, comme pour a_star
+        assert all(pathfinder.is_line_clear(a, b) for a, b in zip(path, path[1:]))
+        assert length(path) <= MAX_LENGTH_RATIO * length(expected) + 1e-6
+
+
+def test_fewer_nodes_than_grid():
+    pathfinder = make_pathfinder('maze', 0)
+    grid = make_pathfinder('maze', 0)
+    for obj in pathfinder.environment.objects:
+        pathfinder.quadtree_a_star(START, (obj.x, obj.y))
+        grid.a_star(START, (obj.x, obj.y))
+    assert pathfinder.nodes_expanded < grid.nodes_expanded
+
+
+@pytest.mark.parametrize('map_type', MAP_TYPES)
+def test_unreachable_goal(map_type):
+    pathfinder = make_pathfinder(map_type, 0)
+    env = pathfinder.environment
+    obj = env.objects[0]
+
+    # Anneau d'obstacles autour de l'objet : but libre mais isolé
+    x, y = env.grid_to_pixel(*env.pixel_to_grid(obj.x, obj.y))
+    outer, wall = 100, 20
+    env.add_obstacle(x - outer, y - outer, 2 * outer, wall)
+    env.add_obstacle(x - outer, y + outer - wall, 2 * outer, wall)
+    env.add_obstacle(x - outer, y - outer, wall, 2 * outer)
+    env.add_obstacle(x + outer - wall, y - outer, wall, 2 * outer)
+    assert pathfinder.quadtree().leaf_at(*env.pixel_to_grid(x, y)) >= 0
+
+    assert pathfinder.quadtree_a_star(START, (x, y)) is None
+
+
+def test_blocked_goal():
+    pathfinder = make_pathfinder('rectangles', 0)
+    obstacle = pathfinder.environment.obstacles[0]
+    goal = (obstacle.x + obstacle.width // 2, obstacle.y + obstacle.height // 2)
+    assert pathfinder.quadtree().leaf_at(*pathfinder.environment.pixel_to_grid(*goal)) < 0
+
+    assert pathfinder.quadtree_a_star(START, goal) is None
+
+
+def test_start_and_goal_in_same_leaf():
+    env = Environment(width=400, height=400, grid_size=20)
+    pathfinder = PathFinder(env, quadtree=True)
+    tree = pathfinder.quadtree()
+    goal = (250, 170)
+    assert tree.leaf_at(*env.pixel_to_grid(*START)) == tree.leaf_at(*env.pixel_to_grid(*goal))
+
+    # Une seule feuille : ligne droite, aucun autre nœud développé
+    path = pathfinder.quadtree_a_star(START, goal)
+    assert path == [env.grid_to_pixel(*env.pixel_to_grid(*START)), env.grid_to_pixel(*env.pixel_to_grid(*goal))]
+    assert pathfinder.nodes_expanded == 1
+
+    # Même cellule : chemin réduit au point de départ
+    assert pathfinder.quadtree_a_star(START, (105, 105)) == [env.grid_to_pixel(*env.pixel_to_grid(*START))]
+
+
+def test_tree_rebuilt_after_new_obstacle():
+    pathfinder = make_pathfinder('rooms', 0)
+    tree = pathfinder.quadtree()
+    assert pathfinder.quadtree() is tree
+
+    pathfinder.environment.add_obstacle(500, 500, 60, 60)
+    assert pathfinder.quadtree() is not tree
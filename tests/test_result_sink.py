@@ -0,0 +1,190 @@
+"""
+Tests de l'écriture en continu des résultats (src/result_sink.py) : JSONL et
+CSV, compression gzip, en-tête CSV écrit une seule fois en ajout à un
+fichier existant, choix du format par open_sink selon l'extension, et
+branchement sur l'Evaluator.
+
+Usage:
+    python -m pytest -q tests/test_result_sink.py
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.evaluator import Evaluator
+from src.result_sink import CSV_COLUMNS, CSVSink, JSONLSink, open_sink
+from src.robot import Robot
+
+
+def make_result(i: int) -> dict:
+    return {
+        'command': f"va au carré rouge {i}",
+        'environment': 'Simple',
+        'success': np.bool_(i % 2 == 0),      # comme has_reached_target
+        'actions_count': i * 3,
+        'path_length': np.int64(i + 1),
+        'execution_time': 0.25 * i,
+        'start_time': 1000.0 + i,
+        'end_time': 1000.25 + i,
+        'reasoning_steps': ["étape 1", "étape 2"],
+        'phases': {'parse': 1.5, 'plan': 2.25 * i},
+        'counters': {'nodes_expanded': 10 * i},
+    }
+
+
+def read_text(filename: str) -> str:
+    if filename.endswith('.gz'):
+        with gzip.open(filename, 'rt', encoding='utf-8', newline='') as f:
+            return f.read()
+    with open(filename, encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def read_jsonl(filename: str):
+    return [json.loads(line) for line in read_text(filename).splitlines()]
+
+
+def read_csv(filename: str):
+    return list(csv.DictReader(io.StringIO(read_text(filename))))
+
+
+@pytest.mark.parametrize('name', ['resultats.jsonl', 'resultats.jsonl.gz'])
+def test_jsonl_round_trip(tmp_path, name):
+    filename = str(tmp_path / name)
+    with JSONLSink(filename) as sink:
+        for i in range(3):
+            sink.write(make_result(i))
+
+    rows = read_jsonl(filename)
+    assert [row['command'] for row in rows] == [f"va au carré rouge {i}" for i in range(3)]
+    assert [row['success'] for row in rows] == [True, False, True]
+    assert rows[2]['phases'] == {'parse': 1.5, 'plan': 4.5}
+    assert rows[1]['counters'] == {'nodes_expanded': 10} and rows[1]['path_length'] == 2
+
+
+@pytest.mark.parametrize('name', ['resultats.csv', 'resultats.csv.gz'])
+def test_csv_columns(tmp_path, name):
+    filename = str(tmp_path / name)
+    with CSVSink(filename) as sink:
+        for i in range(2):
+            sink.write(make_result(i))
+
+    text = read_text(filename)
+    assert text.splitlines()[0] == ','.join(CSV_COLUMNS)
+    rows = read_csv(filename)
+    assert [row['success'] for row in rows] == ['True', 'False']
+    assert rows[1]['plan_ms'] == '2.250' and rows[1]['parse_ms'] == '1.500'
+    assert rows[1]['nodes_expanded'] == '10' and rows[0]['collision_checks'] == ''
+    assert rows[0]['reasoning_steps'] == "étape 1 | étape 2"
+
+
+def test_gzip_is_compressed(tmp_path):
+    filename = str(tmp_path / 'resultats.jsonl.gz')
+    with JSONLSink(filename) as sink:
+        for i in range(200):
+            sink.write(make_result(i))
+
+    with open(filename, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+    assert os.path.getsize(filename) < len(read_text(filename).encode('utf-8')) / 4
+
+
+@pytest.mark.parametrize('name', ['resultats.csv', 'resultats.csv.gz'])
+def test_csv_header_written_once_when_appending(tmp_path, name):
+    filename = str(tmp_path / name)
+    for run in range(3):
+        with CSVSink(filename) as sink:
+            assert sink.is_new == (run == 0)
+            sink.write(make_result(run))
+
+    lines = read_text(filename).splitlines()
+    assert lines.count(','.join(CSV_COLUMNS)) == 1 and lines[0] == ','.join(CSV_COLUMNS)
+    assert [row['command'] for row in read_csv(filename)] == [f"va au carré rouge {i}" for i in range(3)]
+
+
+def test_csv_header_written_for_empty_existing_file(tmp_path):
+    filename = tmp_path / 'resultats.csv'
+    filename.write_text('')
+    with CSVSink(str(filename)) as sink:
+        sink.write(make_result(0))
+    assert read_text(str(filename)).splitlines()[0] == ','.join(CSV_COLUMNS)
+
+
+def test_jsonl_appends_to_existing_file(tmp_path):
+    filename = str(tmp_path / 'resultats.jsonl.gz')
+    for run in range(2):
+        with JSONLSink(filename) as sink:
+            sink.write(make_result(run))
+    assert [row['command'] for row in read_jsonl(filename)] == ["va au carré rouge 0", "va au carré rouge 1"]
+
+
+@pytest.mark.parametrize('name, sink_class', [
+    ('r.jsonl', JSONLSink),
+    ('r.json', JSONLSink),
+    ('r.txt', JSONLSink),
+    ('r.jsonl.gz', JSONLSink),
+    ('r.csv', CSVSink),
+    ('r.csv.gz', CSVSink),
+    ('r.gz', JSONLSink),
+])
+def test_open_sink_by_extension(tmp_path, name, sink_class):
+    filename = str(tmp_path / name)
+    with open_sink(filename) as sink:
+        assert type(sink) is sink_class
+        sink.write(make_result(1))
+
+    with open(filename, 'rb') as f:
+        assert (f.read(2) == b'\x1f\x8b') == name.endswith('.gz')
+    if sink_class is CSVSink:
+        assert read_csv(filename)[0]['command'] == "va au carré rouge 1"
+    else:
+        assert read_jsonl(filename)[0]['command'] == "va au carré rouge 1"
+
+
+def test_open_sink_passes_options(tmp_path):
+    sink = open_sink(str(tmp_path / 'r.csv'), flush_every=5, columns=['command', 'success'])
+    sink.write(make_result(0))
+    sink.close()
+    sink.close()        # fermeture idempotente
+    assert sink.flush_every == 5
+    assert read_text(sink.filename).splitlines() == ['command,success', 'va au carré rouge 0,True']
+
+
+def test_flush_every(tmp_path):
+    filename = str(tmp_path / 'resultats.jsonl')
+    sink = JSONLSink(filename, flush_every=3)
+    for i in range(2):
+        sink.write(make_result(i))
+    assert read_text(filename) == ""
+
+    sink.write(make_result(2))
+    assert len(read_jsonl(filename)) == 3
+    sink.close()
+
+
+def test_evaluator_writes_each_result(tmp_path):
+    filename = str(tmp_path / 'resultats.csv')
+    evaluator = Evaluator(sink=open_sink(filename), keep_results=False)
+    robot = Robot(x=100, y=100, size=25)
+    for i in range(3):
+        evaluator.start_test(f"commande {i}", 'Simple')
+        with evaluator.span('plan'):
+            pass
+        evaluator.end_test(i != 1, robot)
+
+        # Écrit dès la fin de la commande
+        assert len(read_csv(filename)) == i + 1
+    evaluator.close()
+
+    rows = read_csv(filename)
+    assert [row['success'] for row in rows] == ['True', 'False', 'True']
+    assert all(row['plan_ms'] for row in rows) and evaluator.results == []
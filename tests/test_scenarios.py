@@ -9,96 +9,110 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.environment import Environment
+from src.environment import Environment, EnvironmentSnapshot
 from src.robot import Robot
 from src.nlp_parser import NLPParser
 from src.pathfinding import PathFinder
 from src.evaluator import Evaluator
+from src.profiling import maybe_profile, profiler_from_env
 
 
-def run_test_scenario(env_name: str, env_setup_func, commands: list, headless: bool = False):
-    """
-    Exécute un scénario de test complet
+# Scénarios : (nom, méthode de création de l'environnement, commandes)
+SCENARIOS = [
+    ("Simple", 'create_simple_environment', [
+        "Va vers le carre rouge",
+        "Va vers le cercle bleu",
+        "Atteins le carre vert",
+        "Va vers le rouge",
+        "Deplace-toi vers le bleu"
+    ]),
+    ("Labyrinthe", 'create_maze_environment', [
+        "Va vers le carre rouge",
+        "Atteins le cercle bleu",
+        "Va vers le rouge",
+    ]),
+    ("Ouvert", 'create_open_environment', [
+        "Va vers le carre rouge",
+        "Va vers le cercle bleu",
+        "Atteins le carre vert",
+        "Va vers le cercle jaune",
+        "Va vers le vert"
+    ]),
+]
 
-    Args:
-        env_name: Nom de l'environnement
-        env_setup_func: Fonction pour configurer l'environnement
-        commands: Liste de commandes à tester
-        headless: Si True, ne pas afficher la fenêtre (plus rapide)
-    """
-    print("\n" + "="*60)
-    print(f"TEST SCENARIO: {env_name}")
-    print("="*60)
+# Instantanés des environnements de scénario, construits une fois par processus
+_SNAPSHOTS = {}
 
-    # Initialiser les composants
-    if not headless:
-        env = Environment(width=800, height=600, grid_size=20)
-    else:
-        # Mode headless pour tests rapides
-        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+def scenario_snapshot(setup_method: str) -> EnvironmentSnapshot:
+    """Instantané de l'environnement créé par setup_method (mis en cache)"""
+    if setup_method not in _SNAPSHOTS:
         env = Environment(width=800, height=600, grid_size=20)
+        getattr(env, setup_method)()
+        _SNAPSHOTS[setup_method] = env.snapshot()
+    return _SNAPSHOTS[setup_method]
 
-    robot = Robot(x=100, y=100, size=25)
-    parser = NLPParser()
-    pathfinder = PathFinder(env)
-    evaluator = Evaluator()
 
-    # Configurer l'environnement
-    env_setup_func(env)
+def run_command(command: str, env_name: str, env, robot, parser, pathfinder,
+                evaluator, headless: bool = True) -> bool:
+    """
+    Exécute une commande de test et enregistre le résultat dans evaluator
 
-    print(f"\nEnvironnement: {env_name}")
-    print(f"Nombre de tests: {len(commands)}")
-    print(f"Objets disponibles: {len(env.objects)}")
-    print(f"Obstacles: {len(env.obstacles)}\n")
+    Le robot est réinitialisé à la fin.
 
-    # Exécuter chaque commande
-    for i, command in enumerate(commands, 1):
-        print(f"\n[Test {i}/{len(commands)}] Commande: '{command}'")
+    Returns:
+        True si la cible a été atteinte
+    """
+    evaluator.reset_spans()
 
-        # Parser la commande
+    # Parser la commande
+    with evaluator.span('parse'):
         parsed = parser.parse_command(command)
-        print(f"  Parse: color={parsed['color']}, shape={parsed['shape']}")
+    print(f"  Parse: color={parsed['color']}, shape={parsed['shape']}")
 
-        # Trouver la cible
+    # Trouver la cible
+    with evaluator.span('lookup'):
         target = env.find_object(parsed['color'], parsed['shape'])
 
-        if target is None:
-            print(f"  ECHEC: Cible non trouvee")
-            evaluator.start_test(command, env_name)
-            evaluator.end_test(False, robot)
-            robot.reset()
-            continue
+    if target is None:
+        print(f"  ECHEC: Cible non trouvee")
+        evaluator.start_test(command, env_name)
+        evaluator.end_test(False, robot)
+        robot.reset()
+        return False
 
-        # Générer le raisonnement
-        reasoning_steps = robot.generate_reasoning(command, target, env)
-        for step in reasoning_steps:
-            robot.add_reasoning_step(step)
+    # Générer le raisonnement
+    reasoning_steps = robot.generate_reasoning(command, target, env)
+    for step in reasoning_steps:
+        robot.add_reasoning_step(step)
 
-        # Planifier le chemin
+    # Planifier le chemin
+    with evaluator.span('plan'):
         path = pathfinder.find_path_to_target(
             robot.get_position(),
             (target.x, target.y)
         )
 
-        if path is None:
-            print(f"  ECHEC: Aucun chemin trouve")
-            evaluator.start_test(command, env_name)
-            evaluator.end_test(False, robot)
-            robot.reset()
-            continue
+    if path is None:
+        print(f"  ECHEC: Aucun chemin trouve")
+        evaluator.start_test(command, env_name)
+        evaluator.end_test(False, robot)
+        robot.reset()
+        return False
 
-        print(f"  Chemin: {len(path)} waypoints")
+    print(f"  Chemin: {len(path)} waypoints")
 
-        # Définir le chemin
-        robot.set_path(path)
+    # Définir le chemin
+    robot.set_path(path)
 
-        # Démarrer l'évaluation
-        evaluator.start_test(command, env_name)
+    # Démarrer l'évaluation
+    evaluator.start_test(command, env_name)
 
-        # Simuler le mouvement (mode rapide)
-        max_iterations = 1000
-        iterations = 0
+    # Simuler le mouvement (mode rapide)
+    max_iterations = 1000
+    iterations = 0
 
+    with evaluator.span('execute'):
         while not robot.reached_target and iterations < max_iterations:
             robot.move_along_path()
             iterations += 1
@@ -108,117 +122,133 @@ def run_test_scenario(env_name: str, env_setup_func, commands: list, headless: b
                 env.draw(robot)
                 pygame.display.flip()
 
-        # Vérifier le succès
-        success = robot.has_reached_target(target.x, target.y)
+    # Vérifier le succès
+    success = robot.has_reached_target(target.x, target.y)
 
-        if success:
-            print(f"  SUCCES: Cible atteinte en {robot.total_actions} actions")
-        else:
-            print(f"  ECHEC: Cible non atteinte apres {iterations} iterations")
+    if success:
+        print(f"  SUCCES: Cible atteinte en {robot.total_actions} actions")
+    else:
+        print(f"  ECHEC: Cible non atteinte apres {iterations} iterations")
 
-        # Terminer l'évaluation
-        evaluator.end_test(success, robot)
+    # Terminer l'évaluation
+    evaluator.end_test(success, robot)
 
-        # Réinitialiser le robot
-        robot.reset()
+    # Réinitialiser le robot
+    robot.reset()
 
-    # Afficher le résumé
-    evaluator.print_summary()
+    return success
 
-    return evaluator
 
+def run_test_scenario(env_name: str, env_setup_func, commands: list, headless: bool = False,
+                      profiler=None, snapshot: EnvironmentSnapshot = None):
+    """
+    Exécute un scénario de test complet
 
-def main():
-    """Fonction principale des tests"""
-    print("="*60)
-    print("TESTS AUTOMATIQUES - ROBOT VIRTUEL")
+    Args:
+        env_name: Nom de l'environnement
+        env_setup_func: Fonction pour configurer l'environnement
+        commands: Liste de commandes à tester
+        headless: Si True, ne pas afficher la fenêtre (plus rapide)
+        profiler: CommandProfiler optionnel (ROBOT_PROFILE)
+        snapshot: Instantané de l'environnement configuré ; remplace
+                  env_setup_func et est restauré avant chaque commande
+    """
+    print("\n" + "="*60)
+    print(f"TEST SCENARIO: {env_name}")
     print("="*60)
 
-    all_evaluators = []
+    # Initialiser les composants
+    if headless:
+        # Mode headless pour tests rapides
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    if snapshot is not None:
+        env = Environment.from_snapshot(snapshot)
+    else:
+        env = Environment(width=800, height=600, grid_size=20)
+        env_setup_func(env)
+    if not headless:
+        env.init_display()
 
-    # Test 1 : Environnement Simple
-    simple_commands = [
-        "Va vers le carre rouge",
-        "Va vers le cercle bleu",
-        "Atteins le carre vert",
-        "Va vers le rouge",
-        "Deplace-toi vers le bleu"
-    ]
-    evaluator1 = run_test_scenario(
-        "Simple",
-        lambda e: e.create_simple_environment(),
-        simple_commands,
-        headless=True
-    )
-    all_evaluators.append(evaluator1)
-
-    # Test 2 : Environnement Labyrinthe
-    maze_commands = [
-        "Va vers le carre rouge",
-        "Atteins le cercle bleu",
-        "Va vers le rouge",
-    ]
-    evaluator2 = run_test_scenario(
-        "Labyrinthe",
-        lambda e: e.create_maze_environment(),
-        maze_commands,
-        headless=True
-    )
-    all_evaluators.append(evaluator2)
-
-    # Test 3 : Environnement Ouvert
-    open_commands = [
-        "Va vers le carre rouge",
-        "Va vers le cercle bleu",
-        "Atteins le carre vert",
-        "Va vers le cercle jaune",
-        "Va vers le vert"
-    ]
-    evaluator3 = run_test_scenario(
-        "Ouvert",
-        lambda e: e.create_open_environment(),
-        open_commands,
-        headless=True
-    )
-    all_evaluators.append(evaluator3)
-
-    # Résumé global
+    robot = Robot(x=100, y=100, size=25)
+    parser = NLPParser()
+    evaluator = Evaluator()
+    pathfinder = PathFinder(env, evaluator=evaluator)
+
+    print(f"\nEnvironnement: {env_name}")
+    print(f"Nombre de tests: {len(commands)}")
+    print(f"Objets disponibles: {len(env.objects)}")
+    print(f"Obstacles: {len(env.obstacles)}\n")
+
+    # Exécuter chaque commande
+    for i, command in enumerate(commands, 1):
+        print(f"\n[Test {i}/{len(commands)}] Commande: '{command}'")
+        if snapshot is not None:
+            env.restore(snapshot)
+        with maybe_profile(profiler, command):
+            run_command(command, env_name, env, robot, parser, pathfinder, evaluator, headless)
+
+    # Afficher le résumé
+    evaluator.print_summary()
+
+    return evaluator
+
+
+def print_global_summary(evaluators: list):
+    """Affiche le résumé global de plusieurs scénarios"""
     print("\n" + "="*60)
     print("RESUME GLOBAL DE TOUS LES TESTS")
     print("="*60)
 
-    total_tests = sum(len(e.results) for e in all_evaluators)
-    total_successes = sum(sum(1 for r in e.results if r['success']) for e in all_evaluators)
-    global_success_rate = (total_successes / total_tests * 100) if total_tests > 0 else 0
+    # Agrégats cumulés de tous les scénarios
+    merged = Evaluator.merge(evaluators)
+    total_tests = merged.total_tests
+    total_successes = merged.successes
 
     print(f"\nNombre total de tests: {total_tests}")
     print(f"Nombre de succes: {total_successes}")
     print(f"Nombre d'echecs: {total_tests - total_successes}")
-    print(f"Taux de reussite global: {global_success_rate:.1f}%")
-
-    # Calculer les moyennes globales
-    all_actions = []
-    all_times = []
+    print(f"Taux de reussite global: {merged.get_success_rate():.1f}%")
 
-    for evaluator in all_evaluators:
-        for result in evaluator.results:
-            if result['success']:
-                all_actions.append(result['actions_count'])
-                all_times.append(result['execution_time'])
+    if total_successes:
+        print(f"Actions moyennes: {merged.get_average_actions():.1f}")
+        print(f"Temps moyen: {merged.get_average_execution_time():.2f}s")
 
-    if all_actions:
-        avg_actions = sum(all_actions) / len(all_actions)
-        avg_time = sum(all_times) / len(all_times)
-        print(f"Actions moyennes: {avg_actions:.1f}")
-        print(f"Temps moyen: {avg_time:.2f}s")
+    # Percentiles par phase, tous scénarios confondus
+    merged.print_phase_report()
 
     print("\n" + "="*60)
 
+
+def main():
+    """Fonction principale des tests"""
+    print("="*60)
+    print("TESTS AUTOMATIQUES - ROBOT VIRTUEL")
+    print("="*60)
+
+    all_evaluators = []
+    profiler = profiler_from_env()
+
+    for env_name, setup_method, commands in SCENARIOS:
+        evaluator = run_test_scenario(
+            env_name,
+            lambda e, method=setup_method: getattr(e, method)(),
+            commands,
+            headless=True,
+            profiler=profiler,
+            snapshot=scenario_snapshot(setup_method)
+        )
+        all_evaluators.append(evaluator)
+
+    print_global_summary(all_evaluators)
+
     # Exporter les résultats
     print("\nExportation des resultats...")
     for i, evaluator in enumerate(all_evaluators, 1):
         evaluator.export_results(f"test_results_{i}.txt")
 
+    if profiler is not None:
+        profiler.close()
+
     pygame.quit()
     print("\nTests termines !")
 
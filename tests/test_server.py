@@ -0,0 +1,155 @@
+"""
+Tests des erreurs du service HTTP (server.py) : corps invalides et
+suppression d'une session pendant une attente ; événements diffusés par une
+session (src/service.py) et annulation d'une attente
+
+Usage:
+    python -m pytest -q tests/test_server.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from server import create_app
+from src.nlp_parser import NLPParser
+from src.service import SessionManager
+
+
+def run_with_client(scenario):
+    """Exécute scenario(client) contre une application de test"""
+    async def main():
+        client = TestClient(TestServer(create_app(NLPParser(), tick_rate=0)))
+        await client.start_server()
+        try:
+            await scenario(client)
+        finally:
+            await client.close()
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('body', [
+    '{"env": ',                       # JSON tronqué
+    '[1, 2]',                         # pas un objet
+    '"simple"',
+    '{"tick_rate": "vite"}',          # nombres invalides
+    '{"steps_per_tick": [1]}',
+    '{"steps_per_tick": true}',
+    '{"steps_per_tick": 1e999}',
+    '{"env": 3}',
+])
+def test_create_session_rejects_bad_body(body):
+    async def scenario(client):
+        response = await client.post('/sessions', data=body,
+                                     headers={'Content-Type': 'application/json'})
+        assert response.status == 400
+        assert 'error' in await response.json()
+        assert (await (await client.get('/sessions')).json()) == []
+
+    run_with_client(scenario)
+
+
+def test_create_session_converts_numbers():
+    async def scenario(client):
+        response = await client.post('/sessions', json={'tick_rate': '30', 'steps_per_tick': 2.0})
+        assert response.status == 201
+
+    run_with_client(scenario)
+
+
+@pytest.mark.parametrize('body', ['{"command": ', '["va vers le rouge"]'])
+def test_post_command_rejects_bad_body(body):
+    async def scenario(client):
+        session = await (await client.post('/sessions', json={})).json()
+        response = await client.post(f"/sessions/{session['session_id']}/commands", data=body,
+                                     headers={'Content-Type': 'application/json'})
+        assert response.status == 400
+
+    run_with_client(scenario)
+
+
+def test_delete_session_while_waiting():
+    async def scenario(client):
+        # Robot lent : la commande est encore en cours à la suppression
+        session = await (await client.post('/sessions', json={'tick_rate': 1})).json()
+        url = f"/sessions/{session['session_id']}"
+
+        waiting = asyncio.ensure_future(
+            client.post(f"{url}/commands", json={'command': 'va vers le carré rouge', 'wait': True}))
+        await asyncio.sleep(0.2)
+        assert (await client.delete(url)).status == 200
+
+        response = await waiting
+        assert response.status == 409
+        assert 'error' in await response.json()
+
+    run_with_client(scenario)
+
+
+class TwoTargetsParser:
+    """Parser fixe : carré rouge puis cercle bleu"""
+
+    def parse_command(self, command):
+        return {'targets': [{'color': 'rouge', 'shape': 'square', 'type': 'waypoint'},
+                            {'color': 'bleu', 'shape': 'circle', 'type': 'target'}]}
+
+
+def run_with_session(scenario, parser=None, **options):
+    """Exécute scenario(session) sur une session d'un SessionManager"""
+    async def main():
+        manager = SessionManager(parser or NLPParser(), **options)
+        try:
+            await scenario(manager.create('simple'))
+        finally:
+            await manager.close_all()
+
+    asyncio.run(main())
+
+
+def test_session_events_follow_execution():
+    async def scenario(session):
+        subscriber = session.subscribe()
+        result = await session.wait_result(session.submit('carré rouge puis cercle bleu'))
+        assert result['success'] and result['reached'] == 2
+
+        events = []
+        while not subscriber.empty():
+            events.append(subscriber.get_nowait())
+        types = [event['type'] for event in events]
+        assert types[:3] == ['state', 'command_started', 'path']
+        assert types[-1] == 'command_finished' and types.count('target_reached') == 2
+
+        # Chaque cible : son chemin, ses positions, puis son arrivée
+        paths = [i for i, event in enumerate(events) if event['type'] == 'path']
+        reached = [i for i, event in enumerate(events) if event['type'] == 'target_reached']
+        for index, (path, arrival) in enumerate(zip(paths, reached)):
+            assert path < arrival and events[path]['target'] == events[arrival]['target'] == index
+            assert set(types[path + 1:arrival]) == {'position'}
+            assert all(event['target'] == index for event in events[path + 1:arrival])
+
+    run_with_session(scenario, TwoTargetsParser(), tick_rate=0, steps_per_tick=3)
+
+
+def test_cancelled_wait_keeps_command():
+    async def scenario(session):
+        command_id = session.submit('va vers le carré rouge')
+
+        # Requête annulée (client déconnecté) : la commande continue
+        waiting = asyncio.ensure_future(session.wait_result(command_id))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert (await session.wait_result(command_id))['success']
+
+    run_with_session(scenario, tick_rate=1000)
@@ -0,0 +1,137 @@
+"""
+Tests des instantanés d'environnement (Environment.snapshot / restore) :
+tableaux en lecture seule, copie à la première modification (ni la source
+ni les autres environnements restaurés ne voient les changements), et
+restauration complète de l'état antérieur (entités, grilles, planification).
+
+Usage:
+    python -m pytest -q tests/test_snapshot.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.environment import Environment
+from src.map_generator import MapGenerator
+from src.pathfinding import PathFinder
+
+
+START = (100, 100)
+
+
+@pytest.fixture
+def env():
+    env = MapGenerator(2).generate('rooms', width=1000, height=800, num_objects=6, start=START)
+    env.distance_field()
+    return env
+
+
+def state_of(env: Environment):
+    """État observable d'un environnement (copies)"""
+    return {
+        'obstacles': env.obstacles.rows().tolist(),
+        'objects': [(obj.x, obj.y, obj.size, obj.color, obj.shape) for obj in env.objects],
+        'occupancy': env.occupancy_grid().copy(),
+        'distance': np.array(env.distance_field()),
+        'cspace': env.cspace_grid(10).copy(),
+    }
+
+
+def assert_same_state(env: Environment, expected):
+    actual = state_of(env)
+    assert actual['obstacles'] == expected['obstacles']
+    assert actual['objects'] == expected['objects']
+    for grid in ('occupancy', 'distance', 'cspace'):
+        np.testing.assert_array_equal(actual[grid], expected[grid])
+
+
+def modify(env: Environment):
+    """Modifie l'environnement par toutes les voies possibles"""
+    env.add_obstacle(400, 300, 80, 80)
+    env.obstacles[0].width += 40
+    env.add_object(600, 500, 'jaune', 'circle')
+    env.objects[0].x += 25
+    env.objects[1].color = 'violet'
+
+
+def test_arrays_are_read_only(env):
+    snapshot = env.snapshot()
+    arrays = [snapshot.objects, snapshot.obstacles, snapshot.distance, *snapshot.occupancy.values()]
+    assert snapshot.occupancy and snapshot.distance is not None
+
+    for array in arrays:
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[(0,) * array.ndim] = 1
+
+
+def test_snapshot_unaffected_by_source(env):
+    snapshot = env.snapshot()
+    expected = state_of(Environment.from_snapshot(snapshot))
+    modify(env)
+
+    # La source a changé, pas l'instantané
+    assert env.obstacles.rows().tolist() != expected['obstacles']
+    assert_same_state(Environment.from_snapshot(snapshot), expected)
+
+
+def test_copy_on_write_between_restored_environments(env):
+    snapshot = env.snapshot()
+    first = Environment.from_snapshot(snapshot)
+    second = Environment.from_snapshot(snapshot)
+    expected = state_of(second)
+
+    # Partagés sans copie tant que rien n'est modifié
+    assert np.shares_memory(first.obstacles.rows(), snapshot.obstacles)
+    assert first.occupancy_grid() is snapshot.occupancy[next(iter(snapshot.occupancy))]
+
+    modify(first)
+    assert not np.shares_memory(first.obstacles.rows(), snapshot.obstacles)
+    assert not np.shares_memory(first.objects.rows(), snapshot.objects)
+    assert first.obstacles.rows().tolist() != expected['obstacles']
+    assert_same_state(second, expected)
+    assert_same_state(Environment.from_snapshot(snapshot), expected)
+
+
+def test_restore_brings_back_everything(env):
+    pathfinder = PathFinder(env)
+    goals = [(obj.x, obj.y) for obj in env.objects]
+    paths = [pathfinder.find_path_to_target(START, goal) for goal in goals]
+    expected = state_of(env)
+    snapshot = env.snapshot()
+
+    modify(env)
+    env.cspace_grid(10)
+    env.clearance_penalty(60)
+    assert env.obstacles.rows().tolist() != expected['obstacles']
+
+    env.restore(snapshot)
+    assert_same_state(env, expected)
+    assert [pathfinder.find_path_to_target(START, goal) for goal in goals] == paths
+
+    # Caches recalculés après restauration : identiques à ceux d'un environnement neuf
+    fresh = Environment(env.width, env.height, env.grid_size)
+    for x, y, width, height in expected['obstacles']:
+        fresh.add_obstacle(x, y, width, height)
+    np.testing.assert_array_equal(env.clearance_penalty(60), fresh.clearance_penalty(60))
+    np.testing.assert_array_equal(env.cspace_grid(10), fresh.cspace_grid(10))
+
+
+def test_restore_twice_and_modify_again(env):
+    snapshot = env.snapshot()
+    expected = state_of(env)
+    for _ in range(2):
+        modify(env)
+        env.restore(snapshot)
+        assert_same_state(env, expected)
+
+
+def test_restore_rejects_other_dimensions(env):
+    snapshot = env.snapshot()
+    with pytest.raises(ValueError):
+        Environment(width=800, height=600, grid_size=20).restore(snapshot)
@@ -0,0 +1,134 @@
+"""
+Tests du parser hiérarchisé (src/tiered_parser.py) : règles d'escalade
+(confiance, connecteurs, plusieurs couleurs), réponse locale sans appel au
+LLM, escalade vers LLMParser (stand-in ReplayBackend) et histogrammes de
+latence par niveau.
+
+Usage:
+    python -m pytest -q tests/test_tiered_parser.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.llm_backends import ReplayBackend
+from src.llm_parser import LLMParser
+from src.tiered_parser import LatencyHistogram, TieredParser
+
+
+def make_parser(**options) -> TieredParser:
+    return TieredParser(LLMParser(backend=ReplayBackend(**options)))
+
+
+@pytest.mark.parametrize('command, expected', [
+    ('va vers le carré rouge', False),
+    ('go to the red square', False),
+    ('va au carré rouge puis au cercle bleu', True),
+    ('va au cercle bleu en passant par le carré rouge', True),
+    ("d'abord le carré vert", True),
+    ('go to the red square then the blue circle', True),
+    ('va au carré rouge et au cercle bleu', True),        # deux couleurs
+    ('va au carré rouge, le red one', False),             # même couleur, deux langues
+    ('va au carré avantageux rouge', False),              # connecteur dans un mot
+    ('bonjour', True),                                    # confiance faible
+])
+def test_needs_escalation(command, expected):
+    parser = make_parser()
+    local_result = parser.local_parser.parse_command(command)
+    assert parser.needs_escalation(command, local_result) == expected
+
+
+def test_threshold_and_keywords_configurable():
+    parser = TieredParser(LLMParser(backend=ReplayBackend()), confidence_threshold=0.1,
+                          escalation_keywords=['et'])
+    assert not parser.needs_escalation('bonjour', parser.local_parser.parse_command('bonjour'))
+    command = 'va au carré rouge et vite'
+    assert parser.needs_escalation(command, parser.local_parser.parse_command(command))
+    command = 'va au carré rouge puis au carré rouge'
+    assert not parser.needs_escalation(command, parser.local_parser.parse_command(command))
+
+
+def test_local_tier_without_llm_call():
+    parser = make_parser()
+    result = parser.parse_command('va vers le carré rouge')
+
+    assert result['tier'] == 'local'
+    assert result['targets'] == [{'color': 'rouge', 'shape': 'square', 'type': 'target'}]
+    assert parser.llm_parser.backend.calls == 0
+    assert parser.latencies['local'].count == 1 and parser.latencies['llm'].count == 0
+
+
+def test_escalates_multi_target_command():
+    parser = make_parser(responses={'va au carré rouge puis au cercle bleu': (
+        '{"confidence": 0.9, "interpretation": "x", "targets": ['
+        '{"color": "rouge", "shape": "square", "type": "waypoint"}, {"color": "bleu", "shape": "circle"}]}')})
+    result = parser.parse_command('va au carré rouge puis au cercle bleu')
+
+    assert result['tier'] == 'llm' and parser.llm_parser.backend.calls == 1
+    assert [target['color'] for target in result['targets']] == ['rouge', 'bleu']
+    assert parser.latencies['llm'].count == 1 and parser.latencies['local'].count == 0
+
+
+def test_escalates_when_local_parser_fails():
+    # Aucune couleur ni forme reconnue localement (confiance faible) : le LLM répond
+    parser = make_parser(default_response='{"confidence": 0.8, "targets": [{"color": "vert", "shape": "square"}]}')
+    result = parser.parse_command('rejoins le truc émeraude anguleux')
+
+    assert result['tier'] == 'llm' and parser.llm_parser.backend.calls == 1
+    assert result['targets'] == [{'color': 'vert', 'shape': 'square', 'type': 'target'}]
+
+
+def test_fallback_tier_when_llm_fails():
+    parser = make_parser(error_rate=1.0, seed=0)
+    result = parser.parse_command('va au carré rouge puis au cercle bleu')
+
+    assert result['tier'] == 'fallback' and result['fallback']
+    assert parser.latencies['fallback'].count == 1
+
+
+def test_local_only_without_llm():
+    parser = TieredParser()
+    result = parser.parse_command('bonjour')
+    assert result['tier'] == 'local' and result['targets'] == []
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0 and histogram.mean() == 0.0
+
+    # 90 mesures locales (≤ 0,1 ms), 9 appels LLM (≤ 500 ms), une très lente
+    for _ in range(90):
+        histogram.record(0.05)
+    for _ in range(9):
+        histogram.record(300)
+    histogram.record(7000)
+
+    assert histogram.count == 100 and histogram.max_ms == 7000
+    assert histogram.counts[1] == 90 and histogram.counts[5] == 9 and histogram.counts[-1] == 1
+    assert histogram.mean() == pytest.approx((90 * 0.05 + 9 * 300 + 7000) / 100)
+
+    # Borne supérieure du seau du percentile (la latence max au-delà du dernier)
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(90) == 0.1
+    assert histogram.percentile(95) == 500
+    assert histogram.percentile(99) == 500
+    assert histogram.percentile(100) == 7000
+
+
+def test_histogram_bounds_and_format():
+    histogram = LatencyHistogram()
+    histogram.record(1)         # borne incluse : seau 0,1-1 ms
+    histogram.record(0.0)
+    assert histogram.counts[2] == 1 and histogram.counts[0] == 1
+
+    # Percentile limité à la latence maximale observée
+    assert histogram.percentile(100) == 1
+
+    lines = histogram.format().splitlines()
+    assert len(lines) == 2
+    assert '0-0.01 ms' in lines[0] and lines[0].endswith(' 1')
+    assert '0.1-1 ms' in lines[1] and lines[1].endswith(' 1')